@@ -0,0 +1,89 @@
+"""Compares render paths reading the game configuration through configparser against the typed snapshot.
+
+Usage: python benchmarks/bench_config_reads.py [--moves 60] [--rounds 5] [--renders 2000]
+
+Times the move list and material difference renders, which read the game configuration
+on every render. The configparser run reads each value through `get_boolean` on every
+access, as the render paths did before the snapshot. A temporary configuration is used.
+"""
+from cli_chess.modules.board import BoardModel
+from cli_chess.modules.move_list import MoveListModel, MoveListPresenter
+from cli_chess.modules.material_difference import MaterialDifferenceModel, MaterialDifferencePresenter
+from cli_chess.utils.config import GameConfig
+from prompt_toolkit.application import DummyApplication
+from prompt_toolkit.application.current import set_app
+from typing import Callable
+import argparse
+import chess
+import importlib
+import os
+import random
+import tempfile
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Configuration read benchmark")
+    parser.add_argument("--moves", help="Moves played before rendering", default=60, type=int)
+    parser.add_argument("--rounds", default=5, type=int)
+    parser.add_argument("--renders", help="Renders per round", default=2000, type=int)
+    return parser.parse_args()
+
+
+class ParserReads:
+    """Reads each snapshot value through configparser on access"""
+    def __init__(self, config: GameConfig):
+        self._config = config
+
+    def __getattr__(self, name: str) -> bool:
+        return self._config.get_boolean(GameConfig.Keys(name))
+
+
+def bench(name: str, render: Callable, renders: int, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(renders):
+            render()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {name:<22} {best / renders * 1e6:>8.2f} µs/render")
+    return best
+
+
+def main() -> None:
+    args = parse_args()
+    config_module = importlib.import_module("cli_chess.utils.config")
+    with tempfile.TemporaryDirectory() as config_path, set_app(DummyApplication()):
+        config_module.get_config_path = lambda: config_path + os.sep
+        game_config = GameConfig()
+        for module in ("move_list.move_list_presenter", "material_difference.material_difference_presenter"):
+            importlib.import_module(f"cli_chess.modules.{module}").game_config = game_config
+        game_config.set_value(GameConfig.Keys.SHOW_MOVE_LIST_IN_UNICODE, "yes")
+
+        rng = random.Random(1)
+        board_model = BoardModel()
+        move_list = MoveListPresenter(MoveListModel(board_model))
+        material_difference = MaterialDifferencePresenter(MaterialDifferenceModel(board_model))
+        while board_model.board.ply() < args.moves and not board_model.board.is_game_over():
+            board_model.make_move(rng.choice(list(board_model.board.legal_moves)).uci())
+
+        renders = {
+            "move list": move_list.get_formatted_move_list,
+            "material difference": lambda: material_difference.format_diff_output(chess.WHITE),
+        }
+        snapshot = game_config.snapshot
+        results = {}
+        for reads, values in (("configparser", ParserReads(game_config)), ("snapshot", snapshot)):
+            print(f"{reads} reads:")
+            game_config.snapshot = values
+            for name, render in renders.items():
+                results[(reads, name)] = bench(name, render, args.renders, args.rounds)
+        game_config.snapshot = snapshot
+
+    print()
+    for name in renders:
+        print(f"{name:<22} {results[('configparser', name)] / results[('snapshot', name)]:.2f}x faster with the snapshot")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compares berserk's NDJSON stream parsing against cli-chess' NdjsonStreamHandler.
+
+Usage: python benchmarks/bench_ndjson_stream.py [recorded_feed.ndjson ...]
+
+A recorded feed can be captured with:
+    curl -N https://lichess.org/api/tv/feed > tv_feed.ndjson
+If no feed is passed in, a TV feed is synthesized by playing random games.
+"""
+from cli_chess.core.api.ndjson_stream import NdjsonStreamHandler
+from berserk.formats import NDJSON
+from requests import Response
+import chess
+import io
+import json
+import random
+import sys
+import time
+
+
+def synthesize_tv_feed(games: int = 200, seed: int = 1) -> bytes:
+    """Builds a TV feed similar to lichess' (featured + fen events with keep-alive lines)"""
+    rng = random.Random(seed)
+    lines = []
+    for game in range(games):
+        board = chess.Board()
+        lines.append(json.dumps({'t': "featured", 'd': {
+            'id': f"game{game:04}", 'orientation': "white", 'fen': board.board_fen(),
+            'players': [{'color': "white", 'user': {'name': "A", 'id': "a"}, 'rating': 2500, 'seconds': 60},
+                        {'color': "black", 'user': {'name': "B", 'id': "b"}, 'rating': 2500, 'seconds': 60}]}}))
+        clocks = [60, 60]
+        while not board.is_game_over() and board.ply() < 120:
+            move = rng.choice(list(board.legal_moves))
+            clocks[board.turn] = max(clocks[board.turn] - rng.randint(0, 2), 0)
+            board.push(move)
+            lines.append(json.dumps({'t': "fen", 'd': {'fen': f"{board.board_fen()} {'w' if board.turn else 'b'}",
+                                                       'lm': move.uci(), 'wc': clocks[1], 'bc': clocks[0]}}))
+            if rng.random() < 0.1:
+                lines.append("")  # keep-alive
+    return ("\n".join(lines) + "\n").encode()
+
+
+def make_response(raw: bytes) -> Response:
+    """Returns a streamed requests Response wrapping the raw bytes"""
+    response = Response()
+    response.raw = io.BytesIO(raw)
+    response.status_code = 200
+    return response
+
+
+def bench(name: str, handler, raw: bytes, rounds: int = 5) -> None:
+    best = float("inf")
+    events = 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        events = sum(1 for _ in handler.parse_stream(make_response(raw)))
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<24} {events:>8} events  {best * 1000:>9.1f} ms  {events / best:>12,.0f} events/s")
+
+
+def main() -> None:
+    feeds = [(path, open(path, "rb").read()) for path in sys.argv[1:]] or [("synthesized TV feed", synthesize_tv_feed())]
+    for name, raw in feeds:
+        print(f"{name} ({len(raw) / 1024:,.0f} KiB)")
+        bench("berserk NDJSON", NDJSON, raw)
+        bench("NdjsonStreamHandler", NdjsonStreamHandler(), raw)
+
+
+if __name__ == "__main__":
+    main()
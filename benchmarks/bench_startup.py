@@ -0,0 +1,98 @@
+"""Tracks the import time of the cli-chess entry point against a cold-start budget.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--max-version 120] [--max-print-config 150] [--max-app 450]
+
+Runs each startup path in a new interpreter with `python -X importtime` and totals the import
+times it reports (the best of the runs is kept, after a warmup run compiling the bytecode):
+
+    version       `cli-chess --version`
+    print-config  `cli-chess --print-config`
+    app           the imports made before the main menu is shown (with no API token linked)
+
+Each path also has modules which must not be imported, as they are only loaded on first use
+(e.g. berserk once an API token is linked). The script exits with a non-zero status if a total
+is over its budget (in milliseconds) or a deferred module was imported. A temporary home
+directory is used, so the configuration is created on the first run.
+"""
+from typing import Dict, List, NamedTuple, Set
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ENTRY_POINT = "import sys; sys.argv = ['cli-chess', {args}]; from cli_chess.__main__ import main; main()"
+
+
+class Scenario(NamedTuple):
+    name: str
+    code: str
+    deferred_modules: List[str]
+
+
+SCENARIOS = [
+    Scenario("version", ENTRY_POINT.format(args="'--version'"), ["prompt_toolkit", "berserk", "chess", "cli_chess.menus"]),
+    Scenario("print-config", ENTRY_POINT.format(args="'--print-config'"), ["prompt_toolkit", "berserk", "chess", "cli_chess.menus"]),
+    Scenario("app", "import cli_chess.core.main.main_view, cli_chess.menus.main_menu", ["berserk", "requests"]),
+]
+
+IMPORT_TIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+\d+ \| *(\S+)")
+
+
+class ImportTimes(NamedTuple):
+    total: float
+    modules: Set[str]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Startup import time benchmark")
+    parser.add_argument("--runs", default=5, type=int)
+    parser.add_argument("--max-version", help="Import time budget (ms) of --version", default=120, type=float)
+    parser.add_argument("--max-print-config", help="Import time budget (ms) of --print-config", default=150, type=float)
+    parser.add_argument("--max-app", help="Import time budget (ms) before the main menu is shown", default=450, type=float)
+    return parser.parse_args()
+
+
+def measure(code: str, env: Dict[str, str]) -> ImportTimes:
+    """Runs the passed in code with `-X importtime` and returns the import times (in ms)"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], env=env, capture_output=True, text=True)
+    total = 0.0
+    modules = set()
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            total += int(match.group(1)) / 1000
+            modules.add(match.group(2))
+        elif result.returncode and not line.startswith("import time:"):
+            print(line, file=sys.stderr)
+    return ImportTimes(total, modules)
+
+
+def main() -> None:
+    args = parse_args()
+    budgets = {"version": args.max_version, "print-config": args.max_print_config, "app": args.max_app}
+    failures = []
+    with tempfile.TemporaryDirectory() as home:
+        env = dict(os.environ, HOME=home, APPDATA=home)
+        for scenario in SCENARIOS:
+            measure(scenario.code, env)
+            best = min((measure(scenario.code, env) for _ in range(args.runs)), key=lambda times: times.total)
+            print(f"{scenario.name:<14} {best.total:>8.1f} ms  {len(best.modules):>5} modules  (budget {budgets[scenario.name]:.0f} ms)")
+
+            if best.total > budgets[scenario.name]:
+                failures.append(f"{scenario.name} imports took {best.total:.1f} ms (max {budgets[scenario.name]:.0f} ms)")
+            for module in scenario.deferred_modules:
+                if module in best.modules:
+                    failures.append(f"{scenario.name} imported {module}, which should only be imported on first use")
+
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
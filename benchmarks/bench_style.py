@@ -0,0 +1,78 @@
+"""Compares loading the custom style through eval and merge_styles against the compiled and cached style.
+
+Usage: python benchmarks/bench_style.py [--rounds 5] [--loads 200]
+
+Times loading the style as done on startup and on every style refresh. The eval run reads
+and evaluates the custom style file, then merges the default and custom styles, as the main
+view did before the style was compiled. The compiled run parses the file as a literal and
+compiles a single style, and the cached run loads an unchanged file. When the loaded style is
+a new style, the attributes of the classes used by the board, clock and move list are resolved,
+as the renderer does on its first frame after a style change. A temporary custom style is used.
+"""
+from cli_chess.utils.styles import default
+from cli_chess.utils.ui_common import StyleCache
+from prompt_toolkit.styles import Style, merge_styles
+from typing import Callable
+import argparse
+import importlib
+import os
+import tempfile
+import time
+
+# The style strings of the board, clock and move list
+GAME_STYLE_STRS = [f"class:{square}.{piece}" for square in ("light-square", "dark-square", "last-move", "pre-move", "in-check")
+                   for piece in ("light-piece", "dark-piece", "")]
+GAME_STYLE_STRS += ["class:rank-label", "class:file-label", "class:clock", "class:clock.ticking", "class:move-list"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Custom style benchmark")
+    parser.add_argument("--rounds", default=5, type=int)
+    parser.add_argument("--loads", help="Style loads per round", default=200, type=int)
+    return parser.parse_args()
+
+
+def bench(name: str, load: Callable, loads: int, rounds: int) -> float:
+    best = float("inf")
+    for _ in range(rounds):
+        last_style = None
+        start = time.perf_counter()
+        for _ in range(loads):
+            style = load()
+            if style is not last_style:
+                for style_str in GAME_STYLE_STRS:
+                    style.get_attrs_for_style_str(style_str)
+                last_style = style
+        best = min(best, time.perf_counter() - start)
+    print(f"  {name:<10} {best / loads * 1e6:>8.1f} µs/load")
+    return best
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as config_path:
+        importlib.import_module("cli_chess.utils.ui_common").get_config_path = lambda: config_path + os.sep
+        custom_style_path = os.path.join(config_path, "custom_style.py")
+        with open(custom_style_path, "w") as file:
+            file.write("{\n" + "".join(f"    {class_name!r}: {style_str!r},\n" for class_name, style_str in default.items()) + "}\n")
+
+        def load_eval() -> Style:
+            with open(custom_style_path) as file:
+                return merge_styles([Style.from_dict(default), Style.from_dict(eval(file.read()))])
+
+        def load_compiled() -> Style:
+            return StyleCache().get_style()
+
+        style_cache = StyleCache()
+        results = {}
+        print("style loads:")
+        for name, load in (("eval", load_eval), ("compiled", load_compiled), ("cached", style_cache.get_style)):
+            results[name] = bench(name, load, args.loads, args.rounds)
+
+    print()
+    for name in ("compiled", "cached"):
+        print(f"{name:<10} {results['eval'] / results[name]:.2f}x faster than eval")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,467 @@
+"""Soak tests game lifecycles to catch memory, thread, and listener leaks across long sessions.
+
+Usage: python benchmarks/game_lifecycle_soak.py [--cycles 1000] [--games offline online tv] [--warmup 20]
+           [--sample-every 100] [--max-plies 40] [--max-rss-growth 32] [--max-traced-growth 8]
+           [--max-object-growth 20000] [--max-thread-growth 0] [--top 10] [--real-engine] [--seed 1]
+
+Each cycle plays a full game lifecycle with each of the selected game models, headless, and
+cleans up the way the game presenters do on exit:
+    offline  OfflineGameModel vs a stand-in engine (or Fairy-Stockfish with --real-engine)
+    online   OnlineGameModel vs the Lichess AI, served by a local stand-in for the Lichess API
+    tv       WatchTVModel streaming a synthesized TV game on a standard channel from the local stand-in
+The stand-in serves the NDJSON streams through the same format handlers and converters as the
+real API client, so the incoming event manager, game state dispatcher, and TV stream threads run
+as they do against lichess. RSS, thread count, gc object count, and traced memory are sampled
+after the warmup cycles and periodically after. The script exits with a non-zero status if any
+growth is over its threshold, and lists the top growing allocators and object types.
+The soak runs from the source tree under a temporary home directory, so the configuration
+and evaluation cache are created on each run, and the users own are never used.
+"""
+from collections import Counter
+from dataclasses import dataclass
+from itertools import count
+from types import SimpleNamespace
+from typing import Callable, Dict, List, Optional
+import argparse
+import asyncio
+import gc
+import importlib
+import json
+import os
+import queue
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# The configuration is loaded when cli-chess is imported, so the home directory is set first
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "src"))
+TEMP_HOME = tempfile.TemporaryDirectory()
+os.environ.update(HOME=TEMP_HOME.name, APPDATA=TEMP_HOME.name)
+
+from cli_chess.core.game.offline_game import OfflineGameModel  # noqa: E402
+from cli_chess.core.game.online_game import OnlineGameModel  # noqa: E402
+from cli_chess.core.game.online_game.watch_tv import WatchTVModel  # noqa: E402
+from cli_chess.core.game.game_options import GameOption  # noqa: E402
+from cli_chess.core.api.incoming_event_manger import IncomingEventManager  # noqa: E402
+from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions  # noqa: E402
+from cli_chess.modules.engine import engine_pool  # noqa: E402
+from cli_chess.utils import ui_dispatcher  # noqa: E402
+from berserk import utils as berserk_utils  # noqa: E402
+from requests import Response  # noqa: E402
+import chess.engine  # noqa: E402
+import chess  # noqa: E402
+
+MB = 1024 * 1024
+
+# How long (in seconds) to wait on a game event before the cycle is failed
+WAIT_TIMEOUT = 10
+
+GAME_TYPES = ("offline", "online", "tv")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Game lifecycle soak test")
+    parser.add_argument("--cycles", help="Measured cycles (each plays one game of each type)", default=1000, type=int)
+    parser.add_argument("--games", nargs="+", choices=GAME_TYPES, default=list(GAME_TYPES))
+    parser.add_argument("--warmup", help="Cycles played before the baseline is sampled", default=20, type=int)
+    parser.add_argument("--sample-every", help="Cycles between samples", default=100, type=int)
+    parser.add_argument("--max-plies", help="Plies played before a game is resigned", default=40, type=int)
+    parser.add_argument("--max-rss-growth", help="Allowed RSS growth (MB)", default=32, type=float)
+    parser.add_argument("--max-traced-growth", help="Allowed traced Python memory growth (MB)", default=8, type=float)
+    parser.add_argument("--max-object-growth", help="Allowed gc tracked object growth", default=20000, type=int)
+    parser.add_argument("--max-thread-growth", help="Allowed thread count growth", default=0, type=int)
+    parser.add_argument("--top", help="Top growing allocators and object types listed", default=10, type=int)
+    parser.add_argument("--real-engine", help="Play offline games against Fairy-Stockfish", action="store_true")
+    parser.add_argument("--seed", default=1, type=int)
+    return parser.parse_args()
+
+
+class StreamBody:
+    """A blocking, file like response body. Each written event is read back as a
+       single NDJSON line, and reads block until an event is written or the body is closed.
+    """
+    def __init__(self):
+        self._chunks: queue.Queue = queue.Queue()
+        self.finished = threading.Event()
+
+    def write(self, event: Dict) -> None:
+        self._chunks.put(json.dumps(event).encode() + b"\n")
+
+    def close(self) -> None:
+        self._chunks.put(b"")
+
+    def read(self, *args, **kwargs) -> bytes:
+        chunk = self._chunks.get()
+        if not chunk:
+            # Any further reads also see the end of the stream
+            self._chunks.put(b"")
+            self.finished.set()
+        return chunk
+
+
+@dataclass
+class StandInGame:
+    game_id: str
+    color: chess.Color
+    level: int
+    board: chess.Board
+    body: StreamBody
+
+
+class LocalLichess:
+    """A local stand-in for the parts of the Lichess API used by the game models. Games are
+       played against the Lichess AI, which replies with a random legal move.
+    """
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.games: Dict[str, StandInGame] = {}
+        self.events = StreamBody()
+        self._game_ids = count(1)
+        requestor = SimpleNamespace(get=self.get, post=self.post)
+        self.client = SimpleNamespace(
+            board=SimpleNamespace(_r=requestor, make_move=self.make_move, offer_takeback=self._ignore,
+                                  offer_draw=self._ignore, resign_game=self.resign_game),
+            challenges=SimpleNamespace(create_ai=self.create_ai),
+            tv=SimpleNamespace(_r=requestor),
+        )
+        self.tv_feeds: List[StreamBody] = []
+
+    def get(self, path: str, *, stream: bool = False, fmt=None, converter: Callable = berserk_utils.noop, **kwargs):
+        """Serves the streamed endpoints through the requested format handler"""
+        if path == "/api/stream/event":
+            body = self.events
+        elif path.startswith("/api/board/game/stream/"):
+            body = self.games[path.rsplit("/", 1)[-1]].body
+        elif path.startswith("/api/tv/"):
+            body = self._create_tv_feed()
+        else:
+            raise NotImplementedError(f"The stand-in does not serve {path}")
+
+        response = Response()
+        response.raw = body
+        response.status_code = 200
+        return fmt.handle(response, is_stream=stream, converter=converter)
+
+    def post(self, path: str, **kwargs):
+        raise NotImplementedError(f"The stand-in does not serve {path}")
+
+    def create_ai(self, level: int, color: str, **kwargs) -> None:
+        """Starts a game against the AI. The game start is sent on the incoming event stream"""
+        game = StandInGame(f"soak{next(self._game_ids):07}", chess.COLOR_NAMES.index(color), level, chess.Board(), StreamBody())
+        self.games[game.game_id] = game
+        self.events.write({'type': "gameStart", 'game': {
+            'gameId': game.game_id, 'color': color, 'rated': False, 'speed': "blitz", 'hasMoved': False,
+            'variant': {'key': "standard", 'name': "Standard"}, 'compat': {'bot': False, 'board': True}}})
+
+        player = {'id': "soak", 'name': "soak", 'rating': 1500}
+        ai = {'aiLevel': level}
+        game.body.write({'type': "gameFull", 'id': game.game_id, 'rated': False, 'initialFen': "startpos",
+                         'white': player if game.color == chess.WHITE else ai, 'black': ai if game.color == chess.WHITE else player,
+                         'state': self._get_state(game)})
+        if game.color == chess.BLACK:
+            self._ai_move(game)
+
+    def make_move(self, game_id: str, move: str) -> None:
+        """Plays the move and the AI reply"""
+        game = self.games[game_id]
+        game.board.push_uci(move)
+        self._send_state(game)
+        if not game.board.is_game_over():
+            self._ai_move(game)
+
+    def resign_game(self, game_id: str) -> None:
+        self._end_game(self.games[game_id], "resign", chess.COLOR_NAMES[not self.games[game_id].color])
+
+    def close(self) -> None:
+        """Ends the incoming event stream and any games still being streamed"""
+        for game in self.games.values():
+            game.body.close()
+        self.events.close()
+
+    def _ai_move(self, game: StandInGame) -> None:
+        game.board.push(self.rng.choice(list(game.board.legal_moves)))
+        self._send_state(game)
+
+    def _send_state(self, game: StandInGame) -> None:
+        """Sends the game state, ending the game if it is over"""
+        outcome = game.board.outcome()
+        if not outcome:
+            game.body.write(self._get_state(game))
+            return
+
+        status = {chess.Termination.CHECKMATE: "mate", chess.Termination.STALEMATE: "stalemate"}.get(outcome.termination, "draw")
+        self._end_game(game, status, chess.COLOR_NAMES[outcome.winner] if outcome.winner is not None else None)
+
+    def _end_game(self, game: StandInGame, status: str, winner: Optional[str]) -> None:
+        """Sends the final game state and the game finish, then closes the game stream"""
+        state = self._get_state(game, status)
+        if winner:
+            state['winner'] = winner
+        game.body.write(state)
+        game.body.close()
+        self.events.write({'type': "gameFinish", 'game': {
+            'gameId': game.game_id, 'color': chess.COLOR_NAMES[game.color], 'ratingDiff': 0, 'opponent': {'ratingDiff': 0}}})
+        del self.games[game.game_id]
+
+    @staticmethod
+    def _get_state(game: StandInGame, status: str = "started") -> Dict:
+        return {'type': "gameState", 'moves': " ".join(move.uci() for move in game.board.move_stack),
+                'wtime': 180000, 'btime': 180000, 'winc': 2000, 'binc': 2000, 'status': status}
+
+    def _create_tv_feed(self) -> StreamBody:
+        """Returns a finished TV feed of a random game"""
+        body = StreamBody()
+        board = chess.Board()
+        players = [{'color': color, 'user': {'name': color.capitalize(), 'id': color}, 'rating': 2500, 'seconds': 60}
+                   for color in ("white", "black")]
+        body.write({'t': "featured", 'd': {'id': "tvgame", 'orientation': "white", 'fen': board.board_fen(), 'players': players}})
+        while not board.is_game_over() and board.ply() < 120:
+            move = self.rng.choice(list(board.legal_moves))
+            board.push(move)
+            body.write({'t': "fen", 'd': {'fen': f"{board.board_fen()} {'w' if board.turn else 'b'}", 'lm': move.uci(), 'wc': 60, 'bc': 60}})
+        body.close()
+        self.tv_feeds.append(body)
+        return body
+
+    @staticmethod
+    def _ignore(*args, **kwargs) -> None:
+        pass
+
+
+class StandInEngine:
+    """A stand-in for a pooled engine process which plays random legal moves"""
+    def __init__(self, rng: random.Random):
+        self.rng = rng
+        self.returncode = asyncio.get_running_loop().create_future()
+        self.transport = SimpleNamespace(get_pid=lambda: 0)
+
+    async def configure(self, options: dict) -> None:
+        pass
+
+    async def ping(self) -> None:
+        pass
+
+    async def play(self, board: chess.Board, limit: chess.engine.Limit, **kwargs) -> chess.engine.PlayResult:
+        await asyncio.sleep(0)
+        return chess.engine.PlayResult(self.rng.choice(list(board.legal_moves)), None)
+
+    async def analyse(self, board: chess.Board, limit: chess.engine.Limit, **kwargs) -> chess.engine.InfoDict:
+        await asyncio.sleep(0)
+        return {'score': chess.engine.PovScore(chess.engine.Cp(0), board.turn), 'depth': limit.depth,
+                'pv': [self.rng.choice(list(board.legal_moves))]}
+
+    async def quit(self) -> None:
+        if not self.returncode.done():
+            self.returncode.set_result(0)
+
+
+async def wait_until(condition: Callable[[], bool], what: str) -> None:
+    """Yields to the event loop until the condition is met"""
+    deadline = time.monotonic() + WAIT_TIMEOUT
+    while not condition():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Timed out waiting for {what}")
+        await asyncio.sleep(0.001)
+
+
+async def play_offline_game(rng: random.Random, max_plies: int) -> None:
+    """Plays an offline game and cleans up the way the offline game presenter does on exit"""
+    model = OfflineGameModel({GameOption.COLOR: rng.choice(["white", "black"]), GameOption.VARIANT: "standard",
+                              GameOption.COMPUTER_SKILL_LEVEL: rng.randint(1, 8)})
+    await model.engine_model.start_engine()
+    # Checking for the game end notifies the game model of it
+    while model.game_in_progress and not model.board_model.is_game_over():
+        board = model.board_model.board
+        if board.ply() >= max_plies:
+            model.resign()
+        elif model.is_my_turn():
+            if board.ply() < 2:
+                await model.get_hint()
+            model.make_move(rng.choice(list(board.legal_moves)).uci())
+        else:
+            result = await model.engine_model.get_best_move()
+            model.board_model.make_move(result.move.uci())
+
+    model.cleanup()
+    await model.engine_model.quit_engine()
+    await model.analysis_model.stop_analysis()
+    await model.engine_hints.quit()
+
+
+async def play_online_game(rng: random.Random, max_plies: int, lichess: LocalLichess) -> None:
+    """Plays an online game against the stand-in and cleans up the way the online game presenter does on exit"""
+    model = OnlineGameModel({GameOption.COLOR: rng.choice(["white", "black"]), GameOption.VARIANT: "standard",
+                             GameOption.TIME_CONTROL: (3, 2), GameOption.COMPUTER_SKILL_LEVEL: rng.randint(1, 8)}, True)
+    model.create_game()
+
+    # The game has started once the game state dispatcher has sent the full game
+    await wait_until(lambda: model.game_in_progress and model.game_metadata.players[chess.WHITE].name, "the game to start")
+    dispatcher = model.game_state_dispatcher
+    game = lichess.games[model.playing_game_id]
+    while True:
+        await wait_until(lambda: not model.game_in_progress or
+                         (len(model.board_model.board.move_stack) == len(game.board.move_stack) and model.is_my_turn()), "the AI move")
+        if not model.game_in_progress:
+            break
+
+        board = model.board_model.board
+        if board.ply() >= max_plies:
+            model.resign()
+            await wait_until(lambda: not model.game_in_progress, "the resignation")
+        else:
+            model.make_move(rng.choice(list(board.legal_moves)).uci())
+
+    await wait_until(lambda: not dispatcher.is_alive() and not ui_dispatcher.get_queue_depth(), "the game stream to end")
+    model.exit()
+    model.cleanup()
+
+
+async def watch_tv_game(rng: random.Random, lichess: LocalLichess) -> None:
+    """Watches a TV game from the stand-in and cleans up the way the TV presenter does on exit"""
+    # The stand-in feed plays standard chess, so only standard channels are watched
+    model = WatchTVModel(rng.choice([channel for channel in TVChannelMenuOptions if channel.variant == "standard"]))
+    model.start_watching()
+    await wait_until(lambda: lichess.tv_feeds and lichess.tv_feeds[-1].finished.is_set() and not ui_dispatcher.get_queue_depth(),
+                     "the TV game to end")
+
+    stream = model._tv_stream
+    model.stop_watching()
+    model.cleanup()
+    lichess.tv_feeds.clear()
+    await wait_until(lambda: not stream.is_alive(), "the TV stream to stop")
+
+
+@dataclass
+class Sample:
+    cycle: int
+    rss: Optional[int]
+    threads: int
+    objects: int
+    traced: int
+
+
+def get_rss() -> Optional[int]:
+    """Returns the resident set size of this process in bytes, if available"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        # Only the peak is available. macOS reports bytes and Linux reports kilobytes
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return rss if sys.platform == "darwin" else rss * 1024
+    except ImportError:
+        return None
+
+
+def take_sample(cycle: int) -> Sample:
+    gc.collect()
+    rss = get_rss()
+    sample = Sample(cycle, rss, threading.active_count(), len(gc.get_objects()),
+                    tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0)
+    print(f"{cycle:>8} {rss / MB if rss is not None else float('nan'):>10.1f} {sample.threads:>8} "
+          f"{sample.objects:>10,} {sample.traced / MB:>11.2f}")
+    return sample
+
+
+def count_object_types() -> Counter:
+    return Counter(type(obj).__qualname__ for obj in gc.get_objects())
+
+
+def install_stand_ins(args: argparse.Namespace, rng: random.Random) -> LocalLichess:
+    """Points the API client at the local stand-in, and the engine pool at the stand-in engine"""
+    lichess = LocalLichess(rng)
+    api_manager = importlib.import_module("cli_chess.core.api.api_manager")
+    api_manager.api_client = lichess.client
+    api_manager.api_iem = IncomingEventManager()
+    api_manager.api_iem.start()
+
+    if not args.real_engine:
+        async def popen_stand_in_engine(engine_path: str) -> StandInEngine:
+            return StandInEngine(rng)
+        importlib.import_module("cli_chess.modules.engine.engine_pool").popen_engine = popen_stand_in_engine
+    return lichess
+
+
+async def run(args: argparse.Namespace) -> List[str]:
+    """Runs the soak test. Returns a list of the thresholds that were exceeded"""
+    rng = random.Random(args.seed)
+    ui_dispatcher.start(asyncio.get_running_loop())
+    lichess = install_stand_ins(args, rng)
+
+    async def play_cycle() -> None:
+        for game_type in args.games:
+            if game_type == "offline":
+                await play_offline_game(rng, args.max_plies)
+            elif game_type == "online":
+                await play_online_game(rng, args.max_plies, lichess)
+            else:
+                await watch_tv_game(rng, lichess)
+
+    try:
+        start = time.perf_counter()
+        for _ in range(args.warmup):
+            await play_cycle()
+
+        print(f"{'cycle':>8} {'RSS (MB)':>10} {'threads':>8} {'objects':>10} {'traced (MB)':>11}")
+        tracemalloc.start()
+        baseline = take_sample(0)
+        baseline_snapshot = tracemalloc.take_snapshot()
+        baseline_types = count_object_types()
+
+        for cycle in range(1, args.cycles + 1):
+            await play_cycle()
+            if cycle % args.sample_every == 0 and cycle != args.cycles:
+                take_sample(cycle)
+
+        final = take_sample(args.cycles)
+        snapshot = tracemalloc.take_snapshot()
+        elapsed = time.perf_counter() - start
+        print(f"\n{args.warmup + args.cycles} cycles ({', '.join(args.games)}) in {elapsed:.1f} s")
+        print(f"UI dispatcher: {ui_dispatcher.get_stats()}")
+    finally:
+        tracemalloc.stop()
+        ui_dispatcher.stop()
+        lichess.close()
+        await engine_pool.shutdown()
+
+    print(f"\nTop {args.top} growing allocators:")
+    for stat in snapshot.compare_to(baseline_snapshot, "lineno")[:args.top]:
+        print(f"  {stat}")
+
+    print(f"\nTop {args.top} growing object types:")
+    type_growth = count_object_types()
+    type_growth.subtract(baseline_types)
+    for name, growth in type_growth.most_common(args.top):
+        print(f"  {name:<40} {growth:>+8,}")
+
+    failures = []
+    if baseline.rss is not None and final.rss is not None and (final.rss - baseline.rss) / MB > args.max_rss_growth:
+        failures.append(f"RSS grew {(final.rss - baseline.rss) / MB:.1f} MB (max {args.max_rss_growth} MB)")
+    if (final.traced - baseline.traced) / MB > args.max_traced_growth:
+        failures.append(f"Traced memory grew {(final.traced - baseline.traced) / MB:.2f} MB (max {args.max_traced_growth} MB)")
+    if final.objects - baseline.objects > args.max_object_growth:
+        failures.append(f"gc tracked objects grew by {final.objects - baseline.objects:,} (max {args.max_object_growth:,})")
+    if final.threads - baseline.threads > args.max_thread_growth:
+        failures.append(f"Thread count grew by {final.threads - baseline.threads} (max {args.max_thread_growth})")
+    return failures
+
+
+def main() -> None:
+    args = parse_args()
+    failures = asyncio.run(run(args))
+    print()
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if failures:
+        sys.exit(1)
+    print("PASS")
+
+
+if __name__ == "__main__":
+    main()
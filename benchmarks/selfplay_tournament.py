@@ -0,0 +1,65 @@
+"""Plays an engine self-play tournament to calibrate the skill level mapping.
+
+Usage: python benchmarks/selfplay_tournament.py [--players level:1 level:4 elo:1500 ...]
+           [--games 4] [--time-control 1+1] [--variant standard] [--concurrency 4]
+           [--opening-plies 4] [--pgn tournament.pgn] [--seed 1]
+
+Players are skill levels (`level:1`-`level:8`) or UCI Elos (`elo:<rating>`). Ratings are
+anchored to the first Elo player, so including one (e.g. `elo:1500`) gives absolute ratings.
+Engine start and game loop timings are reported so performance regressions can be caught.
+"""
+from cli_chess.core.tournament import Tournament, TournamentPlayer, parse_time_control
+import chess
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Engine self-play tournament")
+    parser.add_argument("--players", nargs="+", default=["level:1", "level:3", "level:5", "level:8"], type=TournamentPlayer.from_spec)
+    parser.add_argument("--games", help="Games per pair of players", default=4, type=int)
+    parser.add_argument("--time-control", help="<minutes>+<increment> or none", default="1+1", type=parse_time_control)
+    parser.add_argument("--variant", default="standard")
+    parser.add_argument("--concurrency", help="Games played at once", default=max((os.cpu_count() or 2) // 2, 1), type=int)
+    parser.add_argument("--opening-plies", help="Random opening moves played before the engines take over", default=4, type=int)
+    parser.add_argument("--pgn", help="File to append the tournament games to")
+    parser.add_argument("--seed", type=int)
+    return parser.parse_args()
+
+
+async def run(tournament: Tournament) -> float:
+    start = time.perf_counter()
+    await tournament.run()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    args = parse_args()
+    tournament = Tournament(args.players, args.games, args.variant, args.time_control, args.concurrency,
+                            args.opening_plies, args.pgn, args.seed)
+    time_control = "{}+{}".format(*args.time_control) if args.time_control else "untimed"
+    print(f"{len(tournament.get_schedule())} games ({args.variant}, {time_control}), {args.concurrency} at once")
+    elapsed = asyncio.run(run(tournament))
+
+    print()
+    print(tournament.get_standings_table())
+
+    games = tournament.games
+    if games:
+        moves = sum(game.moves for game in games)
+        print()
+        print(f"{len(games)} games ({tournament.errors} errors) in {elapsed:.1f} s, {moves} moves ({moves / elapsed:.1f} moves/s)")
+        print(f"Engine start: {statistics.median(game.engine_start_time for game in games) * 1000:.1f} ms median, "
+              f"{max(game.engine_start_time for game in games) * 1000:.1f} ms max")
+        for player in tournament.players:
+            move_times = [move_time for game in games for color, player_in_game in ((chess.WHITE, game.white), (chess.BLACK, game.black))
+                          if player_in_game is player for move_time in game.move_times[color]]
+            if move_times:
+                print(f"{player.name:<12} {statistics.mean(move_times) * 1000:>8.1f} ms/move")
+
+
+if __name__ == "__main__":
+    main()
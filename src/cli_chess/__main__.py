@@ -1,9 +1,13 @@
-from cli_chess.core.main import MainModel, MainPresenter
+from cli_chess.core.main import MainModel
 
 
 def main() -> None:
-    """Main entry point"""
-    MainPresenter(MainModel()).run()
+    """Main entry point. The main presenter is imported once the startup
+       arguments have been parsed, so arguments which exit early are quick
+    """
+    model = MainModel()
+    from cli_chess.core.main import MainPresenter
+    MainPresenter(model).run()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,8 @@
-from cli_chess.core.api.incoming_event_manger import IncomingEventManager
-from cli_chess.core.api.game_state_dispatcher import GameStateDispatcher
-from cli_chess.core.api.api_manager import required_token_scopes
+from cli_chess.utils.common import lazy_exports
+
+# berserk (used by each of these) is only imported once the API is used
+__getattr__ = lazy_exports(__name__, {
+    "IncomingEventManager": "incoming_event_manger",
+    "GameStateDispatcher": "game_state_dispatcher",
+    "required_token_scopes": "api_manager",
+})
@@ -1,7 +1,9 @@
-from cli_chess.core.api.incoming_event_manger import IncomingEventManager
+from __future__ import annotations
 from cli_chess.utils.logging import log
-from berserk import Client, TokenSession
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from cli_chess.core.api.incoming_event_manger import IncomingEventManager
+    from berserk import Client, TokenSession
 
 required_token_scopes: set = {"board:play"}
 api_session: Optional[TokenSession]
@@ -18,6 +20,9 @@ def _start_api(token: str, base_url: str):
     """
     global api_session, api_client, api_iem, api_ready
     try:
+        # berserk is only imported once an API token is linked
+        from cli_chess.core.api.incoming_event_manger import IncomingEventManager
+        from berserk import Client, TokenSession
         api_session = TokenSession(token)
         api_client = Client(api_session, base_url)
         api_iem = IncomingEventManager()
@@ -1,4 +1,6 @@
-from cli_chess.utils import Event, EventTopics, log, retry
+from cli_chess.core.api.ndjson_stream import NDJSON_STREAM
+from cli_chess.utils import Event, EventTopics, log, retry, ui_dispatcher
+from berserk.models import GameState
 from typing import Callable
 from threading import Thread
 from enum import Enum, auto
@@ -44,7 +46,9 @@ class GameStateDispatcher(Thread):
         """
         log.info(f"Started streaming game state: {self.game_id}")
 
-        for event in self.api_client.board.stream_game_state(self.game_id):
+        stream = self.api_client.board._r.get(f"/api/board/game/stream/{self.game_id}", stream=True,  # noqa
+                                              fmt=NDJSON_STREAM, converter=GameState.convert)
+        for event in stream:
             event_topic = gsd_type_to_event_dict.get(event['type'], GSDEventTopics.NOT_IMPLEMENTED)
             log.debug(f"GSD Stream event type received: {event['type']} // topic: {event_topic}")
 
@@ -62,8 +66,11 @@ class GameStateDispatcher(Thread):
                 if not is_gone:
                     pass  # TODO: Cancel auto-claim countdown
 
+            # Events are handled on the UI loop. Game states hold the full move list and clocks,
+            # so a queued game state is superseded by a newer one
             game_end_event = EventTopics.GAME_END if self.is_game_over else None
-            self.e_game_state_dispatcher_event.notify(event_topic, game_end_event, data=event)
+            ui_dispatcher.dispatch(self.e_game_state_dispatcher_event.notify, event_topic, game_end_event, data=event,
+                                   coalesce_key=event_topic if event_topic is EventTopics.MOVE_MADE else None)
 
             if self.is_game_over:
                 self._game_ended()
@@ -108,7 +115,8 @@ class GameStateDispatcher(Thread):
         """Handles removing all event listeners since the game has completed"""
         log.info("GAME ENDED: Removing existing GSD listeners")
         self.is_game_over = True
-        self.e_game_state_dispatcher_event.remove_all_listeners()
+        # Queued behind the final game state so listeners still receive it
+        ui_dispatcher.dispatch(self.e_game_state_dispatcher_event.remove_all_listeners)
 
     def add_event_listener(self, listener: Callable) -> None:
         """Subscribes the passed in method to GSD events"""
@@ -1,5 +1,7 @@
+from cli_chess.core.api.ndjson_stream import NDJSON_STREAM
 from cli_chess.utils.event import Event, EventTopics
 from cli_chess.utils.logging import log
+from cli_chess.utils.ui_dispatcher import ui_dispatcher
 from typing import Callable
 from enum import Enum, auto
 from types import MappingProxyType
@@ -41,7 +43,7 @@ class IncomingEventManager(threading.Thread):
             raise ImportError("API client not setup. Do you have an API token linked?")
 
         log.info("Started listening to Lichess incoming events")
-        for event in api_client.board.stream_incoming_events():
+        for event in api_client.board._r.get("/api/stream/event", stream=True, fmt=NDJSON_STREAM):  # noqa
             data = None
             event_topic = iem_type_to_event_dict.get(event['type'], IEMEventTopics.NOT_IMPLEMENTED)
             log.debug(f"IEM event received: {event}")
@@ -62,7 +64,7 @@ class IncomingEventManager(threading.Thread):
                   event_topic is IEMEventTopics.CHALLENGE_DECLINED):
                 data = event['challenge']
 
-            self.e_new_event_received.notify(event_topic, data=data)
+            ui_dispatcher.dispatch(self.e_new_event_received.notify, event_topic, data=data)
 
     def get_active_games(self) -> list:
         """Returns a list of games in progress for this account"""
@@ -0,0 +1,64 @@
+from berserk.formats import FormatHandler
+from requests import Response
+from typing import Any, Dict, Iterable, Iterator, List
+import json
+
+NEWLINE = 0x0A
+_WHITESPACE = frozenset(" \t\r\n")
+_raw_decode = json.JSONDecoder().raw_decode
+
+
+def iter_ndjson(chunks: Iterable[bytes]) -> Iterator[Dict[str, Any]]:
+    """Incrementally parses newline delimited JSON from an iterable of raw byte
+       chunks. A single reusable bytearray buffers partial lines between chunks.
+       Each run of complete lines is decoded straight out of the buffer through a
+       memoryview, and events are parsed in place by index so no per-line bytes or
+       str objects are created. Blank (keep-alive) lines are skipped without allocating.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        if not chunk:
+            continue
+
+        buffer += chunk
+        complete = buffer.rfind(NEWLINE) + 1
+        if not complete:
+            continue
+
+        # Only complete lines are decoded, so a multibyte character is never split
+        with memoryview(buffer) as view:
+            text = str(view[:complete], "utf-8")
+        del buffer[:complete]
+
+        idx, end = 0, len(text)
+        while idx < end:
+            if text[idx] in _WHITESPACE:
+                idx += 1
+                continue
+            event, idx = _raw_decode(text, idx)
+            yield event
+
+    if buffer.strip():
+        yield json.loads(bytes(buffer))
+
+
+class NdjsonStreamHandler(FormatHandler):
+    """A berserk format handler for long-lived newline delimited JSON streams
+       (e.g. TV feeds, board game state and incoming events). It is a drop-in
+       replacement for berserk's NDJSON handler which decodes each line to a
+       str before parsing. Pass it as the `fmt` on streamed requests.
+    """
+    def __init__(self, chunk_size: int = 512):
+        super().__init__(mime_type="application/x-ndjson")
+        self.chunk_size = chunk_size
+
+    def parse(self, response: Response) -> List[Dict[str, Any]]:
+        """Parses all data from a non-streamed response"""
+        return list(iter_ndjson([response.content]))
+
+    def parse_stream(self, response: Response) -> Iterator[Dict[str, Any]]:
+        """Yields parsed events from a streamed response as they arrive"""
+        yield from iter_ndjson(response.iter_content(chunk_size=self.chunk_size))
+
+
+NDJSON_STREAM = NdjsonStreamHandler()
@@ -0,0 +1 @@
+from .batch_analyzer import BatchAnalyzer, GameRecord, run_batch_analysis
@@ -0,0 +1,296 @@
+from cli_chess.modules.engine import EngineModel, engine_binary_selector, eval_cache, split_engine_resources, get_available_cpus
+from cli_chess.utils import log
+import chess.engine
+import chess.pgn
+import chess
+import asyncio
+import logging
+import json
+import math
+import os
+from time import monotonic
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+# Win percentage drops (from the movers point of view) at which moves are flagged. These match Lichess'
+# winning chances drops of 0.3, 0.2, and 0.1 (on a -1 to 1 scale), converted to win percentages
+JUDGEMENT_THRESHOLDS = [(15, "blunder"), (10, "mistake"), (5, "inaccuracy")]
+
+# Score used in place of mate scores when calculating win percentages
+MATE_SCORE = 100000
+
+
+def win_percent(score: chess.engine.PovScore, color: chess.Color) -> float:
+    """Returns the winning chances (0-100) for the passed in color using Lichess' model"""
+    cp = score.pov(color).score(mate_score=MATE_SCORE)
+    return 50 + 50 * (2 / (1 + math.exp(-0.00368208 * cp)) - 1)
+
+
+def move_accuracy(win_percent_before: float, win_percent_after: float) -> float:
+    """Returns the accuracy (0-100) of a move from the movers win percentage before
+       and after the move was made using Lichess' accuracy model
+    """
+    accuracy = 103.1668 * math.exp(-0.04354 * max(win_percent_before - win_percent_after, 0)) - 3.1669
+    return min(max(accuracy, 0), 100)
+
+
+def get_judgement(win_percent_before: float, win_percent_after: float) -> Optional[str]:
+    """Returns the judgement (blunder, mistake, or inaccuracy) of a move, or None if the move is fine"""
+    for threshold, judgement in JUDGEMENT_THRESHOLDS:
+        if win_percent_before - win_percent_after >= threshold:
+            return judgement
+    return None
+
+
+def format_score(score: chess.engine.PovScore) -> dict:
+    """Returns the score from white's point of view for output"""
+    white_score = score.white()
+    return {'mate': white_score.mate()} if white_score.is_mate() else {'cp': white_score.score()}
+
+
+class GameRecord:
+    """Holds the positions of a game while they are being analysed"""
+    def __init__(self, index: int, game: chess.pgn.Game):
+        self.index = index
+        self.headers = dict(game.headers)
+        self.boards: List[chess.Board] = []
+        self.moves: List[chess.Move] = []
+
+        board = game.board()
+        for move in game.mainline_moves():
+            self.boards.append(board.copy(stack=False))
+            self.moves.append(move)
+            board.push(move)
+        self.boards.append(board.copy(stack=False))
+
+        self.evals: List[Optional[chess.engine.InfoDict]] = [None] * len(self.boards)
+        self.remaining = len(self.boards)
+
+    def set_eval(self, ply: int, info: Optional[chess.engine.InfoDict]) -> bool:
+        """Saves the analysis of the position at the passed in ply.
+           Returns True once all positions of the game have been analysed.
+        """
+        self.evals[ply] = info
+        self.remaining -= 1
+        return self.remaining == 0
+
+    def to_output(self) -> dict:
+        """Returns the analysed game with per move evaluations, judgements and accuracy"""
+        moves = []
+        accuracy: Dict[chess.Color, List[float]] = {chess.WHITE: [], chess.BLACK: []}
+        for ply, move in enumerate(self.moves):
+            board, before, after = self.boards[ply], self.evals[ply], self.evals[ply + 1]
+            output = {'ply': ply + 1, 'move': board.san(move), 'uci': move.uci()}
+
+            if before and after:
+                color = board.turn
+                before_percent, after_percent = win_percent(before["score"], color), win_percent(after["score"], color)
+                output['eval'] = format_score(after["score"])
+                if before.get("pv"):
+                    output['best'] = board.san(before["pv"][0])
+                output['judgement'] = get_judgement(before_percent, after_percent)
+                output['accuracy'] = round(move_accuracy(before_percent, after_percent), 1)
+                accuracy[color].append(output['accuracy'])
+            moves.append(output)
+
+        return {
+            'game': self.index,
+            'headers': self.headers,
+            'accuracy': {chess.COLOR_NAMES[color]: round(sum(values) / len(values), 1) if values else None
+                         for color, values in accuracy.items()},
+            'moves': moves,
+        }
+
+
+class BatchAnalyzer:
+    """Analyses every position of the games in a PGN file using a pool of engine
+       processes (one per worker) driven from a single asyncio event loop, so
+       positions are analysed in parallel across CPU cores. Games are streamed
+       from the PGN file and written to the output file (one JSON object per line)
+       as they complete. Games which are already in the output file are skipped,
+       so an interrupted analysis can be resumed by running it again. The available
+       CPUs and memory are split between the engines, and a hash size of 0 is auto.
+    """
+    def __init__(self, pgn_path: str, output_path: str, limit: chess.engine.Limit, workers: int = 1, hash_size: int = 0,
+                 progress: Optional[Callable[[str], None]] = None, report_interval: float = 5):
+        self.pgn_path = pgn_path
+        self.output_path = output_path
+        self.limit = limit
+        self.workers = max(workers, 1)
+        self.hash_size = hash_size
+        self.engine_options = split_engine_resources(0, hash_size, self.workers)
+        self.progress = progress if progress else lambda message: None
+        self.report_interval = report_interval
+
+        self.games_analyzed = 0
+        self.positions_analyzed = 0
+        self._engines: List[chess.engine.UciProtocol] = []
+        self._start_time = 0.0
+        self._last_report = 0.0
+
+    async def run(self) -> None:
+        """Runs the batch analysis until all games in the PGN file are analysed"""
+        completed = self._load_completed_games()
+        if completed:
+            self.progress(f"Resuming analysis ({len(completed)} games already analysed)")
+
+        await engine_binary_selector.bench()
+        self._engines = list(await asyncio.gather(*[self._start_engine() for _ in range(self.workers)]))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.workers * 4)
+        self._start_time = self._last_report = monotonic()
+
+        with open(self.output_path, "a") as output:
+            worker_tasks = [asyncio.ensure_future(self._worker(index, queue, output)) for index in range(self.workers)]
+            try:
+                for record in self._read_games(completed):
+                    for ply, board in enumerate(record.boards):
+                        await queue.put((record, ply, board))
+                await queue.join()
+            finally:
+                for task in worker_tasks:
+                    task.cancel()
+                await asyncio.gather(*worker_tasks, return_exceptions=True)
+                for engine in self._engines:
+                    await self._quit_engine(engine)
+                self._engines = []
+
+        self._report_progress(final=True)
+
+    def get_positions_per_second(self) -> float:
+        """Returns the analysis throughput"""
+        elapsed = monotonic() - self._start_time
+        return self.positions_analyzed / elapsed if elapsed > 0 else 0.0
+
+    async def _worker(self, index: int, queue: asyncio.Queue, output) -> None:
+        """Analyses queued positions using the engine at the passed in index, writing
+           out each game once all of its positions are analysed. The engine is
+           restarted if it terminates, and the position is left without an evaluation.
+        """
+        while True:
+            record, ply, board = await queue.get()
+            try:
+                try:
+                    info = await self._analyse(self._engines[index], board)
+                except chess.engine.EngineTerminatedError as e:
+                    log.error(f"Engine terminated while analysing position ({board.fen()}): {e}")
+                    info = None
+                    await self._quit_engine(self._engines[index])
+                    self._engines[index] = await self._start_engine()
+                except chess.engine.EngineError as e:
+                    log.error(f"Error analysing position ({board.fen()}): {e}")
+                    info = None
+
+                self.positions_analyzed += 1
+                if record.set_eval(ply, info):
+                    output.write(json.dumps(record.to_output()) + "\n")
+                    output.flush()
+                    self.games_analyzed += 1
+
+                if monotonic() - self._last_report >= self.report_interval:
+                    self._report_progress()
+            finally:
+                queue.task_done()
+
+    async def _analyse(self, engine: chess.engine.UciProtocol, board: chess.Board) -> chess.engine.InfoDict:
+        """Returns the analysis of the passed in position. Finished games are scored
+           without the engine, and results are shared through the evaluation cache.
+        """
+        outcome = board.outcome()
+        if outcome:
+            score = chess.engine.Cp(0) if outcome.winner is None else chess.engine.MateGiven
+            return {'score': chess.engine.PovScore(score, outcome.winner if outcome.winner is not None else chess.WHITE)}
+
+        if self.limit.depth:
+            cached = eval_cache.get(board, min_depth=self.limit.depth)
+            if cached:
+                return {'score': cached.score, 'depth': cached.depth, 'pv': cached.pv}
+
+        info = await engine.analyse(board, self.limit)
+        eval_cache.put(board, info)
+        return info
+
+    def _read_games(self, completed: Set[int]) -> Iterator[GameRecord]:
+        """Streams the games from the PGN file, skipping games which are already completed"""
+        with open(self.pgn_path, encoding="utf-8-sig", errors="replace") as pgn:
+            index = 0
+            while True:
+                if index in completed:
+                    if not chess.pgn.skip_game(pgn):
+                        return
+                else:
+                    game = chess.pgn.read_game(pgn)
+                    if game is None:
+                        return
+                    if game.errors:
+                        log.error(f"Skipping invalid game {index}: {game.errors[0]}")
+                    else:
+                        yield GameRecord(index, game)
+                index += 1
+
+    def _load_completed_games(self) -> Set[int]:
+        """Returns the indexes of the games already in the output file. A partially
+           written last line (e.g. from an interrupted run) is removed, and other
+           invalid lines are logged and skipped, so their games are analysed again.
+        """
+        completed = set()
+        if not os.path.exists(self.output_path):
+            return completed
+
+        with open(self.output_path, "rb+") as output:
+            length = 0
+            for line_number, line in enumerate(output, 1):
+                if not line.endswith(b"\n"):
+                    output.truncate(length)
+                    break
+                length += len(line)
+                try:
+                    completed.add(json.loads(line)['game'])
+                except (ValueError, KeyError, TypeError):
+                    log.error(f"Skipping invalid result on line {line_number} of {self.output_path}")
+        return completed
+
+    async def _start_engine(self) -> chess.engine.UciProtocol:
+        """Starts and configures an engine process for a worker"""
+        _, engine = await chess.engine.popen_uci(EngineModel.get_engine_path())
+        await engine.configure(self.engine_options)
+        return engine
+
+    @staticmethod
+    async def _quit_engine(engine: chess.engine.UciProtocol) -> None:
+        """Quits the passed in engine"""
+        try:
+            await engine.quit()
+        except Exception as e:
+            log.error(f"Error quitting engine: {e}")
+
+    def _report_progress(self, final: bool = False) -> None:
+        """Reports the analysis throughput"""
+        self._last_report = monotonic()
+        prefix = "Finished analysing" if final else "Analysed"
+        self.progress(f"{prefix} {self.games_analyzed} games ({self.positions_analyzed} positions) "
+                      f"at {self.get_positions_per_second():.1f} positions/s")
+
+
+def run_batch_analysis(pgn_path: str, output_path: Optional[str] = None, depth: Optional[int] = None,
+                       time: Optional[float] = None, workers: Optional[int] = None, hash_size: int = 0) -> int:
+    """Runs a batch analysis of the games in the passed in PGN file. Returns the exit code"""
+    if not os.path.isfile(pgn_path):
+        print(f"PGN file not found: {pgn_path}")
+        return 1
+
+    # Engine output is not logged during batch analysis as the log would grow very large
+    logging.getLogger("chess.engine").setLevel(logging.WARNING)
+
+    output_path = output_path if output_path else os.path.splitext(pgn_path)[0] + ".analysis.ndjson"
+    limit = chess.engine.Limit(time=time) if time else chess.engine.Limit(depth=depth if depth else 16)
+    analyzer = BatchAnalyzer(pgn_path, output_path, limit, workers if workers else get_available_cpus(), hash_size, progress=print)
+
+    try:
+        print(f"Analysing {pgn_path} with {analyzer.workers} engines ({analyzer.engine_options['Threads']} threads, "
+              f"{analyzer.engine_options['Hash']} MB hash each, {limit}). Results: {output_path}")
+        asyncio.run(analyzer.run())
+    except KeyboardInterrupt:
+        print("Analysis interrupted. Run the same command again to resume.")
+        return 130
+    finally:
+        eval_cache.close()
+    return 0
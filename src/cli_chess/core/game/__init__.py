@@ -1,6 +1,18 @@
-from .game_model_base import GameModelBase, PlayableGameModelBase
-from .game_view_base import GameViewBase, PlayableGameViewBase
-from .game_presenter_base import GamePresenterBase, PlayableGamePresenterBase
-from .online_game.online_game_presenter import start_online_game
-from .offline_game.offline_game_presenter import start_offline_game
-from .game_metadata import GameMetadata, PlayerMetadata, ClockMetadata
+from cli_chess.utils.common import lazy_exports
+
+# The game modules are imported on first use, so modules which only need a leaf
+# module of this package (e.g. the engine importing the game options) don't import
+# the game presenters, which import the engine and analysis modules in turn
+__getattr__ = lazy_exports(__name__, {
+    "GameModelBase": "game_model_base",
+    "PlayableGameModelBase": "game_model_base",
+    "GameViewBase": "game_view_base",
+    "PlayableGameViewBase": "game_view_base",
+    "GamePresenterBase": "game_presenter_base",
+    "PlayableGamePresenterBase": "game_presenter_base",
+    "start_online_game": "online_game.online_game_presenter",
+    "start_offline_game": "offline_game.offline_game_presenter",
+    "GameMetadata": "game_metadata",
+    "PlayerMetadata": "game_metadata",
+    "ClockMetadata": "game_metadata",
+})
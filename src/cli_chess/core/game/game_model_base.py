@@ -7,6 +7,9 @@ from .game_metadata import GameMetadata
 from chess import Color, WHITE, COLOR_NAMES
 from random import getrandbits
 from abc import ABC, abstractmethod
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from cli_chess.modules.engine import Hint
 
 
 class GameModelBase:
@@ -94,3 +97,15 @@ class PlayableGameModelBase(GameModelBase, ABC):
     @abstractmethod
     def resign(self) -> None:
         pass
+
+    async def get_hint(self) -> Optional["Hint"]:
+        """Returns the engine's suggested move for the current position.
+           Games which support engine assistance override this.
+        """
+        raise Warning("Hints are not available in this game")
+
+    async def get_threat(self) -> Optional["Hint"]:
+        """Returns the opponent's best move if it were their turn.
+           Games which support engine assistance override this.
+        """
+        raise Warning("Threats are not available in this game")
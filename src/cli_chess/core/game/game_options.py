@@ -93,7 +93,8 @@ class OfflineGameOptions(BaseGameOptions):
             GameOption.COLOR: BaseGameOptions.color_options,
         }
 
-    time_control_options_dict = dict(BaseGameOptions.time_control_options_dict)
+    time_control_options_dict = {"Unlimited": None}
+    time_control_options_dict.update(BaseGameOptions.time_control_options_dict)
     additional_time_controls = {
         "5+3 (Blitz)": (5, 3),
         "5+0 (Blitz)": (5, 0),
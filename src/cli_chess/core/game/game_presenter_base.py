@@ -6,7 +6,9 @@ from cli_chess.modules.material_difference import MaterialDifferencePresenter
 from cli_chess.modules.player_info import PlayerInfoPresenter
 from cli_chess.modules.clock import ClockPresenter
 from cli_chess.modules.premove import PremovePresenter
+from cli_chess.modules.analysis import AnalysisPresenter
 from cli_chess.utils import log, AlertType, RequestSuccessfullySent, EventTopics
+from prompt_toolkit.application import get_app
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
@@ -89,6 +91,10 @@ class PlayableGamePresenterBase(GamePresenterBase, ABC):
                 self.offer_draw()
             elif inpt_lower == "takeback" or inpt_lower == "back" or inpt_lower == "undo":
                 self.propose_takeback()
+            elif inpt_lower == "hint":
+                self.show_hint()
+            elif inpt_lower == "threat":
+                self.show_threat()
             elif self.model.is_my_turn():
                 self.make_move(inpt)
             else:
@@ -125,6 +131,25 @@ class PlayableGamePresenterBase(GamePresenterBase, ABC):
             else:
                 self.view.alert.show_alert(str(e))
 
+    def show_hint(self) -> None:
+        """Shows the engine's suggested move for the current position"""
+        get_app().create_background_task(self._show_engine_suggestion(threat=False))
+
+    def show_threat(self) -> None:
+        """Shows the opponent's best move if it were their turn"""
+        get_app().create_background_task(self._show_engine_suggestion(threat=True))
+
+    async def _show_engine_suggestion(self, threat: bool) -> None:
+        """Requests the hint or threat from the model on the app's event loop and displays it"""
+        try:
+            hint = await (self.model.get_threat() if threat else self.model.get_hint())
+            if hint:
+                label = "Threat" if threat else "Hint"
+                self.view.alert.show_alert(f"{label}: {hint.san} ({AnalysisPresenter.format_score(hint.score)}, depth {hint.depth})",
+                                           AlertType.NEUTRAL)
+        except Exception as e:
+            self.view.alert.show_alert(str(e))
+
     def resign(self) -> None:
         """Resigns the game"""
         try:
@@ -131,27 +131,28 @@ class PlayableGameViewBase(GameViewBase, ABC):
             ("class:function-bar.spacer", " "),
         )
 
-    def _create_function_bar(self) -> VSplit:
-        """Create the conditional function bar"""
-        def _get_function_bar_fragments() -> StyleAndTextTuples:
-            fragments = ([])
-            fragments.extend(self._flip_board_fb_fragments())
+    def _get_function_bar_fragments(self) -> StyleAndTextTuples:
+        """Returns the function bar fragments based on the current game state"""
+        fragments = ([])
+        fragments.extend(self._flip_board_fb_fragments())
 
-            if self.presenter.is_game_in_progress():
-                fragments.extend(self._takeback_fb_fragments())
+        if self.presenter.is_game_in_progress():
+            fragments.extend(self._takeback_fb_fragments())
 
-                if not self.presenter.is_vs_ai():
-                    fragments.extend(self._draw_fb_fragments())
+            if not self.presenter.is_vs_ai():
+                fragments.extend(self._draw_fb_fragments())
 
-                fragments.extend(self._resign_fb_fragments())
-                if self.presenter.premove_presenter.is_premove_set():
-                    fragments.extend(self._clear_premove_fb_fragments())
-            else:
-                fragments.extend(self._exit_fb_fragments())
-            return fragments
+            fragments.extend(self._resign_fb_fragments())
+            if self.presenter.premove_presenter.is_premove_set():
+                fragments.extend(self._clear_premove_fb_fragments())
+        else:
+            fragments.extend(self._exit_fb_fragments())
+        return fragments
 
+    def _create_function_bar(self) -> VSplit:
+        """Create the conditional function bar"""
         return VSplit([
-            Window(FormattedTextControl(_get_function_bar_fragments)),
+            Window(FormattedTextControl(self._get_function_bar_fragments)),
         ], height=D(max=1, preferred=1))
 
     def get_key_bindings(self) -> "_MergedKeyBindings":  # noqa: F821:
@@ -1,10 +1,13 @@
 from cli_chess.core.game import PlayableGameModelBase
-from cli_chess.modules.engine import EngineModel
+from cli_chess.modules.engine import EngineModel, EngineHints, Hint
+from cli_chess.modules.analysis import AnalysisModel
 from cli_chess.core.game.game_options import GameOption
 from cli_chess.utils import EventTopics, log
 from cli_chess.utils.config import player_info_config
-from chess import COLOR_NAMES
+from chess import COLOR_NAMES, COLORS, Color
+from time import monotonic
 from typing import Optional, Dict
+import asyncio
 
 
 class OfflineGameModel(PlayableGameModelBase):
@@ -12,19 +15,108 @@ class OfflineGameModel(PlayableGameModelBase):
         super().__init__(play_as_color=game_parameters[GameOption.COLOR],
                          variant=game_parameters[GameOption.VARIANT])
 
-        self.engine_model = EngineModel(self.board_model, game_parameters)
+        self.engine_model = EngineModel(self.board_model, game_parameters, self.game_metadata)
+        self.analysis_model = AnalysisModel(self.board_model)
+        self.engine_hints = EngineHints()
+        self._assoc_models = self._assoc_models + [self.analysis_model]
         self.game_in_progress = True
+        self._clock_turn = self.board_model.get_turn()
+        self._clock_turn_started = monotonic()
+        self._clock_ply = self.board_model.board.ply()
+        self._flag_timer: Optional[asyncio.TimerHandle] = None
         self._update_game_metadata(EventTopics.GAME_PARAMS, data=game_parameters)
+        self._schedule_flag_timer()
 
     def update(self, *args, **kwargs) -> None:
         """Called automatically as part of an event listener. This method
            listens to subscribed model update events and if deemed necessary
            triages and notifies listeners of the event.
         """
+        clocks_updated = EventTopics.MOVE_MADE in args and self.game_in_progress
+        flagged_color = self._update_clocks() if clocks_updated else None
+
         super().update(*args, **kwargs)
         if EventTopics.GAME_END in args:
             self._report_game_over()
 
+        if clocks_updated:
+            self._handle_clock_update(flagged_color)
+
+    def cleanup(self) -> None:
+        """Stops the clock and cleans up after this model. Overrides base."""
+        self._cancel_flag_timer()
+        super().cleanup()
+
+    def is_timed_game(self) -> bool:
+        """Returns True if this game is being played with a time control"""
+        return self.game_metadata.clocks[self.my_color].time is not None
+
+    def _update_clocks(self) -> Optional[Color]:
+        """Charges the time spent since the last clock update to the side whose clock
+           was running, and adds the increment if that side completed their move (a
+           takeback never adds the increment). Clocks are tracked locally in milliseconds.
+           Returns the color of the side that ran out of time, otherwise None.
+        """
+        if not self.is_timed_game():
+            return None
+
+        now = monotonic()
+        color = self._clock_turn
+        clock = self.game_metadata.clocks[color]
+        clock.time -= int((now - self._clock_turn_started) * 1000)
+        ply = self.board_model.board.ply()
+        flagged = clock.time <= 0
+        if flagged:
+            clock.time = 0
+        elif self.board_model.get_turn() != color and ply > self._clock_ply:
+            clock.time += clock.increment
+
+        self._clock_turn = self.board_model.get_turn()
+        self._clock_turn_started = now
+        self._clock_ply = ply
+        self.game_metadata.set_clock_ticking(self._clock_turn)
+        return color if flagged else None
+
+    def _handle_clock_update(self, flagged_color: Optional[Color]) -> None:
+        """Ends the game if the passed in side ran out of time, otherwise restarts the
+           flag timer for the side to move. A side is not flagged if the game already
+           ended (e.g. the flagging move was checkmate).
+        """
+        if not self.game_in_progress or self.board_model.get_game_over_result() is not None:
+            return
+        if flagged_color is not None:
+            self.board_model.handle_timeout(flagged_color)
+        else:
+            self._schedule_flag_timer()
+
+    def _schedule_flag_timer(self) -> None:
+        """Schedules a clock update on the event loop for when the side to move runs out
+           of time, so they are flagged without having to move. Outside an event loop
+           a side is only flagged once they move.
+        """
+        self._cancel_flag_timer()
+        if not self.game_in_progress or not self.is_timed_game():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        remaining = self.game_metadata.clocks[self._clock_turn].time / 1000 - (monotonic() - self._clock_turn_started)
+        self._flag_timer = loop.call_later(max(remaining, 0), self._on_flag_timer)
+
+    def _on_flag_timer(self) -> None:
+        """Updates the clocks once the side to move may have run out of time"""
+        self._flag_timer = None
+        if self.game_in_progress:
+            self._handle_clock_update(self._update_clocks())
+
+    def _cancel_flag_timer(self) -> None:
+        """Cancels the scheduled flag timer"""
+        if self._flag_timer:
+            self._flag_timer.cancel()
+            self._flag_timer = None
+
     def make_move(self, move: str):
         """Sends the move to the board model for it to be made"""
         if self.game_in_progress:
@@ -57,6 +149,7 @@ class OfflineGameModel(PlayableGameModelBase):
 
             self.premove_model.clear_premove()
             self.board_model.takeback(self.my_color)
+            self.engine_model.cancel_search()
         except Exception as e:
             log.error(f"Takeback failed - {e}")
             raise
@@ -75,6 +168,30 @@ class OfflineGameModel(PlayableGameModelBase):
             log.warning("Attempted to resign a game that's not in progress")
             raise Warning("Game has already ended")
 
+    async def get_hint(self) -> Optional[Hint]:
+        """Returns the engine's suggested move for the current position. Overrides base."""
+        return await self._get_engine_suggestion(threat=False)
+
+    async def get_threat(self) -> Optional[Hint]:
+        """Returns the engine's best move for the opponent if it were their turn. Overrides base."""
+        return await self._get_engine_suggestion(threat=True)
+
+    async def _get_engine_suggestion(self, threat: bool) -> Optional[Hint]:
+        """Returns the hint or threat for the current position. Returns None if
+           the position changed before the search completed.
+        """
+        if not self.game_in_progress:
+            raise Warning("Game has already ended")
+        if not self.is_my_turn():
+            raise Warning("Wait for your turn")
+
+        board = self.board_model.board.copy()
+        hint = await (self.engine_hints.get_threat(board) if threat else self.engine_hints.get_hint(board))
+        if len(board.move_stack) != len(self.board_model.board.move_stack) or board.fen() != self.board_model.board.fen():
+            log.debug("Discarding engine suggestion for a position no longer on the board")
+            return None
+        return hint
+
     def _update_game_metadata(self, *args, data: Optional[Dict] = None, **kwargs) -> None:
         """Parses and saves the data of the game being played"""
         if not data:
@@ -89,6 +206,14 @@ class OfflineGameModel(PlayableGameModelBase):
                 self.game_metadata.players[not self.my_color].name = engine_name
                 self.game_metadata.players[not self.my_color].rating = data.get(GameOption.COMPUTER_ELO, "")
 
+                time_control = data.get(GameOption.TIME_CONTROL)
+                if time_control:
+                    for color in COLORS:
+                        self.game_metadata.clocks[color].units = "ms"
+                        self.game_metadata.clocks[color].time = time_control[0] * 60 * 1000
+                        self.game_metadata.clocks[color].increment = time_control[1] * 1000
+                    self.game_metadata.set_clock_ticking(self._clock_turn)
+
             self._notify_game_model_updated(*args, **kwargs)
         except KeyError as e:
             log.error(f"Error saving offline game metadata: {e}")
@@ -98,6 +223,9 @@ class OfflineGameModel(PlayableGameModelBase):
            This should only ever be called if the game is confirmed to be over
         """
         self.game_in_progress = False
+        self._cancel_flag_timer()
+        self.game_metadata.set_clock_ticking(None)
+        self.engine_model.cancel_search()
         outcome = self.board_model.get_game_over_result()
         self.game_metadata.game_status.status = outcome.termination
         self.game_metadata.game_status.winner = COLOR_NAMES[outcome.winner]
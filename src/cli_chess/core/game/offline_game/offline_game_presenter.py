@@ -1,9 +1,11 @@
 from cli_chess.core.game.offline_game import OfflineGameModel, OfflineGameView
 from cli_chess.core.game import PlayableGamePresenterBase
 from cli_chess.modules.engine import EnginePresenter
+from cli_chess.modules.analysis import AnalysisPresenter
 from cli_chess.utils.ui_common import change_views
-from cli_chess.utils import log, threaded, AlertType
+from cli_chess.utils import log, AlertType
 from chess import Termination, COLOR_NAMES, Color
+from prompt_toolkit.application import get_app
 
 
 def start_offline_game(game_parameters: dict):
@@ -16,14 +18,13 @@ class OfflineGamePresenter(PlayableGamePresenterBase):
     def __init__(self, model: OfflineGameModel):
         self.model = model
         self.engine_presenter = EnginePresenter(self.model.engine_model)
+        self.analysis_presenter = AnalysisPresenter(self.model.analysis_model)
+        self.show_telemetry = False
         super().__init__(model)
 
-        try:
-            self.engine_presenter.start_engine()
-            if self.model.board_model.get_turn() != self.model.my_color:
-                self.make_engine_move()
-        except Exception as e:
-            self.view.alert.show_alert(str(e))
+        self._engine_started = get_app().create_background_task(self._start_engine())
+        if self.model.board_model.get_turn() != self.model.my_color:
+            self.make_engine_move()
 
     def _get_view(self) -> OfflineGameView:
         """Sets and returns the view to use"""
@@ -46,11 +47,25 @@ class OfflineGamePresenter(PlayableGamePresenterBase):
             else:
                 self.view.alert.show_alert(str(e))
 
-    @threaded
+    async def _start_engine(self) -> None:
+        """Starts the engine on the app's event loop"""
+        try:
+            await self.engine_presenter.start_engine()
+        except Exception as e:
+            self.view.alert.show_alert(str(e))
+
     def make_engine_move(self) -> None:
+        """Schedules the engine move on the app's event loop. The engine
+           search does not block the UI and is cancelled on takeback,
+           resignation, or exit.
+        """
+        get_app().create_background_task(self._make_engine_move())
+
+    async def _make_engine_move(self) -> None:
         """Get the best move from the engine and make it"""
         try:
-            engine_move = self.engine_presenter.get_best_move()
+            await self._engine_started
+            engine_move = await self.engine_presenter.get_best_move()
 
             if engine_move.resigned:
                 log.debug("Sending resignation on behalf of the engine")
@@ -67,6 +82,29 @@ class OfflineGamePresenter(PlayableGamePresenterBase):
             log.error(e)
             self.view.alert.show_alert(str(e))
 
+    def toggle_analysis(self) -> None:
+        """Toggles the live engine analysis of the current position"""
+        get_app().create_background_task(self._toggle_analysis())
+
+    async def _toggle_analysis(self) -> None:
+        """Starts or stops the analysis on the app's event loop"""
+        try:
+            if self.analysis_presenter.is_enabled():
+                await self.analysis_presenter.stop_analysis()
+            else:
+                await self.analysis_presenter.start_analysis()
+        except Exception as e:
+            self.view.alert.show_alert(str(e))
+
+    def toggle_telemetry(self) -> None:
+        """Toggles the engine search telemetry display"""
+        self.show_telemetry = not self.show_telemetry
+        get_app().invalidate()
+
+    def is_telemetry_shown(self) -> bool:
+        """Returns True if the engine search telemetry is displayed"""
+        return self.show_telemetry
+
     def _parse_and_present_game_over(self) -> None:
         """Triages game over status for parsing and sending to the view for display"""
         if not self.is_game_in_progress():
@@ -107,6 +145,9 @@ class OfflineGamePresenter(PlayableGamePresenterBase):
         elif status == "resignation":
             loser = COLOR_NAMES[not winner_bool].capitalize()
             output = f"{loser} resigned" + output
+        elif status == "outoftime":
+            loser = COLOR_NAMES[not winner_bool].capitalize()
+            output = f"{loser} time out" + output
         else:
             log.debug(f"Received game over with uncaught status: {status} / {winner_str}")
             output = "Game over" + output
@@ -146,6 +187,8 @@ class OfflineGamePresenter(PlayableGamePresenterBase):
         """Exit current presenter/view"""
         try:
             super().exit()
-            self.engine_presenter.quit_engine()
+            get_app().create_background_task(self.engine_presenter.quit_engine())
+            get_app().create_background_task(self.analysis_presenter.stop_analysis())
+            get_app().create_background_task(self.model.engine_hints.quit())
         except Exception as e:
             log.error(f"Error caught while exiting: {e}")
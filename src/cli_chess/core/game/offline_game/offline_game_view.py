@@ -1,8 +1,13 @@
 from __future__ import annotations
 from cli_chess.core.game import PlayableGameViewBase
-from prompt_toolkit.layout import Container, HSplit, VSplit, VerticalAlign
+from cli_chess.utils.ui_common import handle_mouse_click
+from prompt_toolkit.layout import Container, ConditionalContainer, HSplit, VSplit, VerticalAlign, Window, FormattedTextControl, D
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.formatted_text import StyleAndTextTuples
+from prompt_toolkit.key_binding import KeyBindings, merge_key_bindings
+from prompt_toolkit.keys import Keys
 from prompt_toolkit.widgets import Box
-from typing import TYPE_CHECKING
+from typing import Tuple, TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.core.game.offline_game import OfflineGamePresenter
 
@@ -10,8 +15,18 @@ if TYPE_CHECKING:
 class OfflineGameView(PlayableGameViewBase):
     def __init__(self, presenter: OfflineGamePresenter):
         self.presenter = presenter
+        self.analysis_container = presenter.analysis_presenter.view
+        self.telemetry_container = self._create_telemetry_container()
         super().__init__(presenter)
 
+    def _create_telemetry_container(self) -> Container:
+        """Creates the engine telemetry container. The container is hidden unless toggled on"""
+        telemetry_control = FormattedTextControl(text=self.presenter.engine_presenter.get_formatted_telemetry, style="class:analysis")
+        return ConditionalContainer(
+            Box(Window(telemetry_control, wrap_lines=False, height=D(max=2)), padding=0, padding_top=1),
+            Condition(self.presenter.is_telemetry_shown)
+        )
+
     def _create_container(self) -> Container:
         main_content = Box(
             HSplit([
@@ -23,6 +38,8 @@ class OfflineGameView(PlayableGameViewBase):
                         self.move_list_container,
                         self.material_diff_lower_container,
                         self.player_info_lower_container,
+                        self.analysis_container,
+                        self.telemetry_container,
                     ]), padding=0, padding_top=1)
                 ]),
                 self.input_field_container,
@@ -36,3 +53,36 @@ class OfflineGameView(PlayableGameViewBase):
         ], align=VerticalAlign.BOTTOM)
 
         return HSplit([main_content, function_bar], key_bindings=self.get_key_bindings())
+
+    def _analysis_fb_fragments(self) -> Tuple:
+        """Returns the function bar fragments for toggling the analysis and engine telemetry"""
+        return (
+            ("class:function-bar.key", "F5", handle_mouse_click(self.presenter.toggle_analysis)),
+            ("class:function-bar.label", f"{'Analysis':<11}", handle_mouse_click(self.presenter.toggle_analysis)),
+            ("class:function-bar.spacer", " "),
+            ("class:function-bar.key", "F6", handle_mouse_click(self.presenter.toggle_telemetry)),
+            ("class:function-bar.label", f"{'Telemetry':<11}", handle_mouse_click(self.presenter.toggle_telemetry)),
+            ("class:function-bar.spacer", " "),
+        )
+
+    def _get_function_bar_fragments(self) -> StyleAndTextTuples:
+        """Returns the function bar fragments. Overrides base to add the analysis and telemetry toggles"""
+        fragments = super()._get_function_bar_fragments()
+        fragments.extend(self._analysis_fb_fragments())
+        return fragments
+
+    def get_key_bindings(self) -> "_MergedKeyBindings":  # noqa: F821:
+        """Returns the key bindings for this container"""
+        bindings = KeyBindings()
+
+        @bindings.add(Keys.F5, eager=True)
+        def _(event):
+            if not event.is_repeat:
+                self.presenter.toggle_analysis()
+
+        @bindings.add(Keys.F6, eager=True)
+        def _(event):
+            if not event.is_repeat:
+                self.presenter.toggle_telemetry()
+
+        return merge_key_bindings([bindings, super().get_key_bindings()])
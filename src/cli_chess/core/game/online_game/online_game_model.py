@@ -1,11 +1,12 @@
+from __future__ import annotations
 from cli_chess.core.game import PlayableGameModelBase
 from cli_chess.core.game.game_options import GameOption
-from cli_chess.core.api import GameStateDispatcher
 from cli_chess.utils import log, threaded, RequestSuccessfullySent, EventTopics
 from chess import COLORS, COLOR_NAMES, WHITE, BLACK, Color
-from berserk.formats import TEXT
 from enum import Enum, auto
-from typing import Optional, Dict
+from typing import Optional, Dict, TYPE_CHECKING
+if TYPE_CHECKING:
+    from cli_chess.core.api import GameStateDispatcher
 
 
 class EventSender(Enum):
@@ -24,7 +25,7 @@ class OnlineGameModel(PlayableGameModelBase):
         self.playing_game_id = None
         self.searching = False
         self._update_game_metadata(EventTopics.GAME_PARAMS, sender=EventSender.LOCAL, data=game_parameters)
-        self.game_state_dispatcher = Optional[GameStateDispatcher]
+        self.game_state_dispatcher: Optional[GameStateDispatcher] = None
 
         try:
             from cli_chess.core.api.api_manager import api_client, api_iem
@@ -51,6 +52,7 @@ class OnlineGameModel(PlayableGameModelBase):
                                                      color=COLOR_NAMES[self.my_color],
                                                      variant=self.game_metadata.variant)
             else:  # Find a random opponent
+                from berserk.formats import TEXT
                 payload = {
                     "rated": str(self.game_metadata.rated).lower(),
                     "time": self.game_metadata.clocks[WHITE].time,
@@ -79,6 +81,7 @@ class OnlineGameModel(PlayableGameModelBase):
             self.searching = False
             self.playing_game_id = game_id
 
+            from cli_chess.core.api import GameStateDispatcher
             self.game_state_dispatcher = GameStateDispatcher(game_id)
             self.game_state_dispatcher.add_event_listener(self._handle_gsd_event)
             self.game_state_dispatcher.start()
@@ -1,12 +1,13 @@
+from __future__ import annotations
 from cli_chess.core.game import GameModelBase
-from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
 from cli_chess.utils.event import Event, EventTopics
 from cli_chess.utils.logging import log
+from cli_chess.utils.ui_dispatcher import ui_dispatcher
 from chess import COLOR_NAMES, COLORS, Color, WHITE
-from berserk.exceptions import ResponseError
-from time import sleep
-from typing import Optional, Dict
+from typing import Optional, Dict, TYPE_CHECKING
 import threading
+if TYPE_CHECKING:
+    from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
 
 
 class WatchTVModel(GameModelBase):
@@ -101,13 +102,14 @@ class StreamTVChannel(threading.Thread):
 
     def run(self):
         """Main entrypoint for the thread"""
+        from cli_chess.core.api.ndjson_stream import NDJSON_STREAM
         log.info(f"Started watching {self.channel.value} TV")
         while not self._stopped.is_set():
             try:
-                self.e_tv_stream_event.notify(EventTopics.GAME_SEARCH)
+                ui_dispatcher.dispatch(self.e_tv_stream_event.notify, EventTopics.GAME_SEARCH)
 
                 # TODO: Update to use berserk TV specific method once implemented
-                stream = self.api_client.tv._r.get(f"/api/tv/{self.channel.key}/feed", stream=True)  # noqa
+                stream = self.api_client.tv._r.get(f"/api/tv/{self.channel.key}/feed", stream=True, fmt=NDJSON_STREAM)  # noqa
 
                 for event in stream:
                     if self._stopped.is_set():
@@ -123,10 +125,11 @@ class StreamTVChannel(threading.Thread):
 
                     if t == 'featured':
                         log.info(f"Started streaming TV game: {d.get('id')}")
-                        self.e_tv_stream_event.notify(EventTopics.GAME_START, data=d)
+                        ui_dispatcher.dispatch(self.e_tv_stream_event.notify, EventTopics.GAME_START, data=d)
 
                     if t == 'fen':
-                        self.e_tv_stream_event.notify(EventTopics.MOVE_MADE, data=d)
+                        # Fen events hold the full position and clocks, so a queued fen event is superseded by a newer one
+                        ui_dispatcher.dispatch(self.e_tv_stream_event.notify, EventTopics.MOVE_MADE, data=d, coalesce_key=EventTopics.MOVE_MADE)
 
             except Exception as e:
                 self.handle_exceptions(e)
@@ -135,10 +138,12 @@ class StreamTVChannel(threading.Thread):
                 if not self._stopped.is_set():
                     self.retries = 0
                     log.debug("Sleeping 2 seconds before finding next TV game")
-                    sleep(2)
+                    # Waiting on the stop event lets a stopped thread exit right away rather than linger
+                    self._stopped.wait(2)
 
     def handle_exceptions(self, e: Exception):
         """Handles the passed in exception and responds appropriately"""
+        from berserk.exceptions import ResponseError
         log.error(e)
         if self.retries <= self.max_retries:
             delay = 2 * (self.retries + 1)
@@ -148,14 +153,14 @@ class StreamTVChannel(threading.Thread):
                     delay = 60
 
             log.info(f"Sleeping {delay} seconds before retrying ({self.max_retries - self.retries} retries left).")
-            self.e_tv_stream_event.notify(EventTopics.ERROR, msg=f"Error streaming. Retrying in {delay} seconds.")
-            sleep(delay)
+            ui_dispatcher.dispatch(self.e_tv_stream_event.notify, EventTopics.ERROR, msg=f"Error streaming. Retrying in {delay} seconds.")
+            self._stopped.wait(delay)
             self.retries += 1
         else:
-            self.e_tv_stream_event.notify(EventTopics.ERROR, msg="Retries exhausted. Stopping TV.")
+            ui_dispatcher.dispatch(self.e_tv_stream_event.notify, EventTopics.ERROR, msg="Retries exhausted. Stopping TV.")
             self.stop_watching()
 
     def stop_watching(self):
         log.info("Stopping TV stream")
         self._stopped.set()
-        self.e_tv_stream_event.remove_all_listeners()
+        ui_dispatcher.dispatch(self.e_tv_stream_event.remove_all_listeners)
@@ -1,8 +1,11 @@
+from __future__ import annotations
 from cli_chess.core.game import GamePresenterBase
 from cli_chess.core.game.online_game.watch_tv import WatchTVModel, WatchTVView
-from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
 from cli_chess.utils.ui_common import change_views
 from cli_chess.utils import AlertType, EventTopics
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from cli_chess.menus.tv_channel_menu import TVChannelMenuOptions
 
 
 def start_watching_tv(channel: TVChannelMenuOptions) -> None:
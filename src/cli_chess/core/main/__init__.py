@@ -1,3 +1,6 @@
+from cli_chess.utils.common import lazy_exports
 from .main_model import MainModel
-from .main_view import MainView
-from .main_presenter import MainPresenter
+
+# The view and presenter (and the rest of the program) are imported on first use,
+# so startup arguments which exit early (e.g. --version) don't wait on them
+__getattr__ = lazy_exports(__name__, {"MainView": "main_view", "MainPresenter": "main_presenter"})
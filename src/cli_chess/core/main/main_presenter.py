@@ -1,10 +1,8 @@
 from __future__ import annotations
-from cli_chess.core.main.main_view import MainView
-from cli_chess.menus.main_menu import MainMenuModel, MainMenuPresenter
-from cli_chess.core.api.api_manager import required_token_scopes
-from cli_chess.modules.token_manager.token_manager_model import g_token_manager_model
-from cli_chess.utils import force_recreate_configs, print_program_config
+from cli_chess.utils import force_recreate_configs, print_program_config, ui_dispatcher, file_watcher
+from cli_chess.utils.config import config_documents
 from typing import TYPE_CHECKING
+import asyncio
 if TYPE_CHECKING:
     from cli_chess.core.main import MainModel
 
@@ -13,6 +11,11 @@ class MainPresenter:
     def __init__(self, model: MainModel):
         self.model = model
         self._handle_startup_args()
+
+        # The menus and view (and the rest of the program) are imported once the startup
+        # arguments have been handled, so arguments which exit early start quickly
+        from cli_chess.core.main.main_view import MainView
+        from cli_chess.menus.main_menu import MainMenuModel, MainMenuPresenter
         self.main_menu_presenter = MainMenuPresenter(MainMenuModel())
         self.view = MainView(self)
 
@@ -24,19 +27,53 @@ class MainPresenter:
             print_program_config()
             exit(0)
 
+        if args.command == "analyze":
+            from cli_chess.core.batch_analysis import run_batch_analysis
+            exit(run_batch_analysis(args.pgn, args.output, args.depth, args.time, args.workers, args.hash))
+
         if args.reset_config:
             force_recreate_configs()
             print("Configuration successfully reset")
             exit(0)
 
+        from cli_chess.modules.token_manager.token_manager_model import g_token_manager_model
         if args.base_url:
             g_token_manager_model.set_base_url(args.base_url)
 
         if args.token:
             if not g_token_manager_model.update_linked_account(args.token):
+                from cli_chess.core.api import required_token_scopes
                 print(f"Invalid API token or missing required scopes. Scopes required: {required_token_scopes}")
                 exit(1)
 
     def run(self):
         """Starts the main application"""
-        self.view.run()
+        asyncio.run(self._run_async())
+
+    async def _run_async(self):
+        """Runs the main application on an asyncio event loop which is shared with
+           the engines. Events from background threads are marshalled onto this loop.
+           Engines are shut down on the same loop once the app exits.
+        """
+        from cli_chess.modules.engine import engine_pool, eval_cache, opening_book, tablebase
+        ui_dispatcher.start(asyncio.get_running_loop())
+        self._watch_files()
+        try:
+            await self.view.run_async()
+        finally:
+            file_watcher.stop()
+            ui_dispatcher.stop()
+            await engine_pool.shutdown()
+            eval_cache.close()
+            opening_book.close()
+            tablebase.close()
+
+    def _watch_files(self) -> None:
+        """Starts watching the configuration files and custom style, so changes
+           made while cli-chess is running are applied without a restart
+        """
+        from cli_chess.utils.ui_common import get_custom_style_path
+        for document in config_documents.values():
+            file_watcher.watch(document.full_filename, document.refresh)
+        file_watcher.watch(get_custom_style_path(), self.view.refresh_style)
+        file_watcher.start()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from cli_chess.__metadata__ import __version__
-from cli_chess.utils.ui_common import handle_mouse_click, exit_app, get_custom_style
+from cli_chess.utils.ui_common import handle_mouse_click, exit_app, style_cache
 from cli_chess.utils import is_windows_os, default, log
 from cli_chess.utils.config import terminal_config
 from prompt_toolkit.application import Application
@@ -10,7 +10,7 @@ from prompt_toolkit.formatted_text import StyleAndTextTuples
 from prompt_toolkit.key_binding import KeyBindings, merge_key_bindings
 from prompt_toolkit.keys import Keys
 from prompt_toolkit.widgets import Box
-from prompt_toolkit.styles import Style, merge_styles
+from prompt_toolkit.styles import Style
 from prompt_toolkit import print_formatted_text, HTML
 try:
     from prompt_toolkit.output.win32 import NoConsoleScreenBufferError  # noqa
@@ -45,10 +45,10 @@ class MainView:
         except Exception as e:
             self._handle_startup_exceptions(e)
 
-    def run(self) -> None:
-        """Runs the main application"""
+    async def run_async(self) -> None:
+        """Runs the main application on the current event loop"""
         with patch_stdout():
-            self.app.run()
+            await self.app.run_async()
 
     def _create_main_container(self):
         """Creates the container for the main view"""
@@ -107,15 +107,22 @@ class MainView:
         @bindings.add(Keys.ControlR, eager=True, is_global=True)
         def _(event): # noqa
             log.info("Requested application style refresh")
-            self.app.style = self._get_combined_styles(hot_swap=True)
+            self.refresh_style()
         return bindings
 
-    def _get_combined_styles(self, hot_swap=False) -> "_MergedStyle":  # noqa: F821
-        """Combines the cli-chess default style with a user
-           supplied custom style and returns the result
+    def refresh_style(self) -> None:
+        """Reloads the custom style and repaints the application if the style changed"""
+        style = self._get_combined_styles(hot_swap=True)
+        if style is not self.app.style:
+            self.app.style = style
+            self.app.invalidate()
+
+    def _get_combined_styles(self, hot_swap=False) -> Style:
+        """Returns the cli-chess default style combined with the user supplied custom
+           style. The combined style is compiled once and cached until the custom style changes.
         """
         try:
-            return merge_styles([Style.from_dict(default), Style.from_dict(get_custom_style())])
+            return style_cache.get_style()
         except Exception as e:
             log.critical(f"Error parsing custom style: {e}")
             if not hot_swap:
@@ -0,0 +1 @@
+from .tournament import Tournament, TournamentPlayer, TournamentGame, PlayerStanding, parse_time_control, fit_ratings
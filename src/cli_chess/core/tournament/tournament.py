@@ -0,0 +1,320 @@
+from cli_chess.core.game.game_metadata import GameMetadata
+from cli_chess.core.game.game_options import GameOption
+from cli_chess.modules.board import BoardModel
+from cli_chess.modules.engine import EngineModel, EnginePool
+from cli_chess.utils import log
+from dataclasses import dataclass, field
+import chess.engine
+import chess.pgn
+import chess
+import asyncio
+import itertools
+import random
+import math
+from time import monotonic
+from typing import Dict, List, Optional, Tuple
+
+# Games reaching this many plies are adjudicated as draws
+MAX_GAME_PLIES = 400
+
+# Virtual draws added between each pair of players when fitting ratings so
+# that players who won (or lost) every game still have a finite rating
+RATING_PRIOR_DRAWS = 1
+
+
+@dataclass
+class TournamentPlayer:
+    """An engine player. Players either have a skill level (1-8) or a UCI Elo"""
+    name: str
+    skill_level: Optional[int] = None
+    elo: Optional[int] = None
+
+    @classmethod
+    def from_spec(cls, spec: str) -> "TournamentPlayer":
+        """Creates a player from a spec string (e.g. `level:3`, `elo:1500`, or `3`)"""
+        kind, _, value = spec.lower().rpartition(":")
+        try:
+            if kind in ("", "level"):
+                level = int(value)
+                if not 1 <= level <= 8:
+                    raise ValueError
+                return cls(name=f"Level {level}", skill_level=level)
+            elif kind == "elo":
+                return cls(name=f"Elo {int(value)}", elo=int(value))
+        except ValueError:
+            pass
+        raise ValueError(f"Invalid player: {spec} (expected level:1-8 or elo:<rating>)")
+
+    def get_game_parameters(self) -> dict:
+        """Returns the game parameters used to configure this players engine"""
+        if self.elo is not None:
+            return {GameOption.SPECIFY_ELO: True, GameOption.COMPUTER_ELO: self.elo}
+        return {GameOption.SPECIFY_ELO: False, GameOption.COMPUTER_SKILL_LEVEL: self.skill_level}
+
+
+@dataclass
+class TournamentGame:
+    """A finished tournament game"""
+    round: int
+    white: TournamentPlayer
+    black: TournamentPlayer
+    result: str
+    termination: str
+    pgn: chess.pgn.Game
+    moves: int = 0
+    engine_start_time: float = 0.0
+    move_times: Dict[chess.Color, List[float]] = field(default_factory=lambda: {chess.WHITE: [], chess.BLACK: []})
+
+
+@dataclass
+class PlayerStanding:
+    player: TournamentPlayer
+    games: int = 0
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    rating: float = 0.0
+
+    @property
+    def score(self) -> float:
+        return self.wins + self.draws / 2
+
+    @property
+    def score_percent(self) -> float:
+        return 100 * self.score / self.games if self.games else 0.0
+
+
+def parse_time_control(time_control: Optional[str]) -> Optional[Tuple[int, int]]:
+    """Parses a time control string (e.g. `3+2` for 3 minutes plus a 2 second increment).
+       Returns None for untimed games (an empty string or `none`).
+    """
+    if not time_control or time_control.lower() == "none":
+        return None
+    try:
+        minutes, _, increment = time_control.partition("+")
+        return int(minutes), int(increment) if increment else 0
+    except ValueError:
+        raise ValueError(f"Invalid time control: {time_control} (expected <minutes>+<increment>)")
+
+
+def fit_ratings(players: List[TournamentPlayer], games: List[TournamentGame], anchor: Optional[TournamentPlayer] = None,
+                anchor_rating: float = 0, iterations: int = 1000) -> Dict[str, float]:
+    """Returns the maximum likelihood Elo rating of each player (Bradley-Terry model with
+       draws counted as half a win). Ratings are relative, so they are shifted so that
+       the anchor player (the first player by default) has the anchor rating.
+    """
+    names = [player.name for player in players]
+    scores = {name: 0.0 for name in names}
+    pair_games: Dict[Tuple[str, str], float] = {}
+    for game in games:
+        white, black = game.white.name, game.black.name
+        scores[white] += {"1-0": 1, "0-1": 0}.get(game.result, 0.5)
+        scores[black] += {"1-0": 0, "0-1": 1}.get(game.result, 0.5)
+        for pair in ((white, black), (black, white)):
+            pair_games[pair] = pair_games.get(pair, 0) + 1
+
+    for white, black in list(pair_games):
+        pair_games[(white, black)] += RATING_PRIOR_DRAWS
+        scores[white] += RATING_PRIOR_DRAWS / 2
+
+    strengths = {name: 1.0 for name in names}
+    for _ in range(iterations):
+        updated = {}
+        for name in names:
+            denominator = sum(count / (strengths[name] + strengths[opponent])
+                              for (player, opponent), count in pair_games.items() if player == name)
+            updated[name] = scores[name] / denominator if denominator else strengths[name]
+        converged = all(abs(updated[name] - strengths[name]) < 1e-9 * strengths[name] for name in names)
+        strengths = updated
+        if converged:
+            break
+
+    anchor_name = anchor.name if anchor else names[0]
+    offset = anchor_rating - 400 * math.log10(strengths[anchor_name])
+    return {name: 400 * math.log10(strengths[name]) + offset for name in names}
+
+
+class Tournament:
+    """A round robin tournament between engine players, used to calibrate the skill
+       level mapping. Games are played headlessly through the same board and engine
+       models as offline games (as calibration engines, so only the engines own search
+       is measured). Engines are checked out from the tournaments own engine pool,
+       which is shut down once the tournament finishes, and `concurrency` games are
+       played at once with each engine in its own process.
+       Each opening is played twice with the colors reversed.
+    """
+    def __init__(self, players: List[TournamentPlayer], games_per_pair: int = 2, variant: str = "standard",
+                 time_control: Optional[Tuple[int, int]] = None, concurrency: int = 1, opening_plies: int = 0,
+                 pgn_path: Optional[str] = None, seed: Optional[int] = None):
+        if len(players) < 2:
+            raise ValueError("A tournament requires at least two players")
+        if len({player.name for player in players}) != len(players):
+            raise ValueError("Tournament players must be unique")
+
+        self.players = players
+        self.games_per_pair = max(games_per_pair, 1)
+        self.variant = variant
+        self.time_control = time_control
+        self.concurrency = max(concurrency, 1)
+        self.opening_plies = opening_plies
+        self.pgn_path = pgn_path
+        self.rng = random.Random(seed)
+        self.games: List[TournamentGame] = []
+        self.errors = 0
+        # Both players engines of each concurrent game are kept warm between games
+        self.engine_pool = EnginePool(max_idle=self.concurrency * 2)
+
+    def get_schedule(self) -> List[Tuple[int, TournamentPlayer, TournamentPlayer, List[str]]]:
+        """Returns the games to play as (round, white, black, opening moves). Each opening
+           is shared by a pair of games with the colors reversed.
+        """
+        schedule = []
+        for first, second in itertools.combinations(self.players, 2):
+            opening = []
+            for game in range(self.games_per_pair):
+                if game % 2 == 0:
+                    opening = self._get_random_opening()
+                white, black = (first, second) if game % 2 == 0 else (second, first)
+                schedule.append((len(schedule) + 1, white, black, opening))
+        return schedule
+
+    async def run(self) -> List[TournamentGame]:
+        """Plays all scheduled games and returns the finished games. Games
+           which fail (e.g. an engine fails to start) are logged and counted.
+        """
+        schedule = self.get_schedule()
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def play(round_number: int, white: TournamentPlayer, black: TournamentPlayer, opening: List[str]) -> None:
+            async with semaphore:
+                try:
+                    game = await self.play_game(round_number, white, black, opening)
+                except Exception as e:
+                    self.errors += 1
+                    log.error(f"Error playing tournament game {round_number} ({white.name} vs {black.name}): {e}")
+                    return
+
+                self.games.append(game)
+                if self.pgn_path:
+                    with open(self.pgn_path, "a") as pgn:
+                        print(game.pgn, file=pgn, end="\n\n")
+                log.debug(f"Tournament game {round_number}: {white.name} vs {black.name} {game.result} ({game.termination})")
+
+        try:
+            await asyncio.gather(*[play(*game) for game in schedule])
+        finally:
+            await self.engine_pool.shutdown()
+        return self.games
+
+    async def play_game(self, round_number: int, white: TournamentPlayer, black: TournamentPlayer,
+                        opening: Optional[List[str]] = None) -> TournamentGame:
+        """Plays a single game between the passed in players from the passed in opening moves"""
+        board_model = BoardModel(variant=self.variant)
+        for move in opening or []:
+            board_model.make_move(move, notify=False)
+
+        game_metadata = GameMetadata()
+        if self.time_control:
+            for color in chess.COLORS:
+                game_metadata.clocks[color].time = self.time_control[0] * 60 * 1000
+                game_metadata.clocks[color].increment = self.time_control[1] * 1000
+
+        engines = {chess.WHITE: EngineModel(board_model, white.get_game_parameters(), game_metadata, calibration=True, pool=self.engine_pool),
+                   chess.BLACK: EngineModel(board_model, black.get_game_parameters(), game_metadata, calibration=True, pool=self.engine_pool)}
+        move_times: Dict[chess.Color, List[float]] = {chess.WHITE: [], chess.BLACK: []}
+        try:
+            start_time = monotonic()
+            await asyncio.gather(*[engine.start_engine() for engine in engines.values()])
+            engine_start_time = monotonic() - start_time
+
+            while not board_model.is_game_over() and board_model.board.ply() < MAX_GAME_PLIES:
+                turn = board_model.get_turn()
+                move_start = monotonic()
+                result = await engines[turn].get_best_move()
+                move_times[turn].append(monotonic() - move_start)
+
+                clock = game_metadata.clocks[turn]
+                if clock.time is not None:
+                    clock.time -= int(move_times[turn][-1] * 1000)
+                    if clock.time <= 0:
+                        clock.time = 0
+                        board_model.handle_timeout(turn)
+                        break
+                    clock.time += clock.increment
+
+                if result.move is None:
+                    raise Warning(f"Engine returned no move in {board_model.board.fen()}")
+                board_model.make_move(result.move.uci())
+        finally:
+            for engine in engines.values():
+                await engine.quit_engine()
+
+        outcome = board_model.get_game_over_result()
+        result = outcome.result() if outcome else "1/2-1/2"
+        termination = (outcome.termination.name.lower() if isinstance(outcome.termination, chess.Termination)
+                       else str(outcome.termination)) if outcome else "adjudication"
+        return TournamentGame(round=round_number, white=white, black=black, result=result, termination=termination,
+                              pgn=self._create_pgn(board_model.board, round_number, white, black, result, termination, engines),
+                              moves=sum(len(times) for times in move_times.values()), engine_start_time=engine_start_time, move_times=move_times)
+
+    def get_standings(self) -> List[PlayerStanding]:
+        """Returns the standings ordered by rating. Ratings are anchored to the first Elo
+           player's UCI Elo if there is one, otherwise they are relative to the first player.
+        """
+        standings = {player.name: PlayerStanding(player) for player in self.players}
+        for game in self.games:
+            for player, won, lost in ((game.white, "1-0", "0-1"), (game.black, "0-1", "1-0")):
+                standing = standings[player.name]
+                standing.games += 1
+                if game.result == won:
+                    standing.wins += 1
+                elif game.result == lost:
+                    standing.losses += 1
+                else:
+                    standing.draws += 1
+
+        anchor = next((player for player in self.players if player.elo is not None), None)
+        ratings = fit_ratings(self.players, self.games, anchor, anchor.elo if anchor else 0)
+        for name, rating in ratings.items():
+            standings[name].rating = rating
+        return sorted(standings.values(), key=lambda standing: standing.rating, reverse=True)
+
+    def get_standings_table(self) -> str:
+        """Returns the standings formatted as a table"""
+        rows = [f"{'Player':<12}{'Games':>7}{'+':>5}{'=':>5}{'-':>5}{'Score':>8}{'%':>7}{'Elo':>8}"]
+        for standing in self.get_standings():
+            rows.append(f"{standing.player.name:<12}{standing.games:>7}{standing.wins:>5}{standing.draws:>5}{standing.losses:>5}"
+                        f"{standing.score:>8.1f}{standing.score_percent:>7.1f}{standing.rating:>8.0f}")
+        return "\n".join(rows)
+
+    def _get_random_opening(self) -> List[str]:
+        """Returns `opening_plies` random moves (in UCI) from the starting position"""
+        board = BoardModel(variant=self.variant).board
+        opening = []
+        for _ in range(self.opening_plies):
+            moves = list(board.legal_moves)
+            if not moves or board.is_game_over():
+                break
+            move = self.rng.choice(moves)
+            opening.append(move.uci())
+            board.push(move)
+        return opening
+
+    def _create_pgn(self, board: chess.Board, round_number: int, white: TournamentPlayer, black: TournamentPlayer,
+                    result: str, termination: str, engines: Dict[chess.Color, EngineModel]) -> chess.pgn.Game:
+        """Returns the PGN of a finished game. Engine moves are commented with their search telemetry"""
+        game = chess.pgn.Game.from_board(board)
+        for node in game.mainline():
+            telemetry = engines[not node.turn()].telemetry.get_telemetry_for_ply(node.ply())
+            if telemetry:
+                node.comment = telemetry.to_pgn_comment()
+        game.headers["Event"] = "cli-chess engine tournament"
+        game.headers["Round"] = str(round_number)
+        game.headers["White"] = white.name
+        game.headers["Black"] = black.name
+        game.headers["Result"] = result
+        game.headers["Termination"] = termination
+        game.headers["TimeControl"] = f"{self.time_control[0] * 60}+{self.time_control[1]}" if self.time_control else "-"
+        if board.uci_variant != "chess":
+            game.headers["Variant"] = board.uci_variant
+        return game
@@ -1,10 +1,12 @@
 from __future__ import annotations
 from cli_chess.menus import MenuPresenter
-from cli_chess.menus.main_menu import MainMenuView
+from cli_chess.menus.main_menu import MainMenuView, MainMenuOptions
 from cli_chess.menus.online_games_menu import OnlineGamesMenuModel, OnlineGamesMenuPresenter
 from cli_chess.menus.offline_games_menu import OfflineGamesMenuModel, OfflineGamesMenuPresenter
 from cli_chess.menus.settings_menu import SettingsMenuModel, SettingsMenuPresenter
 from cli_chess.modules.about import AboutPresenter
+from cli_chess.modules.engine import EngineModel, engine_pool, engine_binary_selector
+from prompt_toolkit.application import get_app
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from cli_chess.menus.main_menu import MainMenuModel
@@ -22,3 +24,19 @@ class MainMenuPresenter(MenuPresenter):
         self.selection = self.model.get_menu_options()[0].option
 
         super().__init__(self.model, self.view)
+
+    def select_handler(self, selected_option: int):
+        """Overrides the base select handler to prewarm an engine
+           when the offline games menu is selected
+        """
+        super().select_handler(selected_option)
+        if self.selection == MainMenuOptions.OFFLINE_GAMES:
+            get_app().create_background_task(self._prepare_engine())
+
+    @staticmethod
+    async def _prepare_engine() -> None:
+        """Benchmarks any new or changed engine binaries (so the fastest
+           working binary is selected) and then prewarms an engine
+        """
+        await engine_binary_selector.bench()
+        await engine_pool.prewarm(EngineModel.get_engine_path())
@@ -1,5 +1,5 @@
 from cli_chess.menus import MultiValueMenuModel, MultiValueMenuOption, MenuCategory
-from cli_chess.utils.config import game_config, terminal_config
+from cli_chess.utils.config import game_config, terminal_config, engine_config
 from cli_chess.utils.common import VALID_COLOR_DEPTHS, COLOR_DEPTH_MAP
 from cli_chess.utils.logging import log
 
@@ -19,6 +19,7 @@ class ProgramSettingsMenuModel(MultiValueMenuModel):
             MultiValueMenuOption(game_config.Keys.SHOW_MOVE_LIST_IN_UNICODE, "", self._get_available_game_config_options(game_config.Keys.SHOW_MOVE_LIST_IN_UNICODE), display_name="Show move list in unicode"),  # noqa: E501
             MultiValueMenuOption(game_config.Keys.SHOW_MATERIAL_DIFF_IN_UNICODE, "", self._get_available_game_config_options(game_config.Keys.SHOW_MATERIAL_DIFF_IN_UNICODE), display_name="Unicode material difference"),  # noqa: E501
             MultiValueMenuOption(game_config.Keys.PAD_UNICODE, "", self._get_available_game_config_options(game_config.Keys.PAD_UNICODE), display_name="Pad unicode (fix overlap)"),  # noqa: E501
+            MultiValueMenuOption(engine_config.Keys.PONDER, "", self._get_available_engine_config_options(engine_config.Keys.PONDER), display_name="Engine pondering"),  # noqa: E501
             MultiValueMenuOption(terminal_config.Keys.TERMINAL_COLOR_DEPTH, "", self._get_available_color_depth_options(), display_name="Terminal color depth"),  # noqa: E501
         ]
         return MenuCategory("Program Settings", menu_options)
@@ -28,6 +29,11 @@ class ProgramSettingsMenuModel(MultiValueMenuModel):
         """Returns a list of available game configuration options for the passed in key"""
         return ["Yes", "No"] if game_config.get_boolean(key) else ["No", "Yes"]
 
+    @staticmethod
+    def _get_available_engine_config_options(key: engine_config.Keys) -> list:
+        """Returns a list of available engine configuration options for the passed in key"""
+        return ["Yes", "No"] if engine_config.get_boolean(key) else ["No", "Yes"]
+
     @staticmethod
     def _get_available_color_depth_options() -> list:
         """Returns a list of friendly named color depth options.
@@ -45,6 +51,11 @@ class ProgramSettingsMenuModel(MultiValueMenuModel):
         """Saves the selected option in the game configuration"""
         game_config.set_value(key, str(enabled))
 
+    @staticmethod
+    def save_selected_engine_config_setting(key: engine_config.Keys, enabled: bool):
+        """Saves the selected option in the engine configuration"""
+        engine_config.set_value(key, str(enabled))
+
     @staticmethod
     def save_terminal_color_depth_setting(depth: str):
         """Saves the selected option in the terminal configuration"""
@@ -1,7 +1,7 @@
 from __future__ import annotations
 from cli_chess.menus.program_settings_menu import ProgramSettingsMenuView
 from cli_chess.menus import MultiValueMenuPresenter
-from cli_chess.utils.config import TerminalConfig
+from cli_chess.utils.config import TerminalConfig, EngineConfig
 from cli_chess.utils.common import COLOR_DEPTH_MAP
 from cli_chess.utils.ui_common import set_color_depth
 from typing import TYPE_CHECKING
@@ -26,5 +26,7 @@ class ProgramSettingsMenuPresenter(MultiValueMenuPresenter):
             color_depth = list(COLOR_DEPTH_MAP.keys())[list(COLOR_DEPTH_MAP.values()).index(selected_value)]
             self.model.save_terminal_color_depth_setting(color_depth)
             set_color_depth(color_depth)
+        elif isinstance(selected_option, EngineConfig.Keys):
+            self.model.save_selected_engine_config_setting(selected_option, selected_value == "Yes")
         else:
             self.model.save_selected_game_config_setting(selected_option, selected_value == "Yes")
@@ -18,6 +18,7 @@ class OfflineVsComputerMenuModel(VersusMenuModel):
         """Create the offline menu options"""
         menu_options = [
             MultiValueMenuOption(GameOption.VARIANT, "Choose the variant to play", [option for option in OfflineGameOptions.variant_options_dict]),  # noqa: E501
+            MultiValueMenuOption(GameOption.TIME_CONTROL, "Choose the time control", [option for option in OfflineGameOptions.time_control_options_dict]),  # noqa: E501
             MultiValueMenuOption(GameOption.SPECIFY_ELO, "Would you like the computer to play as a specific Elo?", ["No", "Yes"]),
             MultiValueMenuOption(GameOption.COMPUTER_SKILL_LEVEL, "Choose the skill level of the computer", [option for option in OfflineGameOptions.skill_level_options_dict]),  # noqa: E501
             MultiValueMenuOption(GameOption.COMPUTER_ELO, "Choose the Elo of the computer", list(range(500, 2850, 25)), visible=False),
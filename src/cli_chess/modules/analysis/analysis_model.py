@@ -0,0 +1,177 @@
+from cli_chess.modules.board import BoardModel, BOARD_POSITION_TOPICS
+from cli_chess.modules.engine import EngineModel, engine_pool, eval_cache, tablebase, get_engine_resources
+from cli_chess.utils import EventManager, log
+from cli_chess.utils.config import engine_config
+import chess.engine
+import chess
+import asyncio
+from time import monotonic
+from typing import Optional, List
+
+
+class AnalysisModel:
+    """Streams a MultiPV analysis of the current board position. Engine info lines
+       arrive far faster than the terminal can usefully redraw, so they are coalesced
+       per PV and listeners are only notified at the configured update rate. The top
+       line is seeded from, and written back to, the evaluation cache. Positions
+       covered by the tablebases are looked up instead of being analysed.
+    """
+    def __init__(self, board_model: BoardModel):
+        self.board_model = board_model
+        self.board_model.e_board_model_updated.add_listener(self.update, topics=BOARD_POSITION_TOPICS)
+        self.engine: Optional[chess.engine.UciProtocol] = None
+        self.engine_path: Optional[str] = None
+        self.game_id = engine_pool.new_game_id()
+        self.enabled = False
+
+        self.multipv = self._get_config_int(engine_config.Keys.ANALYSIS_LINES, minimum=1)
+        self.update_interval = 1 / self._get_config_int(engine_config.Keys.ANALYSIS_UPDATES_PER_SECOND, minimum=1)
+        self.analysis_board = self.board_model.board.copy()
+        self.analysis_data: List[chess.engine.InfoDict] = []
+
+        self._analysis_task: Optional[asyncio.Task] = None
+        self._last_notify = 0.0
+        self._pending_notify: Optional[asyncio.TimerHandle] = None
+
+        self._event_manager = EventManager()
+        self.e_analysis_model_updated = self._event_manager.create_event()
+
+    def update(self, *args, **kwargs) -> None:  # noqa
+        """Called automatically on board model updates. Restarts the analysis
+           if the position has changed. The engine process (and its hash)
+           is kept, so restarting only costs a `stop` and a new `go`.
+        """
+        if self.enabled and self._position_changed():
+            self._restart_analysis()
+
+    async def start_analysis(self) -> None:
+        """Checks out an engine from the engine pool and starts analysing
+           the current position. Raises a Warning if the engine fails to start.
+        """
+        if self.enabled:
+            return
+        try:
+            self.enabled = True
+            engine_cfg = {'Skill Level': 20, 'UCI_LimitStrength': False, **get_engine_resources(True, engine_pool.get_active_count() + 1)}
+            self.engine_path = EngineModel.get_engine_path()
+            self.engine = await engine_pool.checkout(self.engine_path, engine_cfg)
+            if self.enabled:
+                self._restart_analysis()
+            else:
+                # The analysis was stopped while the engine was starting
+                await self._release_engine()
+        except Exception as e:
+            self.enabled = False
+            msg = f"Error starting analysis: {e}"
+            log.error(msg)
+            raise Warning(msg)
+
+    async def stop_analysis(self) -> None:
+        """Stops the analysis and releases the engine back to the engine pool"""
+        self.enabled = False
+        self._cancel_analysis()
+        self.analysis_data = []
+        self._notify_analysis_model_updated()
+        await self._release_engine()
+
+    def get_analysis_data(self) -> List[chess.engine.InfoDict]:
+        """Returns the latest info for each PV, ordered by rank"""
+        return self.analysis_data
+
+    def _position_changed(self) -> bool:
+        """Returns True if the board position differs from the analysed position"""
+        board = self.board_model.board
+        return len(board.move_stack) != len(self.analysis_board.move_stack) or board.fen() != self.analysis_board.fen()
+
+    def _restart_analysis(self) -> None:
+        """Stops any running analysis and starts analysing the current position"""
+        self._cancel_analysis()
+        self.analysis_board = self.board_model.board.copy()
+        self.analysis_data = []
+
+        # Positions covered by the tablebases are looked up rather than analysed
+        tablebase_info = tablebase.get_info(self.analysis_board)
+        if tablebase_info:
+            self.analysis_data.append(tablebase_info)
+            self._notify_analysis_model_updated()
+            return
+
+        cached = eval_cache.get(self.analysis_board)
+        if cached:
+            self.analysis_data.append({'multipv': 1, 'score': cached.score, 'depth': cached.depth, 'pv': cached.pv})
+        self._notify_analysis_model_updated()
+
+        if self.engine and not self.analysis_board.is_game_over():
+            self._analysis_task = asyncio.ensure_future(self._run_analysis(self.analysis_board))
+
+    def _cancel_analysis(self) -> None:
+        """Cancels the running analysis. The engine is sent `stop` as the analysis closes.
+           The top line of the analysis is saved to the evaluation cache.
+        """
+        if self.analysis_data and self.analysis_data[0].get("depth"):
+            eval_cache.put(self.analysis_board, self.analysis_data[0])
+
+        if self._analysis_task:
+            self._analysis_task.cancel()
+            self._analysis_task = None
+        if self._pending_notify:
+            self._pending_notify.cancel()
+            self._pending_notify = None
+
+    async def _run_analysis(self, board: chess.Board) -> None:
+        """Runs an infinite MultiPV analysis on the passed in board, coalescing info lines per PV"""
+        try:
+            with await self.engine.analysis(board, multipv=self.multipv, game=self.game_id) as analysis:
+                async for info in analysis:
+                    if "pv" not in info or "score" not in info:
+                        continue
+
+                    index = info.get("multipv", 1) - 1
+                    if index >= len(self.analysis_data):
+                        self.analysis_data.extend([{}] * (index + 1 - len(self.analysis_data)))
+                    self.analysis_data[index] = info
+                    self._throttled_notify()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error(f"Error during analysis: {e}")
+
+    def _throttled_notify(self) -> None:
+        """Notifies listeners at most once per update interval. If an update is throttled,
+           a trailing notification is scheduled so the latest info is always shown.
+        """
+        if self._pending_notify:
+            return
+
+        delay = self._last_notify + self.update_interval - monotonic()
+        if delay <= 0:
+            self._notify_analysis_model_updated()
+        else:
+            self._pending_notify = asyncio.get_running_loop().call_later(delay, self._notify_analysis_model_updated)
+
+    async def _release_engine(self) -> None:
+        """Returns the engine to the engine pool"""
+        if self.engine:
+            engine, self.engine = self.engine, None
+            await engine_pool.checkin(self.engine_path, engine)
+
+    @staticmethod
+    def _get_config_int(key: engine_config.Keys, minimum: int) -> int:
+        """Returns the integer value of the passed in engine config key"""
+        try:
+            return max(int(engine_config.get_value(key)), minimum)
+        except (TypeError, ValueError):
+            log.error(f"Invalid engine configuration value for {key.value}, using the default")
+            return key.default_value
+
+    def _notify_analysis_model_updated(self) -> None:
+        """Notifies listeners of analysis model updates"""
+        self._pending_notify = None
+        self._last_notify = monotonic()
+        self.e_analysis_model_updated.notify()
+
+    def cleanup(self) -> None:
+        """Handles model cleanup tasks. This should only ever
+           be run when this model is no longer needed.
+        """
+        self._event_manager.purge_all_events()
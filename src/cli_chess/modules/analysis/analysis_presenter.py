@@ -0,0 +1,68 @@
+from __future__ import annotations
+from cli_chess.modules.analysis import AnalysisView
+import chess.engine
+import chess
+from typing import TYPE_CHECKING, List
+if TYPE_CHECKING:
+    from cli_chess.modules.analysis import AnalysisModel
+
+PV_DISPLAY_LENGTH = 8
+
+
+class AnalysisPresenter:
+    def __init__(self, model: AnalysisModel):
+        self.model = model
+        self.view = AnalysisView(self)
+
+        self.model.e_analysis_model_updated.add_listener(self.update)
+
+    def update(self) -> None:
+        """Updates the analysis output"""
+        self.view.update(self.get_formatted_analysis())
+
+    async def start_analysis(self) -> None:
+        """Notifies the model to start the analysis"""
+        await self.model.start_analysis()
+
+    async def stop_analysis(self) -> None:
+        """Notifies the model to stop the analysis"""
+        await self.model.stop_analysis()
+
+    def is_enabled(self) -> bool:
+        """Returns True if the analysis is enabled"""
+        return self.model.enabled
+
+    def get_formatted_analysis(self) -> List[str]:
+        """Returns a list containing a formatted line for each PV"""
+        board = self.model.analysis_board
+        output = []
+        for info in self.model.get_analysis_data():
+            if not info:
+                continue
+            if info.get("tbhits") and info.get("depth") == 0:
+                score = self.format_tablebase_result(info["score"])
+                depth = "TB"
+            else:
+                score = self.format_score(info["score"])
+                depth = f"d{info.get('depth', '?')}"
+            try:
+                pv = board.variation_san(info["pv"][:PV_DISPLAY_LENGTH])
+            except ValueError:
+                pv = " ".join(move.uci() for move in info["pv"][:PV_DISPLAY_LENGTH])
+            output.append(f"{score:>6} {depth:>4}  {pv}")
+        return output
+
+    @staticmethod
+    def format_score(score: chess.engine.PovScore) -> str:
+        """Returns the score from white's point of view as a string (e.g. +0.35, #-3)"""
+        white_score = score.white()
+        mate = white_score.mate()
+        if mate is not None:
+            return f"#{mate}"
+        return f"{white_score.score() / 100:+.2f}"
+
+    @staticmethod
+    def format_tablebase_result(score: chess.engine.PovScore) -> str:
+        """Returns the tablebase result as a game result string (e.g. 1-0)"""
+        white_score = score.white().score()
+        return "1-0" if white_score > 0 else "0-1" if white_score < 0 else "½-½"
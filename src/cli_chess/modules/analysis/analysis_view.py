@@ -0,0 +1,36 @@
+from __future__ import annotations
+from prompt_toolkit.layout import Container, ConditionalContainer, Window, FormattedTextControl, D
+from prompt_toolkit.application import get_app
+from prompt_toolkit.filters import Condition
+from prompt_toolkit.widgets import Box
+from typing import TYPE_CHECKING, List
+if TYPE_CHECKING:
+    from cli_chess.modules.analysis import AnalysisPresenter
+
+
+class AnalysisView:
+    def __init__(self, presenter: AnalysisPresenter):
+        self.presenter = presenter
+        self.lines: List[str] = []
+        self._analysis_control = FormattedTextControl(text=self._get_text, style="class:analysis")
+        self._container = self._create_container()
+
+    def _create_container(self) -> Container:
+        """Creates the analysis container. The container is hidden when the analysis is off"""
+        return ConditionalContainer(
+            Box(Window(self._analysis_control, wrap_lines=False, height=D(max=self.presenter.model.multipv)), padding=0, padding_top=1),
+            Condition(self.presenter.is_enabled)
+        )
+
+    def _get_text(self) -> str:
+        """Returns the text to display"""
+        return "\n".join(self.lines) if self.lines else "Analyzing..."
+
+    def update(self, lines: List[str]) -> None:
+        """Updates the analysis output with the passed in lines and repaints"""
+        self.lines = lines
+        get_app().invalidate()
+
+    def __pt_container__(self) -> Container:
+        """Returns this views container"""
+        return self._container
@@ -1,3 +1,3 @@
-from .board_model import BoardModel
+from .board_model import BoardModel, BOARD_POSITION_TOPICS
 from .board_view import BoardView
 from .board_presenter import BoardPresenter
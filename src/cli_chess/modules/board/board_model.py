@@ -5,6 +5,9 @@ import chess.variant
 from random import randint
 from typing import List, Optional
 
+# The board model update topics which change the board position
+BOARD_POSITION_TOPICS = (EventTopics.GAME_START, EventTopics.MOVE_MADE, EventTopics.BOARD_POSITION_CHANGED)
+
 
 class BoardModel:
     def __init__(self, orientation: chess.Color = chess.WHITE, variant="standard", fen="", side_confirmed=True) -> None:
@@ -211,7 +214,7 @@ class BoardModel:
             self.initial_fen = fen
 
             if notify:
-                self._notify_board_model_updated()
+                self._notify_board_model_updated(EventTopics.BOARD_POSITION_CHANGED)
         except Exception as e:
             log.error(f"Error setting FEN: {e}")
             raise e
@@ -301,7 +304,7 @@ class BoardModel:
             if fen:
                 self.set_fen(fen, notify=False)
                 self.highlight_move = chess.Move.from_uci(uci_last_move) if uci_last_move else chess.Move.null()
-                self._notify_board_model_updated()
+                self._notify_board_model_updated(EventTopics.BOARD_POSITION_CHANGED)
         except Exception as e:
             log.error(f"Error caught setting board position: {e}")
 
@@ -327,6 +330,13 @@ class BoardModel:
         self._game_over_result = chess.Outcome("resignation", not color_resigning)  # noqa
         self._notify_board_model_updated(EventTopics.GAME_END)
 
+    def handle_timeout(self, color_flagged: chess.Color) -> None:
+        """Handle marking the game as ended by the passed in color running
+           out of time. Sends out a notification to listeners that the game is over.
+        """
+        self._game_over_result = chess.Outcome("outoftime", not color_flagged)  # noqa
+        self._notify_board_model_updated(EventTopics.GAME_END)
+
     def set_premove_highlight(self, move: chess.Move) -> None:
         """Sets the move that should be highlighted on the board.
            indicating a premove. The board model itself does not
@@ -337,12 +347,12 @@ class BoardModel:
         """
         if bool(move):
             self.premove_highlight = move
-            self._notify_board_model_updated()
+            self._notify_board_model_updated(EventTopics.PREMOVE_CHANGED)
 
     def clear_premove_highlight(self):
         """Clears the set premove highlight"""
         self.premove_highlight = chess.Move.null()
-        self._notify_board_model_updated()
+        self._notify_board_model_updated(EventTopics.PREMOVE_CHANGED)
 
     def cleanup(self) -> None:
         """Handles model cleanup tasks. This should only ever
@@ -10,13 +10,17 @@ if TYPE_CHECKING:
 
 
 class BoardPresenter:
+    # The game configuration keys which affect the board display
+    config_keys = (game_config.Keys.SHOW_BOARD_COORDINATES, game_config.Keys.SHOW_BOARD_HIGHLIGHTS,
+                   game_config.Keys.BLINDFOLD_CHESS, game_config.Keys.USE_UNICODE_PIECES)
+
     def __init__(self, model: BoardModel) -> None:
         self.model = model
-        self.game_config_values = game_config.get_all_values()
+        self.game_config_values = game_config.snapshot
         self.view = BoardView(self, self.get_board_display())
 
         self.model.e_board_model_updated.add_listener(self.update)
-        game_config.e_game_config_updated.add_listener(self._update_cached_config_values)
+        game_config.e_game_config_updated.add_listener(self._update_cached_config_values, topics=self.config_keys, weak=True)
 
     def update(self, *args, **kwargs) -> None: # noqa
         """Updates the board output"""
@@ -24,13 +28,13 @@ class BoardPresenter:
         #       This would allow for this update function to be removed
         self.view.update(self.get_board_display())
 
-    def _update_cached_config_values(self):
+    def _update_cached_config_values(self, *args) -> None: # noqa
         """Updates the 'game_config_values' variable with the
            latest configuration values from the game_config. Additionally,
            this will notify the board_view to update as there has been a change.
            This function is called automatically on game config updates
         """
-        self.game_config_values = game_config.get_all_values()
+        self.game_config_values = game_config.snapshot
         self.update()
 
     def make_move(self, move: str) -> None:
@@ -70,7 +74,7 @@ class BoardPresenter:
            is disabled in the configuration.
         """
         file_labels = ""
-        show_board_coordinates = self.game_config_values[game_config.Keys.SHOW_BOARD_COORDINATES] and self.model.is_side_confirmed()
+        show_board_coordinates = self.game_config_values.show_board_coordinates and self.model.is_side_confirmed()
 
         if show_board_coordinates:
             file_labels = self.model.get_file_labels()
@@ -83,7 +87,7 @@ class BoardPresenter:
         """
         rank_label = ""
         rank_index = self.model.get_square_rank_index(square)
-        show_board_coordinates = self.game_config_values[game_config.Keys.SHOW_BOARD_COORDINATES] and self.model.is_side_confirmed()
+        show_board_coordinates = self.game_config_values.show_board_coordinates and self.model.is_side_confirmed()
 
         if self.is_square_start_of_rank(square) and show_board_coordinates:
             rank_label = self.model.get_rank_label(rank_index)
@@ -121,8 +125,8 @@ class BoardPresenter:
         piece = self.model.board.piece_at(square)
         piece_str = ""
 
-        blindfold_chess = self.game_config_values[game_config.Keys.BLINDFOLD_CHESS]
-        use_unicode_pieces = self.game_config_values[game_config.Keys.USE_UNICODE_PIECES]
+        blindfold_chess = self.game_config_values.blindfold_chess
+        use_unicode_pieces = self.game_config_values.use_unicode_pieces
 
         if piece and not blindfold_chess:
             piece_str = get_piece_unicode_symbol(piece.symbol()) if use_unicode_pieces else piece.symbol().upper()
@@ -154,7 +158,7 @@ class BoardPresenter:
         else:
             square_color = "dark-square"
 
-        show_board_highlights = self.game_config_values[game_config.Keys.SHOW_BOARD_HIGHLIGHTS]
+        show_board_highlights = self.game_config_values.show_board_highlights
         if show_board_highlights:
             # TODO: Lighten last move square color if on light square
             try:
@@ -17,15 +17,14 @@ class ClockPresenter:
         self.view_upper = ClockView(self, self.get_clock_display(not orientation))
         self.view_lower = ClockView(self, self.get_clock_display(orientation))
 
-        self.model.e_game_model_updated.add_listener(self.update)
-
-    def update(self, *args, **kwargs) -> None:
-        """Updates the view based on specific model updates"""
-        if (EventTopics.GAME_START in args or EventTopics.GAME_END in args or
-                EventTopics.MOVE_MADE in args or EventTopics.BOARD_ORIENTATION_CHANGED in args):
-            orientation = self.model.board_model.get_board_orientation()
-            self.view_upper.update(self.get_clock_display(not orientation), self.model.game_metadata.clocks[not orientation].ticking)
-            self.view_lower.update(self.get_clock_display(orientation), self.model.game_metadata.clocks[orientation].ticking)
+        self.model.e_game_model_updated.add_listener(self.update, topics=[EventTopics.GAME_START, EventTopics.GAME_END, EventTopics.MOVE_MADE,
+                                                                          EventTopics.BOARD_ORIENTATION_CHANGED])
+
+    def update(self, *args, **kwargs) -> None:  # noqa
+        """Updates the view on the subscribed model updates"""
+        orientation = self.model.board_model.get_board_orientation()
+        self.view_upper.update(self.get_clock_display(not orientation), self.model.game_metadata.clocks[not orientation].ticking)
+        self.view_lower.update(self.get_clock_display(orientation), self.model.game_metadata.clocks[orientation].ticking)
 
     def get_clock_display(self, color: Color) -> str:
         """Returns the formatted clock display for the color passed in"""
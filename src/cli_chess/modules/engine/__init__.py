@@ -1,2 +1,10 @@
+from .engine_telemetry import EngineTelemetry, SearchTelemetry, TelemetryUciProtocol, popen_engine
+from .engine_binaries import EngineBinarySelector, engine_binary_selector, get_cpu_flags
+from .engine_resources import get_engine_resources, split_engine_resources, get_available_cpus
+from .engine_pool import EnginePool, engine_pool
+from .engine_hints import EngineHints, Hint
+from .eval_cache import EvalCache, CachedEval, eval_cache
+from .opening_book import OpeningBook, opening_book
+from .tablebase import Tablebase, tablebase
 from .engine_model import EngineModel
 from .engine_presenter import EnginePresenter
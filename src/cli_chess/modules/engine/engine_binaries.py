@@ -0,0 +1,216 @@
+from cli_chess.utils import log, is_linux_os, is_windows_os, is_mac_os
+from cli_chess.utils.config import get_config_path, engine_config
+import asyncio
+import platform
+import json
+import re
+import os
+from typing import Dict, List, Optional, Set
+
+BENCH_RESULTS_FILENAME = "engine_bench.json"
+
+# Fairy-Stockfish x86-64 builds (fastest first) and the CPU flags each build requires
+X86_64_ARCHITECTURES = [
+    ("x86-64-avx512", {"avx512f", "avx512bw", "bmi2", "avx2", "popcnt"}),
+    ("x86-64-bmi2", {"bmi2", "avx2", "popcnt"}),
+    ("x86-64-avx2", {"avx2", "popcnt"}),
+    ("x86-64-modern", {"popcnt", "sse4_1", "ssse3"}),
+    ("x86-64", set()),
+]
+
+# Arguments for a quick engine benchmark (hash size, threads, and depth)
+BENCH_ARGS = ["bench", "16", "1", "8"]
+BENCH_TIMEOUT = 30
+
+
+def get_cpu_flags(cpuinfo_path: str = "/proc/cpuinfo") -> Set[str]:
+    """Returns the CPU feature flags (e.g. `bmi2`, `avx2`, `popcnt`) read from
+       /proc/cpuinfo. Returns an empty set if the flags cannot be read.
+    """
+    try:
+        with open(cpuinfo_path) as cpuinfo:
+            for line in cpuinfo:
+                key, _, value = line.partition(":")
+                if key.strip() == "flags":
+                    return set(value.split())
+    except OSError:
+        pass
+    return set()
+
+
+def get_platform_suffix() -> str:
+    """Returns the platform suffix of the engine binary filenames"""
+    return "linux" if is_linux_os() else ("windows.exe" if is_windows_os() else "macos")
+
+
+class EngineBinarySelector:
+    """Selects the fastest engine binary this CPU can run. Optimised builds named like
+       the bundled binary (e.g. `fairy-stockfish_x86-64-bmi2_linux`) are looked for in the
+       configured engine directory and the bundled binaries directory, and are only used
+       when /proc/cpuinfo reports the CPU flags they require. Where the flags cannot be
+       read only the generic build is used. Binaries which fail the self-benchmark are
+       skipped, and the fastest benchmarked binary is preferred. A configured engine
+       path pointing to a binary (rather than a directory) is always used as-is.
+    """
+    def __init__(self, binaries_dir: Optional[str] = None, results_filename: Optional[str] = None,
+                 cpu_flags: Optional[Set[str]] = None):
+        self.binaries_dir = binaries_dir if binaries_dir else os.path.dirname(os.path.realpath(__file__)) + "/binaries"
+        self.results_filename = results_filename
+        self._cpu_flags = cpu_flags
+        self._selected_path: Optional[str] = None
+        self._selected_config: Optional[str] = None
+
+    def get_engine_path(self) -> str:
+        """Returns the path of the engine binary to use. The selection is cached until
+           the configured engine path changes or new benchmark results are recorded.
+        """
+        configured = self._get_configured_path()
+        if self._selected_path is None or configured != self._selected_config:
+            self._selected_config = configured
+            self._selected_path = self._select(configured)
+            log.debug(f"Selected engine binary: {self._selected_path}")
+        return self._selected_path
+
+    def get_candidates(self) -> List[str]:
+        """Returns the engine binaries this CPU supports, fastest build first"""
+        configured = self._get_configured_path()
+        directories = [configured] if configured and os.path.isdir(configured) else []
+        directories.append(self.binaries_dir)
+
+        candidates = []
+        for name in self._get_supported_filenames():
+            for directory in directories:
+                path = os.path.join(directory, name)
+                if os.path.isfile(path) and os.access(path, os.X_OK) and path not in candidates:
+                    candidates.append(path)
+        return candidates
+
+    def get_bench_results(self) -> Dict[str, Optional[int]]:
+        """Returns the recorded NPS of each candidate binary with up-to-date benchmark
+           results. Binaries which failed the benchmark have an NPS of None.
+        """
+        results = self._load_results()
+        bench_results = {}
+        for path in self.get_candidates():
+            result = results.get(path)
+            if result and result.get("signature") == self._get_signature(path):
+                bench_results[path] = result.get("nps")
+        return bench_results
+
+    async def bench(self) -> Dict[str, Optional[int]]:
+        """Benchmarks the candidate binaries without up-to-date results and records their NPS.
+           Nothing is benchmarked when there is no choice of binary (e.g. only the generic
+           build). This is intended to be run as a background task at startup.
+        """
+        candidates = self.get_candidates()
+        if len(candidates) < 2:
+            return self.get_bench_results()
+
+        results = self._load_results()
+        for path in candidates:
+            signature = self._get_signature(path)
+            if results.get(path, {}).get("signature") != signature:
+                nps = await self._bench_binary(path)
+                results[path] = {'signature': signature, 'nps': nps}
+                log.debug(f"Engine benchmark: {path} {f'{nps} nps' if nps else 'failed'}")
+                self._save_results(results)
+                self._selected_path = None
+        return self.get_bench_results()
+
+    def _select(self, configured: str) -> str:
+        """Returns the fastest working candidate binary, falling back to the generic build"""
+        if configured and os.path.isfile(configured):
+            return configured
+        if configured and not os.path.isdir(configured):
+            log.error(f"Configured engine path not found: {configured}")
+
+        candidates = self.get_candidates()
+        bench_results = self.get_bench_results()
+        working = [path for path in candidates if bench_results.get(path, 0) is not None]
+        benchmarked = [path for path in working if path in bench_results]
+        if benchmarked:
+            return max(benchmarked, key=lambda path: bench_results[path])
+        if working:
+            return working[0]
+        return os.path.join(self.binaries_dir, self._get_generic_filename())
+
+    def _get_supported_filenames(self) -> List[str]:
+        """Returns the filenames of the builds this CPU supports, fastest build first"""
+        if is_mac_os() and platform.machine() == "arm64":
+            return [self._get_generic_filename()]
+
+        flags = self._get_cpu_flags()
+        suffix = get_platform_suffix()
+        return [f"fairy-stockfish_{arch}_{suffix}" for arch, required_flags in X86_64_ARCHITECTURES
+                if not required_flags or (flags and required_flags <= flags)]
+
+    @staticmethod
+    def _get_generic_filename() -> str:
+        """Returns the filename of the bundled generic build"""
+        if is_mac_os() and platform.machine() == "arm64":
+            return "fairy-stockfish_arm64_macos"
+        return f"fairy-stockfish_x86-64_{get_platform_suffix()}"
+
+    def _get_cpu_flags(self) -> Set[str]:
+        """Returns the CPU flags, reading them on first use"""
+        if self._cpu_flags is None:
+            self._cpu_flags = get_cpu_flags() if is_linux_os() else set()
+        return self._cpu_flags
+
+    @staticmethod
+    def _get_configured_path() -> str:
+        """Returns the configured engine binary or directory"""
+        configured = engine_config.get_value(engine_config.Keys.ENGINE_PATH)
+        return os.path.expanduser(configured) if configured else ""
+
+    @staticmethod
+    def _get_signature(path: str) -> str:
+        """Returns a signature of the binary so results are redone when the binary changes"""
+        stat = os.stat(path)
+        return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+    @staticmethod
+    async def _bench_binary(path: str) -> Optional[int]:
+        """Runs the engine's `bench` command and returns the reported NPS, or None if it fails"""
+        process = None
+        try:
+            process = await asyncio.create_subprocess_exec(path, *BENCH_ARGS, stdin=asyncio.subprocess.DEVNULL,
+                                                           stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+            output, _ = await asyncio.wait_for(process.communicate(), BENCH_TIMEOUT)
+            match = re.search(rb"Nodes/second\s*:\s*(\d+)", output)
+            if process.returncode == 0 and match:
+                return int(match.group(1))
+            log.error(f"Engine benchmark failed for {path} (exit code: {process.returncode})")
+        except (OSError, asyncio.TimeoutError) as e:
+            log.error(f"Engine benchmark failed for {path}: {e!r}")
+        finally:
+            if process and process.returncode is None:
+                process.kill()
+                await process.wait()
+        return None
+
+    def _get_results_filename(self) -> str:
+        """Returns the filename of the benchmark results"""
+        return self.results_filename if self.results_filename else get_config_path() + BENCH_RESULTS_FILENAME
+
+    def _load_results(self) -> Dict[str, dict]:
+        """Returns the recorded benchmark results"""
+        try:
+            with open(self._get_results_filename()) as results_file:
+                results = json.load(results_file)
+            return results if isinstance(results, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def _save_results(self, results: Dict[str, dict]) -> None:
+        """Records the benchmark results"""
+        try:
+            filename = self._get_results_filename()
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            with open(filename, "w") as results_file:
+                json.dump(results, results_file, indent=2)
+        except OSError as e:
+            log.error(f"Error saving engine benchmark results: {e}")
+
+
+engine_binary_selector = EngineBinarySelector()
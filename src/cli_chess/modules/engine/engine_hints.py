@@ -0,0 +1,166 @@
+from __future__ import annotations
+from cli_chess.modules.engine.engine_binaries import engine_binary_selector
+from cli_chess.modules.engine.engine_pool import engine_pool
+from cli_chess.modules.engine.eval_cache import eval_cache
+from cli_chess.utils import log
+from collections import OrderedDict
+from dataclasses import dataclass
+import chess.engine
+import chess.polyglot
+import chess
+import asyncio
+from typing import Optional, Tuple
+
+# Hints are short searches, capped by depth (plies) and time (seconds)
+HINT_DEPTH = 12
+HINT_TIME = 1.0
+
+# Hints are run on a single thread with a small hash so they do not slow down the game engine
+HINT_ENGINE_CFG = {'Skill Level': 20, 'UCI_LimitStrength': False, 'Threads': 1, 'Hash': 16}
+
+# How many positions are kept in the in-memory hint cache
+HINT_CACHE_SIZE = 128
+
+
+@dataclass
+class Hint:
+    move: chess.Move
+    san: str
+    score: chess.engine.PovScore
+    depth: int
+
+
+class EngineHints:
+    """Answers hint (best move) and threat (the opponents best move if it were their
+       turn) requests using shallow, depth limited searches on an engine checked out
+       from the engine pool on first use. Results are cached in memory by the positions
+       Zobrist hash, so repeat requests for the same position are free, and deeper
+       results are served from the evaluation cache. Only one search runs at a time.
+       A request for the position already being searched waits on that search, and a
+       request for a different position supersedes it.
+    """
+    def __init__(self):
+        self.game_id = engine_pool.new_game_id()
+        self._cache: OrderedDict[int, Tuple[str, Hint]] = OrderedDict()
+        self._engine_start: Optional[asyncio.Future] = None
+        self._engine_path: Optional[str] = None
+        self._search: Optional[asyncio.Future] = None
+        self._search_key: Optional[int] = None
+
+    async def get_hint(self, board: chess.Board) -> Optional[Hint]:
+        """Returns the best move for the side to move. Returns None if the
+           request was superseded or no move was found.
+        """
+        if board.is_game_over():
+            raise Warning("Game has already ended")
+        return await self._get_best_move(board.copy(stack=False))
+
+    async def get_threat(self, board: chess.Board) -> Optional[Hint]:
+        """Returns the best move for the side not to move, if it were their turn.
+           Returns None if the request was superseded or there is no threat.
+        """
+        if board.is_game_over():
+            raise Warning("Game has already ended")
+        if board.is_check():
+            raise Warning("No threat shown while in check")
+
+        board = board.copy(stack=False)
+        board.push(chess.Move.null())
+        if board.is_game_over():
+            return None
+        return await self._get_best_move(board)
+
+    async def _get_best_move(self, board: chess.Board) -> Optional[Hint]:
+        """Returns the cached best move for the position, otherwise searches it"""
+        key = chess.polyglot.zobrist_hash(board)
+        cached = self._get_cached(key, board)
+        if cached:
+            return cached
+
+        cached = eval_cache.get(board, min_depth=HINT_DEPTH)
+        if cached:
+            return self._put_cached(key, board, Hint(cached.best_move, board.san(cached.best_move), cached.score, cached.depth))
+
+        if not self._search or self._search.done() or self._search_key != key:
+            self.cancel_search()
+            self._search_key = key
+            self._search = asyncio.ensure_future(self._run_search(key, board))
+
+        # Shielded so a waiting request being cancelled does not cancel the search for other requests
+        search = self._search
+        try:
+            return await asyncio.shield(search)
+        except asyncio.CancelledError:
+            if not search.cancelled():
+                raise
+            log.debug("Hint search was superseded")
+            return None
+
+    async def _run_search(self, key: int, board: chess.Board) -> Optional[Hint]:
+        """Runs a shallow search of the passed in position and caches the result"""
+        engine = await self._get_engine()
+        try:
+            info = await engine.analyse(board, chess.engine.Limit(depth=HINT_DEPTH, time=HINT_TIME), game=self.game_id)
+        except chess.engine.EngineError as e:
+            log.error(f"Error searching for a hint: {e}")
+            raise Warning("Hint search failed")
+
+        pv = info.get("pv")
+        if not pv or info.get("score") is None:
+            return None
+
+        eval_cache.put(board, info)
+        return self._put_cached(key, board, Hint(pv[0], board.san(pv[0]), info["score"], info.get("depth", 0)))
+
+    async def _get_engine(self) -> chess.engine.UciProtocol:
+        """Returns the hint engine, checking one out from the engine pool on first use.
+           The checkout is shielded so a superseded search does not abandon a starting engine.
+        """
+        if not self._engine_start:
+            self._engine_path = engine_binary_selector.get_engine_path()
+            self._engine_start = asyncio.ensure_future(engine_pool.checkout(self._engine_path, HINT_ENGINE_CFG))
+        try:
+            return await asyncio.shield(self._engine_start)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._engine_start = None
+            msg = f"Error starting hint engine: {e}"
+            log.error(msg)
+            raise Warning(msg)
+
+    def _get_cached(self, key: int, board: chess.Board) -> Optional[Hint]:
+        """Returns the cached hint for the position, if one exists"""
+        entry = self._cache.get(key)
+        # The EPD guards against hash collisions and variant state that is not part of the hash (e.g. pockets)
+        if entry and entry[0] == board.epd():
+            self._cache.move_to_end(key)
+            return entry[1]
+        return None
+
+    def _put_cached(self, key: int, board: chess.Board, hint: Hint) -> Hint:
+        """Caches the hint for the position, evicting the least recently used position over the size cap"""
+        self._cache[key] = (board.epd(), hint)
+        self._cache.move_to_end(key)
+        while len(self._cache) > HINT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return hint
+
+    def cancel_search(self) -> None:
+        """Cancels the running hint search"""
+        if self._search and not self._search.done():
+            self._search.cancel()
+        self._search = None
+        self._search_key = None
+
+    async def quit(self) -> None:
+        """Cancels any running search and releases the hint engine back to the engine pool"""
+        self.cancel_search()
+        engine_start, self._engine_start = self._engine_start, None
+        if not engine_start:
+            return
+        try:
+            engine = await engine_start
+            await engine_pool.checkin(self._engine_path, engine)
+        except Exception as e:
+            log.error(f"Error releasing hint engine: {e}")
@@ -1,10 +1,21 @@
+from __future__ import annotations
 from cli_chess.modules.board import BoardModel
+from cli_chess.modules.engine.engine_binaries import engine_binary_selector
+from cli_chess.modules.engine.engine_pool import EnginePool, engine_pool
+from cli_chess.modules.engine.engine_resources import get_engine_resources
+from cli_chess.modules.engine.engine_telemetry import EngineTelemetry, SearchTelemetry, TelemetryUciProtocol
+from cli_chess.modules.engine.eval_cache import eval_cache
+from cli_chess.modules.engine.opening_book import opening_book
+from cli_chess.modules.engine.tablebase import tablebase
 from cli_chess.core.game.game_options import GameOption
-from cli_chess.utils import log, is_linux_os, is_windows_os, is_mac_os
+from cli_chess.utils import log
+from cli_chess.utils.config import engine_config
 import chess.engine
-from os import path
-import platform
-from typing import Optional
+import asyncio
+from time import monotonic
+from typing import Optional, TYPE_CHECKING
+if TYPE_CHECKING:
+    from cli_chess.core.game import GameMetadata
 
 
 fairy_stockfish_mapped_skill_levels = {
@@ -21,74 +32,237 @@ fairy_stockfish_mapped_skill_levels = {
     8: 20,
 }
 
+fairy_stockfish_skill_level_limits = {
+    # Search caps applied for each skill level (depth in plies, time in seconds).
+    # These limits are to match Lichess' implementation and let weaker
+    # levels reply instantly rather than spending a full search
+    1: {'depth': 5, 'time': 0.05},
+    2: {'depth': 5, 'time': 0.1},
+    3: {'depth': 5, 'time': 0.15},
+    4: {'depth': 5, 'time': 0.2},
+    5: {'depth': 5, 'time': 0.3},
+    6: {'depth': 8, 'time': 0.4},
+    7: {'depth': 13, 'time': 0.5},
+    8: {'depth': 22, 'time': 1.0},
+}
+
+# Search time (in seconds) used for untimed games without skill level search caps
+DEFAULT_SEARCH_TIME = 2
+
+# The Fairy-Stockfish skill level at which the engine plays at full strength
+FULL_STRENGTH_SKILL_LEVEL = 20
+
+# The depth cached results need to replace a full strength search before the engines own
+# searches have shown the depth it reaches. Deeper than the hint depth, so hints are searched again
+MIN_CACHED_DEPTH = 16
+
 
 class EngineModel:
-    def __init__(self, board_model: BoardModel, game_parameters: dict):
-        self.engine: Optional[chess.engine.SimpleEngine] = None
+    def __init__(self, board_model: BoardModel, game_parameters: dict, game_metadata: Optional[GameMetadata] = None,
+                 calibration: bool = False, pool: Optional[EnginePool] = None):
+        self.engine: Optional[chess.engine.UciProtocol] = None
+        # The binary the engine was checked out for, which it is checked back in under
+        self.engine_path: Optional[str] = None
         self.board_model = board_model
         self.game_parameters = game_parameters
+        self.game_metadata = game_metadata
+        # Calibration engines (e.g. tournament players) only play moves from their own search.
+        # The opening book, tablebases, evaluation cache, and pondering are not used.
+        self.calibration = calibration
+        self.pool = pool or engine_pool
+        self.game_id = self.pool.new_game_id()
+        self.ponder = False
+        # The depth the engines last completed search reached
+        self._last_search_depth: Optional[int] = None
+        self.telemetry = EngineTelemetry()
+        self._search: Optional[asyncio.Future] = None
+        self._search_cancelled = False
 
-    def start_engine(self):
-        """Starts and configures the Fairy-Stockfish chess engine"""
+    async def start_engine(self) -> None:
+        """Checks out and configures a Fairy-Stockfish chess engine from the engine pool
+           (the process-wide engine pool, unless a pool was passed in)
+        """
         try:
-            # Use SimpleEngine to allow engine assignment in initializer. Additionally,
-            # by having this as a blocking call it stops multiple engines from being
-            # able to be started if the start game button is spammed
-            self.engine = chess.engine.SimpleEngine.popen_uci(path.dirname(path.realpath(__file__)) + "/binaries/" + self._get_engine_filename())
-
-            # Engine configuration
+            # Engine configuration (reapplied on every checkout as pooled engines are reused)
             skill_level = fairy_stockfish_mapped_skill_levels.get(self.game_parameters.get(GameOption.COMPUTER_SKILL_LEVEL))
             limit_strength = self.game_parameters.get(GameOption.SPECIFY_ELO)
             uci_elo = self.game_parameters.get(GameOption.COMPUTER_ELO)
             engine_cfg = {
                 'Skill Level': skill_level if skill_level else 0,
                 'UCI_LimitStrength': True if limit_strength else False,
-                'UCI_Elo': uci_elo if uci_elo else 1350
+                'UCI_Elo': uci_elo if uci_elo else 1350,
+                **get_engine_resources(self.is_full_strength(), self.pool.get_active_count() + 1)
             }
-            self.engine.configure(engine_cfg)
+
+            self.engine_path = self.get_engine_path()
+            self.engine = await self.pool.checkout(self.engine_path, engine_cfg)
+            self.ponder = not self.calibration and engine_config.get_boolean(engine_config.Keys.PONDER)
         except Exception as e:
             msg = f"Error starting engine: {e}"
             log.error(msg)
             raise Warning(msg)
 
-    def get_best_move(self) -> chess.engine.PlayResult:
-        """Query the engine to get the best move"""
-        # Keep track of the last move that was made. This allows checking
-        # for if a takeback happened while the engine has been thinking
-        try:
-            last_move = (self.board_model.get_move_stack() or [None])[-1]
-            result = self.engine.play(self.board_model.board,
-                                      chess.engine.Limit(2))
+    async def get_best_move(self) -> chess.engine.PlayResult:
+        """Query the engine to get the best move. Moves from the opening book, tablebases,
+           or the evaluation cache are returned instantly without searching. The search runs
+           on the app's event loop and can be stopped at any time using `cancel_search()`,
+           in which case an empty result is returned. If pondering is enabled, the engine
+           keeps searching the expected reply in the background once the move is returned.
+           If the user plays the expected reply the search continues as a regular search
+           (ponderhit), otherwise it is stopped when the next search starts. Telemetry
+           for the move is recorded once the move is returned.
+        """
+        start_time = monotonic()
+        if self.board_model.get_game_over_result() is not None:
+            return chess.engine.PlayResult(None, None)
+
+        if not self.engine:
+            raise Warning("Engine is not running")
+
+        board = self.board_model.board.copy()
+        skill_level = None if self.game_parameters.get(GameOption.SPECIFY_ELO) else self.game_parameters.get(GameOption.COMPUTER_SKILL_LEVEL)
+        book_move = opening_book.get_move(board, skill_level) if not self.calibration else None
+        if book_move:
+            log.debug(f"Returning book move {book_move}")
+            return self._record_telemetry(board, chess.engine.PlayResult(book_move, None), "book", start_time)
+
+        use_eval_cache = self.is_full_strength() and not self.calibration
+        if use_eval_cache:
+            tablebase_move = tablebase.get_best_move(board)
+            if tablebase_move:
+                log.debug(f"Returning tablebase move {tablebase_move}")
+                return self._record_telemetry(board, chess.engine.PlayResult(tablebase_move, None), "tablebase", start_time)
 
-            # Check if the move stack has been altered, if so void this move
-            if last_move != (self.board_model.get_move_stack() or [None])[-1]:
-                result.move = None
+            cached = eval_cache.get(board, min_depth=self.get_min_cached_depth())
+            if cached:
+                log.debug(f"Returning cached move {cached.best_move} (depth={cached.depth})")
+                result = chess.engine.PlayResult(cached.best_move, cached.pv[1] if len(cached.pv) > 1 else None,
+                                                 info={'score': cached.score, 'depth': cached.depth, 'pv': cached.pv})
+                return self._record_telemetry(board, result, "cache", start_time)
 
-            # Check to make sure the game is still in progress (opponent hasn't resigned)
-            if self.board_model.get_game_over_result() is not None:
-                result.move = None
+        try:
+            self._search_cancelled = False
+            self._search = asyncio.ensure_future(self.engine.play(board,
+                                                                  self.get_search_limit(),
+                                                                  game=self.game_id,
+                                                                  info=chess.engine.INFO_BASIC | (chess.engine.INFO_SCORE | chess.engine.INFO_PV if use_eval_cache else chess.engine.INFO_NONE),  # noqa: E501
+                                                                  ponder=self.ponder))
+            result = await self._search
+
+            # The search may have been cancelled after the engine replied
+            if self._search_cancelled:
+                raise asyncio.CancelledError
+        except asyncio.CancelledError:
+            if not self._search_cancelled:
+                raise
+            log.debug("Engine search was cancelled")
+            return chess.engine.PlayResult(None, None)
         except Exception as e:
             log.error(f"{e}")
-            if not self.engine:
-                raise Warning("Engine is not running")
             raise
+        finally:
+            self._search = None
+
+        if use_eval_cache:
+            eval_cache.put(board, result.info)
+            self._last_search_depth = result.info.get("depth", self._last_search_depth)
 
         log.debug(f"Returning {result}")
+        return self._record_telemetry(board, result, "engine", start_time)
+
+    def _record_telemetry(self, board: chess.Board, result: chess.engine.PlayResult, source: str, start_time: float) -> chess.engine.PlayResult:
+        """Records the telemetry for the engine move and returns the passed in result"""
+        first_info = self.engine.first_info_received if source == "engine" and isinstance(self.engine, TelemetryUciProtocol) else None
+        self.telemetry.record(SearchTelemetry(
+            ply=board.ply() + 1,
+            move=result.move.uci() if result.move else None,
+            source=source,
+            think_time=monotonic() - start_time,
+            # A pondering engine may already be sending info lines when the move is requested (ponderhit)
+            time_to_first_info=max(first_info - start_time, 0) if first_info is not None else None,
+            depth=result.info.get("depth"),
+            seldepth=result.info.get("seldepth"),
+            nodes=result.info.get("nodes"),
+            nps=result.info.get("nps"),
+        ))
         return result
 
-    def quit_engine(self) -> None:
-        """Notify the engine to quit"""
+    def is_full_strength(self) -> bool:
+        """Returns True if the engine is playing at full strength. Only full strength
+           engines use tablebases and the evaluation cache, as weakened engines
+           intentionally play moves other than the best move.
+        """
+        skill_level = fairy_stockfish_mapped_skill_levels.get(self.game_parameters.get(GameOption.COMPUTER_SKILL_LEVEL))
+        return not self.game_parameters.get(GameOption.SPECIFY_ELO) and skill_level == FULL_STRENGTH_SKILL_LEVEL
+
+    def get_min_cached_depth(self) -> int:
+        """Returns the depth a cached result needs to be used in place of a search. Time
+           limited searches rarely reach the skill level depth cap, so this is the depth the
+           engines last search reached (capped by the skill level depth). Shallower results
+           (e.g. from analysis or hints) are searched again.
+        """
+        min_depth = self._last_search_depth if self._last_search_depth is not None else MIN_CACHED_DEPTH
+        depth_limit = self.get_search_limit().depth
+        return min(min_depth, depth_limit) if depth_limit else min_depth
+
+    def get_search_limit(self) -> chess.engine.Limit:
+        """Returns the search limit to use for the engines next move. Timed games pass
+           the locally tracked clocks so the engine manages its own time. Skill levels
+           additionally cap the search depth and time.
+        """
+        limit = chess.engine.Limit()
+        if not self.game_parameters.get(GameOption.SPECIFY_ELO):
+            skill_level_limits = fairy_stockfish_skill_level_limits.get(self.game_parameters.get(GameOption.COMPUTER_SKILL_LEVEL), {})
+            limit.depth = skill_level_limits.get('depth')
+            limit.time = skill_level_limits.get('time')
+
+        clocks = self.game_metadata.clocks if self.game_metadata else None
+        if clocks and clocks[chess.WHITE].time is not None and clocks[chess.BLACK].time is not None:
+            # Clocks are tracked in milliseconds, but the engine expects seconds
+            limit.white_clock = clocks[chess.WHITE].time / 1000
+            limit.black_clock = clocks[chess.BLACK].time / 1000
+            limit.white_inc = (clocks[chess.WHITE].increment or 0) / 1000
+            limit.black_inc = (clocks[chess.BLACK].increment or 0) / 1000
+        elif limit.time is None:
+            limit.time = DEFAULT_SEARCH_TIME
+
+        return limit
+
+    def cancel_search(self) -> None:
+        """Stops the engine's current search (e.g. on takeback, resignation, or exit).
+           If the engine is pondering in the background, the ponder is stopped instead.
+        """
+        if self._search:
+            self._search_cancelled = True
+            self._search.cancel()
+        elif self.engine and self.ponder and not self.engine.returncode.done():
+            # Any new command stops the ponder
+            self._search = asyncio.ensure_future(self.engine.ping())
+            self._search.add_done_callback(self._on_ponder_stopped)
+
+    def _on_ponder_stopped(self, task: asyncio.Future) -> None:
+        """Clears the ponder stop request once the engine has responded"""
+        if self._search is task:
+            self._search = None
+        if not task.cancelled() and task.exception():
+            log.error(f"Error stopping engine pondering: {task.exception()}")
+
+    async def quit_engine(self) -> None:
+        """Stops any running search and releases the engine back to the engine pool"""
         try:
+            self.cancel_search()
             if self.engine:
-                log.debug("Quitting engine")
-                self.engine.quit()
+                searches = self.telemetry.get_searches()
+                if searches:
+                    log.debug(f"Engine telemetry: {len(searches)} moves, average {self.telemetry.get_average_nps()} nps, "
+                              f"{sum(search.think_time for search in searches):.1f}s total think time")
+                log.debug("Releasing engine to the engine pool")
+                engine, self.engine = self.engine, None
+                await self.pool.checkin(self.engine_path, engine)
         except Exception as e:
-            log.error(f"Error quitting engine: {e}")
+            log.error(f"Error releasing engine: {e}")
 
     @staticmethod
-    def _get_engine_filename() -> str:
-        """Returns the engines filename to use for opening"""
-        binary_name = "fairy-stockfish_x86-64_" + ("linux" if is_linux_os() else ("windows" if is_windows_os() else "macos"))
-        if is_mac_os() and platform.machine() == "arm64":
-            binary_name = "fairy-stockfish_arm64_macos"
-        return binary_name
+    def get_engine_path() -> str:
+        """Returns the full path of the engine binary to use"""
+        return engine_binary_selector.get_engine_path()
@@ -0,0 +1,136 @@
+from cli_chess.modules.engine.engine_telemetry import popen_engine
+from cli_chess.utils import log
+import chess.engine
+from itertools import count
+from typing import Dict, List, Set
+
+
+class EnginePool:
+    """Process-wide pool of warm engine processes. Engines are handed out
+       one per game and are returned to the pool (rather than quit) when the
+       game ends, which saves the process spawn, UCI handshake, and hash
+       allocation on the next game start. Only the idle engines kept warm are
+       capped (by `max_idle`). The engines in use are not, as a single game may
+       use several at once (e.g. the opponent, hints, and analysis). Engines beyond
+       the cap are quit when they are returned. Engines are driven through
+       python-chess' asyncio protocol, so the pool must only be used from the
+       app's event loop.
+    """
+    def __init__(self, max_idle: int = 1):
+        self.max_idle = max_idle
+        self._idle: Dict[str, List[chess.engine.UciProtocol]] = {}
+        self._checked_out: Set[chess.engine.UciProtocol] = set()
+        self._starting = 0
+        self._game_ids = count(1)
+
+    async def checkout(self, engine_path: str, engine_cfg: dict) -> chess.engine.UciProtocol:
+        """Returns a configured engine for the binary at the passed in path.
+           A warm engine is reused if available, otherwise a new one is started.
+        """
+        self._starting += 1
+        try:
+            engine = self._pop_idle(engine_path)
+            if engine:
+                try:
+                    await engine.configure(engine_cfg)
+                    log.debug(f"Reusing warm engine (pid={engine.transport.get_pid()})")
+                    self._checked_out.add(engine)
+                    return engine
+                except Exception as e:
+                    log.error(f"Discarding warm engine that failed to configure: {e}")
+                    await self._quit(engine)
+
+            engine = await popen_engine(engine_path)
+            try:
+                await engine.configure(engine_cfg)
+            except Exception:
+                await self._quit(engine)
+                raise
+            self._checked_out.add(engine)
+            return engine
+        finally:
+            self._starting -= 1
+
+    async def checkin(self, engine_path: str, engine: chess.engine.UciProtocol) -> None:
+        """Returns the engine to the pool. The engine is quit if it is no
+           longer running or if `max_idle` engines are already idle.
+        """
+        try:
+            # Any new command stops a search or ponder that is still running
+            await engine.ping()
+        except Exception as e:
+            log.error(f"Engine did not respond before returning to the pool: {e}")
+            self._checked_out.discard(engine)
+            await self._quit(engine)
+            return
+
+        self._checked_out.discard(engine)
+        idle = self._idle.setdefault(engine_path, [])
+        if self._is_alive(engine) and sum(len(engines) for engines in self._idle.values()) < self.max_idle:
+            idle.append(engine)
+            return
+        await self._quit(engine)
+
+    def get_active_count(self) -> int:
+        """Returns the number of engines in use, including engines which are being started"""
+        return len(self._checked_out) + self._starting
+
+    def new_game_id(self) -> int:
+        """Returns a unique game identifier. Passing this identifier to
+           the engine on each search ensures `ucinewgame` is sent to a
+           pooled engine before it is used for a different game.
+        """
+        return next(self._game_ids)
+
+    async def prewarm(self, engine_path: str) -> None:
+        """Starts an engine and adds it to the pool so the next game start
+           does not have to wait for the engine. This is intended to be
+           scheduled as a background task.
+        """
+        if self._idle.get(engine_path):
+            return
+        try:
+            engine = await popen_engine(engine_path)
+            log.debug(f"Prewarmed engine (pid={engine.transport.get_pid()})")
+            await self.checkin(engine_path, engine)
+        except Exception as e:
+            log.error(f"Error prewarming engine: {e}")
+
+    async def shutdown(self) -> None:
+        """Quits all idle engines, and any engines which were never
+           returned to the pool. This should be called on program exit.
+        """
+        engines = [engine for idle in self._idle.values() for engine in idle] + list(self._checked_out)
+        self._idle.clear()
+        self._checked_out.clear()
+        for engine in engines:
+            await self._quit(engine)
+
+    def _pop_idle(self, engine_path: str):
+        """Pops a running idle engine for the passed in path, if one exists.
+           Engines which are no longer running are dropped.
+        """
+        idle = self._idle.get(engine_path, [])
+        while idle:
+            engine = idle.pop()
+            if self._is_alive(engine):
+                return engine
+        return None
+
+    @staticmethod
+    def _is_alive(engine: chess.engine.UciProtocol) -> bool:
+        """Returns True if the engine process is still running"""
+        return not engine.returncode.done()
+
+    @staticmethod
+    async def _quit(engine: chess.engine.UciProtocol) -> None:
+        """Quits the passed in engine"""
+        try:
+            log.debug("Quitting engine")
+            if not engine.returncode.done():
+                await engine.quit()
+        except Exception as e:
+            log.error(f"Error quitting engine: {e}")
+
+
+engine_pool = EnginePool()
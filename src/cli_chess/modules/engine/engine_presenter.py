@@ -9,14 +9,52 @@ class EnginePresenter:
     def __init__(self, model: EngineModel):
         self.model = model
 
-    def start_engine(self) -> None:
+    async def start_engine(self) -> None:
         """Notifies the model to start the engine"""
-        self.model.start_engine()
+        await self.model.start_engine()
 
-    def get_best_move(self) -> PlayResult:
+    async def get_best_move(self) -> PlayResult:
         """Notify the engine to get the best move from the current position"""
-        return self.model.get_best_move()
+        return await self.model.get_best_move()
 
-    def quit_engine(self) -> None:
+    def cancel_search(self) -> None:
+        """Notifies the model to stop the engine's current search"""
+        self.model.cancel_search()
+
+    async def quit_engine(self) -> None:
         """Calls the model to notify the engine to quit"""
-        self.model.quit_engine()
+        await self.model.quit_engine()
+
+    def get_formatted_telemetry(self) -> str:
+        """Returns the telemetry of the engines latest move formatted for display"""
+        latest = self.model.telemetry.get_latest()
+        if not latest:
+            return "Engine: waiting for the first move"
+
+        if latest.source != "engine":
+            return f"Engine: {latest.source} move in {latest.think_time:.2f}s"
+
+        stats = [f"{latest.think_time:.2f}s"]
+        if latest.depth is not None:
+            stats.append(f"depth {latest.depth}/{latest.seldepth if latest.seldepth is not None else '-'}")
+        if latest.nps is not None:
+            stats.append(f"{self.format_count(latest.nps)} nps")
+        if latest.nodes is not None:
+            stats.append(f"{self.format_count(latest.nodes)} nodes")
+        if latest.time_to_first_info is not None:
+            stats.append(f"first info {latest.time_to_first_info * 1000:.0f}ms")
+
+        output = "Engine: " + " · ".join(stats)
+        average_nps = self.model.telemetry.get_average_nps()
+        if average_nps is not None:
+            output += f"\nAverage: {self.format_count(average_nps)} nps"
+        return output
+
+    @staticmethod
+    def format_count(count: int) -> str:
+        """Returns the passed in count abbreviated for display (e.g. 1.2M)"""
+        if count >= 1_000_000:
+            return f"{count / 1_000_000:.1f}M"
+        if count >= 1_000:
+            return f"{count / 1_000:.0f}k"
+        return str(count)
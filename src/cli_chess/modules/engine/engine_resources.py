@@ -0,0 +1,93 @@
+from cli_chess.utils import log
+from cli_chess.utils.config import engine_config
+import os
+from typing import Optional
+
+# Hash size (MB) of weakened engines. Skill levels cap the search, so a larger hash does not help
+WEAKENED_HASH_SIZE = 16
+
+# Auto-tuned hash sizes (MB) scale with the number of threads up to a per engine cap
+HASH_PER_THREAD = 64
+MAX_AUTO_HASH_SIZE = 1024
+
+# The share of the available memory that auto-tuned hash tables may use between them,
+# and the share that configured hash sizes are limited to
+AUTO_MEMORY_FRACTION = 0.25
+MAX_MEMORY_FRACTION = 0.5
+
+
+def get_available_cpus() -> int:
+    """Returns the number of CPUs this process may run on"""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        return os.cpu_count() or 1
+
+
+def get_available_memory() -> Optional[int]:
+    """Returns the available memory in MB, or None if it cannot be determined"""
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE") // (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def get_engine_resources(full_strength: bool, concurrent_engines: int = 1) -> dict:
+    """Returns the `Threads` and `Hash` engine options for an engine running alongside
+       the passed in number of engines (including itself). Full strength engines (and
+       analysis) use the configured threads and hash size, or scale with the available
+       CPUs and memory when these are set to 0 (auto). Resources are split between
+       concurrent engines so they do not oversubscribe the machine, and configured values
+       are limited to the available CPUs and memory. Weakened engines use a single thread
+       and a small hash as their searches are capped.
+    """
+    if not full_strength:
+        return {'Threads': 1, 'Hash': WEAKENED_HASH_SIZE}
+
+    return split_engine_resources(_get_config_int(engine_config.Keys.THREADS), _get_config_int(engine_config.Keys.HASH), concurrent_engines)
+
+
+def split_engine_resources(threads: int, hash_size: int, concurrent_engines: int = 1) -> dict:
+    """Returns the `Threads` and `Hash` engine options for each of the passed in number
+       of concurrent engines. Threads and hash sizes of 0 (auto) scale with each engines
+       share of the available CPUs and memory, and other values are limited to them.
+    """
+    engines = max(concurrent_engines, 1)
+    cpus = get_available_cpus()
+    memory = get_available_memory()
+
+    if threads > 0:
+        threads = min(threads, cpus)
+    else:
+        # A CPU is left for the UI where there are enough to spare
+        usable_cpus = cpus - 1 if cpus > 2 else cpus
+        threads = max(usable_cpus // engines, 1)
+
+    if hash_size > 0:
+        if memory:
+            hash_size = min(hash_size, int(memory * MAX_MEMORY_FRACTION / engines))
+    else:
+        hash_size = min(HASH_PER_THREAD * threads, MAX_AUTO_HASH_SIZE)
+        if memory:
+            hash_size = min(hash_size, int(memory * AUTO_MEMORY_FRACTION / engines))
+        # Engines size their hash tables in powers of two
+        hash_size = 1 << (max(hash_size, 1).bit_length() - 1)
+
+    return {'Threads': threads, 'Hash': max(hash_size, 1)}
+
+
+def _get_config_int(key: engine_config.Keys) -> int:
+    """Returns the integer value of the passed in engine config key (0 is auto)"""
+    try:
+        return max(int(engine_config.get_value(key)), 0)
+    except (TypeError, ValueError):
+        log.error(f"Invalid engine configuration value for {key.value}, using the default")
+        return key.default_value
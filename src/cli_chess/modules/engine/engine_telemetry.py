@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from collections import deque
+import chess.engine
+from time import monotonic
+from typing import List, Optional
+
+# The number of searches kept in the telemetry ring buffer
+TELEMETRY_BUFFER_SIZE = 256
+
+
+class TelemetryUciProtocol(chess.engine.UciProtocol):
+    """A UCI protocol which records when the first search info line arrives after each
+       `go`. A slow first info line is the earliest sign of the engine being starved of CPU.
+    """
+    def __init__(self) -> None:
+        super().__init__()
+        self.search_started: Optional[float] = None
+        self.first_info_received: Optional[float] = None
+
+    def send_line(self, line: str) -> None:
+        """Sends a line to the engine, noting the time searches are started"""
+        if line.startswith("go"):
+            self.search_started = monotonic()
+            self.first_info_received = None
+        super().send_line(line)
+
+    def line_received(self, line: str) -> None:
+        """Notes the time of the first search info line after a search is started"""
+        if self.first_info_received is None and self.search_started is not None and line.startswith("info") and " depth " in line:
+            self.first_info_received = monotonic()
+
+
+async def popen_engine(engine_path: str) -> TelemetryUciProtocol:
+    """Starts and initializes the engine binary at the passed in path"""
+    transport, engine = await TelemetryUciProtocol.popen(engine_path)
+    try:
+        await engine.initialize()
+    except Exception:
+        transport.close()
+        raise
+    return engine
+
+
+@dataclass
+class SearchTelemetry:
+    """Telemetry for a single engine move. The source is `engine` for moves which were
+       searched, otherwise where the move came from (`book`, `tablebase`, or `cache`)
+    """
+    ply: int
+    move: Optional[str]
+    source: str
+    think_time: float
+    time_to_first_info: Optional[float] = None
+    depth: Optional[int] = None
+    seldepth: Optional[int] = None
+    nodes: Optional[int] = None
+    nps: Optional[int] = None
+
+    def to_pgn_comment(self) -> str:
+        """Returns the telemetry as a PGN move comment, including the elapsed move time (`%emt`)"""
+        hours, minutes, seconds = int(self.think_time // 3600), int(self.think_time % 3600 // 60), self.think_time % 60
+        comment = f"[%emt {hours}:{minutes:02}:{seconds:05.2f}]"
+        if self.source != "engine":
+            return f"{comment} {self.source}"
+
+        stats = [f"depth {self.depth}/{self.seldepth}" if self.depth is not None else None,
+                 f"{self.nodes} nodes" if self.nodes is not None else None,
+                 f"{self.nps} nps" if self.nps is not None else None,
+                 f"first info {self.time_to_first_info:.3f}s" if self.time_to_first_info is not None else None]
+        return " ".join([comment] + [stat for stat in stats if stat])
+
+
+class EngineTelemetry:
+    """A ring buffer of per move engine search telemetry (time to the first
+       info line, think time, depth, seldepth, nodes, and NPS)
+    """
+    def __init__(self, max_size: int = TELEMETRY_BUFFER_SIZE):
+        self._searches: "deque[SearchTelemetry]" = deque(maxlen=max_size)
+
+    def record(self, telemetry: SearchTelemetry) -> None:
+        """Adds the passed in telemetry, dropping the oldest entry if the buffer is full"""
+        self._searches.append(telemetry)
+
+    def get_searches(self) -> List[SearchTelemetry]:
+        """Returns the recorded telemetry, oldest first"""
+        return list(self._searches)
+
+    def get_latest(self) -> Optional[SearchTelemetry]:
+        """Returns the most recent telemetry, or None if nothing has been recorded"""
+        return self._searches[-1] if self._searches else None
+
+    def get_telemetry_for_ply(self, ply: int) -> Optional[SearchTelemetry]:
+        """Returns the most recent telemetry for the move played at the passed in ply"""
+        return next((telemetry for telemetry in reversed(self._searches) if telemetry.ply == ply), None)
+
+    def get_average_nps(self) -> Optional[int]:
+        """Returns the average NPS over the engine searches in the buffer"""
+        nps = [telemetry.nps for telemetry in self._searches if telemetry.source == "engine" and telemetry.nps]
+        return int(sum(nps) / len(nps)) if nps else None
+
+    def clear(self) -> None:
+        """Clears the recorded telemetry"""
+        self._searches.clear()
@@ -0,0 +1,193 @@
+from cli_chess.utils import log
+from cli_chess.utils.config import get_config_path, engine_config
+from dataclasses import dataclass, field
+import chess.engine
+import chess.polyglot
+import chess
+import sqlite3
+import time
+import os
+from typing import Dict, List, Optional, Tuple
+
+EVAL_CACHE_FILENAME = "eval_cache.db"
+
+# How many writes are made between checks of the size cap
+EVICTION_CHECK_INTERVAL = 256
+
+
+@dataclass
+class CachedEval:
+    best_move: chess.Move
+    score: chess.engine.PovScore
+    depth: int
+    pv: List[chess.Move] = field(default_factory=list)
+
+
+class EvalCache:
+    """A persistent SQLite cache of engine results keyed by the positions Zobrist
+       hash and variant. Only full strength results should be stored, so a cached
+       result can stand in for a search of the same depth or shallower. The deepest
+       result for a position is kept. The cache is capped at `max_entries`, evicting
+       the least recently used positions first. A `max_entries` of 0 disables the cache.
+       Lookups do not write to the database. The last used times of cache hits are kept
+       in memory and written with the next eviction check (or when the cache is closed).
+    """
+    def __init__(self, filename: Optional[str] = None, max_entries: Optional[int] = None):
+        self.filename = filename
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._last_used: Dict[Tuple[int, str], float] = {}
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def get(self, board: chess.Board, min_depth: int = 0) -> Optional[CachedEval]:
+        """Returns the cached result for the passed in position if one
+           exists with at least the passed in depth, otherwise None
+        """
+        connection = self._connect()
+        if not connection:
+            return None
+
+        try:
+            row = connection.execute("SELECT epd, depth, best_move, score_cp, score_mate, pv FROM evals WHERE zobrist = ? AND variant = ?",
+                                     (self._get_key(board), board.uci_variant)).fetchone()
+
+            # The EPD guards against hash collisions and variant state that is not part of the hash (e.g. pockets)
+            if row and row[0] == board.epd() and row[1] >= min_depth:
+                cached = self._to_cached_eval(board, row)
+                if cached:
+                    self._last_used[(self._get_key(board), board.uci_variant)] = time.time()
+                    self.hits += 1
+                    return cached
+        except sqlite3.Error as e:
+            log.error(f"Error reading from the evaluation cache: {e}")
+
+        self.misses += 1
+        return None
+
+    def put(self, board: chess.Board, info: chess.engine.InfoDict) -> None:
+        """Stores the engine result (score, depth, and PV) for the passed in position.
+           An existing result for the position is only replaced by a deeper one.
+        """
+        pv = info.get("pv")
+        score = info.get("score")
+        depth = info.get("depth")
+        if not pv or score is None or depth is None:
+            return
+
+        connection = self._connect()
+        if not connection:
+            return
+
+        white_score = score.white()
+        try:
+            connection.execute("INSERT INTO evals (zobrist, variant, epd, depth, best_move, score_cp, score_mate, pv, last_used) "
+                               "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                               "ON CONFLICT (zobrist, variant) DO UPDATE SET "
+                               "epd = excluded.epd, depth = excluded.depth, best_move = excluded.best_move, score_cp = excluded.score_cp, "
+                               "score_mate = excluded.score_mate, pv = excluded.pv, last_used = excluded.last_used "
+                               "WHERE excluded.depth > evals.depth OR excluded.epd != evals.epd",
+                               (self._get_key(board), board.uci_variant, board.epd(), depth, pv[0].uci(),
+                                white_score.score(), white_score.mate(), " ".join(move.uci() for move in pv), time.time()))
+            connection.commit()
+
+            self._writes += 1
+            if self._writes % EVICTION_CHECK_INTERVAL == 0:
+                self._evict()
+        except sqlite3.Error as e:
+            log.error(f"Error writing to the evaluation cache: {e}")
+
+    def get_hit_rate(self) -> float:
+        """Returns the ratio of lookups which were served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def close(self) -> None:
+        """Closes the cache database"""
+        if self._connection:
+            try:
+                self._write_last_used()
+            except sqlite3.Error as e:
+                log.error(f"Error writing to the evaluation cache: {e}")
+            log.debug(f"Evaluation cache hit rate: {self.get_hit_rate():.1%} ({self.hits} hits, {self.misses} misses)")
+            self._connection.close()
+            self._connection = None
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Returns the database connection, creating the database if needed.
+           Returns None if the cache is disabled or cannot be opened.
+        """
+        if self._connection:
+            return self._connection
+
+        if self._get_max_entries() <= 0:
+            return None
+
+        try:
+            filename = self.filename if self.filename else get_config_path() + EVAL_CACHE_FILENAME
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            self._connection = sqlite3.connect(filename)
+            self._connection.execute("PRAGMA journal_mode = WAL")
+            self._connection.execute("PRAGMA synchronous = NORMAL")
+            self._connection.execute("CREATE TABLE IF NOT EXISTS evals ("
+                                     "zobrist INTEGER NOT NULL, variant TEXT NOT NULL, epd TEXT NOT NULL, depth INTEGER NOT NULL, "
+                                     "best_move TEXT NOT NULL, score_cp INTEGER, score_mate INTEGER, pv TEXT NOT NULL, last_used REAL NOT NULL, "
+                                     "PRIMARY KEY (zobrist, variant))")
+            self._connection.execute("CREATE INDEX IF NOT EXISTS evals_last_used ON evals (last_used)")
+            self._connection.commit()
+        except (sqlite3.Error, OSError) as e:
+            log.error(f"Error opening the evaluation cache: {e}")
+            self._connection = None
+        return self._connection
+
+    def _write_last_used(self) -> None:
+        """Writes the last used times of the cache hits since the last write"""
+        if self._last_used:
+            last_used, self._last_used = self._last_used, {}
+            self._connection.executemany("UPDATE evals SET last_used = ? WHERE zobrist = ? AND variant = ?",
+                                         [(used, key, variant) for (key, variant), used in last_used.items()])
+            self._connection.commit()
+
+    def _evict(self) -> None:
+        """Evicts the least recently used positions over the size cap"""
+        self._write_last_used()
+        max_entries = self._get_max_entries()
+        count = self._connection.execute("SELECT COUNT(*) FROM evals").fetchone()[0]
+        if count > max_entries:
+            self._connection.execute("DELETE FROM evals WHERE rowid IN (SELECT rowid FROM evals ORDER BY last_used LIMIT ?)",
+                                     (count - max_entries,))
+            self._connection.commit()
+            log.debug(f"Evicted {count - max_entries} positions from the evaluation cache")
+
+    def _get_max_entries(self) -> int:
+        """Returns the maximum number of positions to keep"""
+        if self.max_entries is not None:
+            return self.max_entries
+        try:
+            return int(engine_config.get_value(engine_config.Keys.EVAL_CACHE_SIZE))
+        except (TypeError, ValueError):
+            return engine_config.Keys.EVAL_CACHE_SIZE.default_value
+
+    @staticmethod
+    def _get_key(board: chess.Board) -> int:
+        """Returns the positions Zobrist hash as a signed 64-bit integer (as stored by SQLite)"""
+        key = chess.polyglot.zobrist_hash(board)
+        return key - (1 << 64) if key >= (1 << 63) else key
+
+    @staticmethod
+    def _to_cached_eval(board: chess.Board, row: tuple) -> Optional[CachedEval]:
+        """Converts a database row into a cached result. Returns None if the stored move is not legal"""
+        _, depth, best_move, score_cp, score_mate, pv = row
+        best_move = chess.Move.from_uci(best_move)
+        if not board.is_legal(best_move):
+            return None
+
+        score = chess.engine.Mate(score_mate) if score_mate is not None else chess.engine.Cp(score_cp)
+        return CachedEval(best_move=best_move,
+                          score=chess.engine.PovScore(score, chess.WHITE),
+                          depth=depth,
+                          pv=[chess.Move.from_uci(move) for move in pv.split()])
+
+
+eval_cache = EvalCache()
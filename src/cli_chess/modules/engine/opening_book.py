@@ -0,0 +1,90 @@
+from cli_chess.utils import log
+from cli_chess.utils.config import engine_config
+import chess.polyglot
+import chess
+import random
+import os
+from typing import Optional
+
+book_skill_level_limits = {
+    # Opening book use for each skill level. Weaker levels leave the book
+    # earlier (`max_ply`) and pick between the book moves more evenly. The
+    # book weights are raised to the power of `exponent` before a move is
+    # randomly selected, so 0 picks uniformly and higher values favour the
+    # main lines. A `max_ply` of None uses the book for as long as it has moves.
+    1: {'max_ply': 2, 'exponent': 0},
+    2: {'max_ply': 4, 'exponent': 0.25},
+    3: {'max_ply': 6, 'exponent': 0.5},
+    4: {'max_ply': 8, 'exponent': 0.75},
+    5: {'max_ply': 10, 'exponent': 1},
+    6: {'max_ply': 14, 'exponent': 1},
+    7: {'max_ply': 18, 'exponent': 1.5},
+    8: {'max_ply': None, 'exponent': 2},
+}
+
+# Book usage for engines with a specified Elo rather than a skill level
+DEFAULT_BOOK_LIMITS = {'max_ply': None, 'exponent': 1}
+
+
+class OpeningBook:
+    """A Polyglot opening book. The book file is memory mapped and positions are
+       found by a binary search over the sorted entries (using python-chess'
+       memory mapped reader), so the book is never loaded into memory. The book
+       path is read from the engine configuration and the book is (re)opened lazily.
+    """
+    def __init__(self, path: Optional[str] = None, rng: Optional[random.Random] = None):
+        self.path = path
+        self.rng = rng if rng else random.Random()
+        self._reader: Optional[chess.polyglot.MemoryMappedReader] = None
+        self._reader_path: Optional[str] = None
+
+    def get_move(self, board: chess.Board, skill_level: Optional[int] = None) -> Optional[chess.Move]:
+        """Returns a randomly selected book move for the passed in position weighted
+           for the passed in skill level. Returns None if the position is out of book.
+        """
+        if board.uci_variant != "chess" or board.chess960:
+            return None
+
+        limits = book_skill_level_limits.get(skill_level, DEFAULT_BOOK_LIMITS)
+        if limits['max_ply'] is not None and board.ply() >= limits['max_ply']:
+            return None
+
+        reader = self._get_reader()
+        if not reader:
+            return None
+
+        try:
+            entries = list(reader.find_all(board))
+            if not entries:
+                return None
+
+            weights = [entry.weight ** limits['exponent'] for entry in entries]
+            return self.rng.choices(entries, weights=weights)[0].move
+        except Exception as e:
+            log.error(f"Error reading from the opening book: {e}")
+            return None
+
+    def close(self) -> None:
+        """Closes the opening book"""
+        if self._reader:
+            self._reader.close()
+            self._reader = None
+            self._reader_path = None
+
+    def _get_reader(self) -> Optional[chess.polyglot.MemoryMappedReader]:
+        """Returns the reader for the configured book, or None if no book is configured"""
+        path = self.path if self.path is not None else engine_config.get_value(engine_config.Keys.OPENING_BOOK)
+        path = os.path.expanduser(path) if path else None
+        if path != self._reader_path:
+            self.close()
+            self._reader_path = path
+            if path:
+                try:
+                    self._reader = chess.polyglot.open_reader(path)
+                    log.debug(f"Opened opening book: {path}")
+                except Exception as e:
+                    log.error(f"Error opening the opening book: {e}")
+        return self._reader
+
+
+opening_book = OpeningBook()
@@ -0,0 +1,144 @@
+from cli_chess.utils import log
+from cli_chess.utils.config import engine_config
+from collections import OrderedDict
+import chess.engine
+import chess.syzygy
+import chess
+import os
+from typing import Optional, Tuple
+
+# Centipawn score reported for tablebase wins (less the distance to zeroing)
+TABLEBASE_WIN_SCORE = 20000
+
+# The number of probe results to keep in the probe cache
+PROBE_CACHE_SIZE = 4096
+
+
+class Tablebase:
+    """Syzygy endgame tablebase support for standard chess. Tables are loaded
+       lazily from the configured directories (separated by the OS path separator).
+       Probe results are kept in an LRU cache as choosing a move probes every
+       reply, and neighbouring positions are probed repeatedly over a game.
+    """
+    def __init__(self, path: Optional[str] = None, cache_size: int = PROBE_CACHE_SIZE):
+        self.path = path
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._tablebase: Optional[chess.syzygy.Tablebase] = None
+        self._tablebase_path: Optional[str] = None
+        self._probe_cache: "OrderedDict[str, Optional[Tuple[int, int]]]" = OrderedDict()
+
+    def probe(self, board: chess.Board) -> Optional[Tuple[int, int]]:
+        """Returns the WDL and DTZ of the passed in position from the side to move's point
+           of view, or None if the position is not covered by the available tables
+        """
+        if board.uci_variant != "chess" or board.castling_rights or chess.popcount(board.occupied) > chess.syzygy.TBPIECES:
+            return None
+
+        tablebase = self._get_tablebase()
+        if not tablebase:
+            return None
+
+        key = board.epd()
+        if key in self._probe_cache:
+            self.hits += 1
+            self._probe_cache.move_to_end(key)
+            return self._probe_cache[key]
+
+        self.misses += 1
+        try:
+            result = (tablebase.probe_wdl(board), tablebase.probe_dtz(board))
+        except KeyError:
+            result = None
+
+        self._probe_cache[key] = result
+        if len(self._probe_cache) > self.cache_size:
+            self._probe_cache.popitem(last=False)
+        return result
+
+    def get_best_move(self, board: chess.Board) -> Optional[chess.Move]:
+        """Returns the move which keeps the best result for the side to move, or None if
+           the position is not covered by the available tables. Winning moves are chosen
+           to reach a zeroing move soonest, and losing moves are chosen to delay it.
+        """
+        if not self.probe(board):
+            return None
+
+        best_move, best_key = None, None
+        for move in board.legal_moves:
+            zeroing = board.is_zeroing(move)
+            board.push(move)
+            try:
+                if board.is_checkmate():
+                    return move
+                result = self.probe(board)
+            finally:
+                board.pop()
+
+            if result is None:
+                return None
+
+            # The probe result is from the opponents point of view
+            wdl, dtz = -result[0], abs(result[1])
+            key = (wdl, zeroing, -dtz) if wdl > 0 else (wdl, -zeroing, dtz)
+            if best_key is None or key > best_key:
+                best_move, best_key = move, key
+        return best_move
+
+    def get_info(self, board: chess.Board) -> Optional[chess.engine.InfoDict]:
+        """Returns an engine style info dictionary containing the score and best
+           move for the passed in position, or None if it is not covered
+        """
+        result = self.probe(board)
+        if not result:
+            return None
+
+        wdl, dtz = result
+        score = 0 if wdl in (-1, 0, 1) else (TABLEBASE_WIN_SCORE - abs(dtz)) * (1 if wdl > 0 else -1)
+        best_move = self.get_best_move(board)
+        return {
+            'score': chess.engine.PovScore(chess.engine.Cp(score), board.turn),
+            'depth': 0,
+            'pv': [best_move] if best_move else [],
+            'tbhits': 1,
+        }
+
+    def get_hit_rate(self) -> float:
+        """Returns the ratio of probes which were served from the probe cache"""
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def close(self) -> None:
+        """Closes the tablebase and clears the probe cache"""
+        if self._tablebase:
+            log.debug(f"Tablebase probe cache hit rate: {self.get_hit_rate():.1%} ({self.hits} hits, {self.misses} misses)")
+            self._tablebase.close()
+            self._tablebase = None
+        self._tablebase_path = None
+        self._probe_cache.clear()
+
+    def _get_tablebase(self) -> Optional[chess.syzygy.Tablebase]:
+        """Returns the tablebase for the configured directories, or None if no tables are available"""
+        path = self.path if self.path is not None else engine_config.get_value(engine_config.Keys.SYZYGY_PATH)
+        path = path if path else None
+        if path != self._tablebase_path:
+            self.close()
+            self._tablebase_path = path
+            if path:
+                tablebase = chess.syzygy.Tablebase()
+                for directory in path.split(os.pathsep):
+                    try:
+                        tablebase.add_directory(os.path.expanduser(directory.strip()))
+                    except OSError as e:
+                        log.error(f"Error opening the tablebase directory: {e}")
+
+                if tablebase.wdl:
+                    log.debug(f"Opened {len(tablebase.wdl)} Syzygy tables")
+                    self._tablebase = tablebase
+                else:
+                    log.error(f"No Syzygy tables were found in: {path}")
+        return self._tablebase
+
+
+tablebase = Tablebase()
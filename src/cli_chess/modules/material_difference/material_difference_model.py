@@ -1,5 +1,5 @@
-from cli_chess.modules.board import BoardModel
-from cli_chess.utils import EventManager
+from cli_chess.modules.board import BoardModel, BOARD_POSITION_TOPICS
+from cli_chess.utils import EventManager, EventTopics
 from typing import Dict
 from chess import PIECE_SYMBOLS, PIECE_TYPES, PieceType, Color, COLORS, WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
 import re
@@ -17,7 +17,8 @@ PIECE_VALUE: Dict[PieceType, int] = {
 class MaterialDifferenceModel:
     def __init__(self, board_model: BoardModel):
         self.board_model = board_model
-        self.board_model.e_board_model_updated.add_listener(self.update)
+        self.board_model.e_board_model_updated.add_listener(self.update, topics=BOARD_POSITION_TOPICS)
+        self.board_model.e_board_model_updated.add_listener(self._board_orientation_changed, topics=[EventTopics.BOARD_ORIENTATION_CHANGED])
 
         self.material_difference: Dict[Color, Dict[PieceType, int]] = self.default_material_difference()
         self.score: Dict[Color, int] = self.default_score()
@@ -125,6 +126,12 @@ class MaterialDifferenceModel:
         """Returns the orientation of the board"""
         return self.board_model.get_board_orientation()
 
+    def _board_orientation_changed(self, *args, **kwargs) -> None:  # noqa
+        """Notifies listeners so the material difference is redisplayed for the new
+           orientation. The material difference itself is unchanged, so is not recalculated.
+        """
+        self._notify_material_difference_model_updated()
+
     def _notify_material_difference_model_updated(self) -> None:
         """Notifies listeners of material difference model updates"""
         self.e_material_difference_model_updated.notify()
@@ -9,6 +9,9 @@ if TYPE_CHECKING:
 
 
 class MaterialDifferencePresenter:
+    # The game configuration keys which affect the material difference display
+    config_keys = (game_config.Keys.SHOW_MATERIAL_DIFF_IN_UNICODE, game_config.Keys.PAD_UNICODE)
+
     def __init__(self, model: MaterialDifferenceModel):
         self.model = model
         self.show_diff = self.model.board_model.get_variant_name() != "horde"
@@ -19,9 +22,9 @@ class MaterialDifferencePresenter:
         self.view_lower = MaterialDifferenceView(self, self.format_diff_output(orientation), self.show_diff)
 
         self.model.e_material_difference_model_updated.add_listener(self.update)
-        game_config.e_game_config_updated.add_listener(self.update)
+        game_config.e_game_config_updated.add_listener(self.update, topics=self.config_keys, weak=True)
 
-    def update(self) -> None:
+    def update(self, *args) -> None: # noqa
         """Updates the material differences for both sides"""
         orientation = self.model.get_board_orientation()
         self.view_upper.update(self.format_diff_output(not orientation))
@@ -31,8 +34,9 @@ class MaterialDifferencePresenter:
         """Returns the formatted difference of the color passed in as a string"""
         output = ""
         material_difference = self.model.get_material_difference(color)
-        use_unicode = game_config.get_boolean(game_config.Keys.SHOW_MATERIAL_DIFF_IN_UNICODE)
-        pad_unicode = game_config.get_boolean(game_config.Keys.PAD_UNICODE)
+        config_values = game_config.snapshot
+        use_unicode = config_values.show_material_diff_in_unicode
+        pad_unicode = config_values.pad_unicode
 
         if self.is_crazyhouse:
             return self._get_crazyhouse_pocket_output(color, use_unicode, pad_unicode)
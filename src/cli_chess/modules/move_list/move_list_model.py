@@ -1,4 +1,4 @@
-from cli_chess.modules.board import BoardModel
+from cli_chess.modules.board import BoardModel, BOARD_POSITION_TOPICS
 from cli_chess.utils import EventManager, log
 from chess import piece_symbol
 from typing import List
@@ -7,7 +7,7 @@ from typing import List
 class MoveListModel:
     def __init__(self, board_model: BoardModel) -> None:
         self.board_model = board_model
-        self.board_model.e_board_model_updated.add_listener(self.update)
+        self.board_model.e_board_model_updated.add_listener(self.update, topics=BOARD_POSITION_TOPICS)
         self.move_list_data = []
 
         self._event_manager = EventManager()
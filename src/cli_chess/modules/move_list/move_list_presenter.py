@@ -9,14 +9,17 @@ if TYPE_CHECKING:
 
 
 class MoveListPresenter:
+    # The game configuration keys which affect the move list display
+    config_keys = (game_config.Keys.SHOW_MOVE_LIST_IN_UNICODE, game_config.Keys.PAD_UNICODE)
+
     def __init__(self, model: MoveListModel):
         self.model = model
         self.view = MoveListView(self)
 
         self.model.e_move_list_model_updated.add_listener(self.update)
-        game_config.e_game_config_updated.add_listener(self.update)
+        game_config.e_game_config_updated.add_listener(self.update, topics=self.config_keys, weak=True)
 
-    def update(self) -> None:
+    def update(self, *args) -> None: # noqa
         """Update the move list output"""
         self.view.update(self.get_formatted_move_list())
 
@@ -24,8 +27,9 @@ class MoveListPresenter:
         """Returns a list containing the formatted moves"""
         formatted_move_list = []
         move_list_data = self.model.get_move_list_data()
-        use_unicode = game_config.get_boolean(game_config.Keys.SHOW_MOVE_LIST_IN_UNICODE)
-        pad_unicode = game_config.get_boolean(game_config.Keys.PAD_UNICODE)
+        config_values = game_config.snapshot
+        use_unicode = config_values.show_move_list_in_unicode
+        pad_unicode = config_values.pad_unicode
 
         for entry in move_list_data:
             move = self.get_move_as_unicode(entry, pad_unicode) if use_unicode else (entry['move'])
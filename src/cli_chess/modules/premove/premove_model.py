@@ -6,16 +6,15 @@ from chess import Move, InvalidMoveError, IllegalMoveError, AmbiguousMoveError
 class PremoveModel:
     def __init__(self, board_model: BoardModel) -> None:
         self.board_model = board_model
-        self.board_model.e_board_model_updated.add_listener(self.update)
+        self.board_model.e_board_model_updated.add_listener(self.update, topics=[EventTopics.GAME_END])
         self.premove = ""
 
         self._event_manager = EventManager()
         self.e_premove_model_updated = self._event_manager.create_event()
 
     def update(self, *args, **kwargs) -> None: # noqa
-        """Updates the premove model based on board updates"""
-        if EventTopics.GAME_END in args:
-            self.clear_premove()
+        """Clears the premove when the game ends"""
+        self.clear_premove()
 
     def pop_premove(self) -> str:
         """Returns the set premove, but also clears it after"""
@@ -1,7 +1,5 @@
 from cli_chess.utils.config import lichess_config
 from cli_chess.utils import Event, log, threaded
-from berserk import Client, TokenSession
-import berserk.exceptions
 
 linked_token_scopes = set()
 
@@ -32,7 +30,8 @@ class TokenManagerModel:
         except Exception as e:
             # Rather than the token being invalid, this means there was a
             # connection problem. Ignore so the existing token is not overridden.
-            if not isinstance(e, berserk.exceptions.ApiError):
+            from berserk.exceptions import ApiError
+            if not isinstance(e, ApiError):
                 log.error(f"Unexpected exception caught: {e}")
 
     def update_linked_account(self, api_token: str) -> bool:
@@ -58,6 +57,8 @@ class TokenManagerModel:
            Returns the scopes and userId associated to the passed in token.
         """
         if api_token:
+            # berserk is only imported once there is a token to validate
+            from berserk import Client, TokenSession
             session = TokenSession(api_token)
             oauth_client = Client(session, base_url=self.base_url).oauth
             try:
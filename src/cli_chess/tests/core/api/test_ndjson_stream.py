@@ -0,0 +1,35 @@
+from cli_chess.core.api.ndjson_stream import iter_ndjson, NdjsonStreamHandler
+from unittest.mock import Mock
+import json
+
+
+def test_iter_ndjson():
+    # Test events split across chunks are reassembled
+    events = [{'t': "featured", 'd': {'id': "abc123", 'fen': "8/8/8/8/8/8/8/8"}},
+              {'t': "fen", 'd': {'fen': "8/8/8/8/8/8/8/8", 'lm': "e2e4", 'wc': 60, 'bc': 59}}]
+    raw = b"".join(json.dumps(e).encode() + b"\n" for e in events)
+    chunks = [raw[i:i+7] for i in range(0, len(raw), 7)]
+    assert list(iter_ndjson(chunks)) == events
+
+    # Test keep-alive lines and whitespace are skipped
+    assert list(iter_ndjson([b"\n", b"\r\n  \n", b'{"type": "gameStart"}\r\n', b"\n\n"])) == [{'type': "gameStart"}]
+    assert list(iter_ndjson([b"", b"\n"])) == []
+
+    # Test a trailing event without a newline is still parsed
+    assert list(iter_ndjson([b'{"a": 1}\n{"b": ', b'2}'])) == [{'a': 1}, {'b': 2}]
+
+    # Test multibyte characters split across chunks
+    raw = json.dumps({'name': "Jérôme ♞"}, ensure_ascii=False).encode() + b"\n"
+    assert list(iter_ndjson([raw[:12], raw[12:]])) == [{'name': "Jérôme ♞"}]
+
+
+def test_ndjson_stream_handler():
+    handler = NdjsonStreamHandler(chunk_size=4)
+    assert handler.headers == {'Accept': "application/x-ndjson"}
+
+    response = Mock()
+    response.iter_content = lambda chunk_size: [b'{"t": "fen"}\n', b"\n", b'{"t": "featured"}\n']
+    assert list(handler.parse_stream(response)) == [{'t': "fen"}, {'t': "featured"}]
+
+    response.content = b'{"a": 1}\n\n{"b": 2}\n'
+    assert handler.parse(response) == [{'a': 1}, {'b': 2}]
@@ -0,0 +1,170 @@
+from cli_chess.core.batch_analysis import BatchAnalyzer
+from cli_chess.core.batch_analysis.batch_analyzer import win_percent, move_accuracy, get_judgement
+from cli_chess.modules.engine import EvalCache
+from unittest.mock import AsyncMock, Mock
+import chess.engine
+import chess
+import asyncio
+import json
+import pytest
+
+PGN = """[Event "Game 1"]
+[Result "1-0"]
+
+1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0
+
+[Event "Game 2"]
+[Result "*"]
+
+1. d4 d5 *
+"""
+
+
+@pytest.fixture
+def eval_cache(tmp_path, monkeypatch):
+    eval_cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=1000)
+    monkeypatch.setattr('cli_chess.core.batch_analysis.batch_analyzer.eval_cache', eval_cache)
+    yield eval_cache
+    eval_cache.close()
+
+
+@pytest.fixture
+def pgn_file(tmp_path):
+    pgn_file = tmp_path / "games.pgn"
+    pgn_file.write_text(PGN)
+    return pgn_file
+
+
+def mock_engine():
+    """Returns a mocked engine which scores every position as +0.20 for white (or +20.00 after Nf6)"""
+    async def analyse(board: chess.Board, limit):
+        await asyncio.sleep(0)
+        cp = 2000 if board.piece_at(chess.F6) == chess.Piece(chess.KNIGHT, chess.BLACK) else 20
+        return {'score': chess.engine.PovScore(chess.engine.Cp(cp), chess.WHITE), 'depth': limit.depth,
+                'pv': [next(iter(board.legal_moves))]}
+
+    engine = Mock()
+    engine.analyse = AsyncMock(side_effect=analyse)
+    engine.quit = AsyncMock()
+    return engine
+
+
+def create_analyzer(pgn_file, tmp_path, monkeypatch, workers=2):
+    engines = []
+
+    async def start_engine():
+        engines.append(mock_engine())
+        return engines[-1]
+
+    analyzer = BatchAnalyzer(str(pgn_file), str(tmp_path / "games.ndjson"), chess.engine.Limit(depth=10), workers=workers)
+    monkeypatch.setattr(analyzer, "_start_engine", start_engine)
+    monkeypatch.setattr('cli_chess.core.batch_analysis.batch_analyzer.engine_binary_selector', Mock(bench=AsyncMock()))
+    return analyzer, engines
+
+
+def read_output(tmp_path):
+    return [json.loads(line) for line in (tmp_path / "games.ndjson").read_text().splitlines()]
+
+
+def test_win_percent_and_accuracy():
+    assert win_percent(chess.engine.PovScore(chess.engine.Cp(0), chess.WHITE), chess.WHITE) == pytest.approx(50)
+    assert win_percent(chess.engine.PovScore(chess.engine.Mate(1), chess.WHITE), chess.BLACK) == pytest.approx(0)
+    assert move_accuracy(60, 60) == pytest.approx(100, abs=0.01)
+    assert move_accuracy(60, 70) == pytest.approx(100, abs=0.01)
+    assert move_accuracy(90, 10) < 5
+
+    assert get_judgement(60, 56) is None
+    assert get_judgement(60, 70) is None
+
+    # Test each judgement starts at its win percentage drop (winning chances drops of 0.1, 0.2, and 0.3)
+    assert get_judgement(60, 55.01) is None
+    assert get_judgement(60, 55) == "inaccuracy"
+    assert get_judgement(60, 50.01) == "inaccuracy"
+    assert get_judgement(60, 50) == "mistake"
+    assert get_judgement(60, 45.01) == "mistake"
+    assert get_judgement(60, 45) == "blunder"
+    assert get_judgement(60, 30) == "blunder"
+
+
+def test_run(pgn_file, tmp_path, monkeypatch, eval_cache):
+    analyzer, engines = create_analyzer(pgn_file, tmp_path, monkeypatch)
+    asyncio.run(analyzer.run())
+
+    games = sorted(read_output(tmp_path), key=lambda game: game['game'])
+    assert [game['game'] for game in games] == [0, 1]
+    assert games[0]['headers']['Event'] == "Game 1"
+    assert [move['move'] for move in games[0]['moves']] == ["e4", "e5", "Qh5", "Nc6", "Bc4", "Nf6", "Qxf7#"]
+
+    # Nf6 allows mate, and the final position is scored without the engine
+    assert games[0]['moves'][5]['judgement'] == "blunder"
+    assert games[0]['moves'][6]['eval'] == {'mate': 0}
+    assert games[0]['moves'][0]['judgement'] is None
+    assert games[0]['accuracy']['black'] < games[0]['accuracy']['white']
+
+    # Non terminal positions are analysed across the engines (the second games start position is cached)
+    assert sum(engine.analyse.await_count for engine in engines) == 7 + 2
+    assert all(engine.analyse.await_count for engine in engines)
+    assert all(engine.quit.await_count == 1 for engine in engines)
+    assert analyzer.positions_analyzed == 8 + 3
+    assert analyzer.games_analyzed == 2
+
+
+def test_run_uses_eval_cache(pgn_file, tmp_path, monkeypatch, eval_cache):
+    analyzer, _ = create_analyzer(pgn_file, tmp_path, monkeypatch)
+    asyncio.run(analyzer.run())
+
+    (tmp_path / "games.ndjson").unlink()
+    analyzer, engines = create_analyzer(pgn_file, tmp_path, monkeypatch)
+    asyncio.run(analyzer.run())
+    assert sum(engine.analyse.await_count for engine in engines) == 0
+    assert len(read_output(tmp_path)) == 2
+
+
+def test_run_resumes(pgn_file, tmp_path, monkeypatch, eval_cache):
+    # A completed game and a partially written line from an interrupted run
+    (tmp_path / "games.ndjson").write_text(json.dumps({'game': 0, 'moves': []}) + "\n" + '{"game": 1, "mo')
+    analyzer, engines = create_analyzer(pgn_file, tmp_path, monkeypatch)
+    asyncio.run(analyzer.run())
+
+    games = read_output(tmp_path)
+    assert [game['game'] for game in games] == [0, 1]
+    assert games[1]['headers']['Event'] == "Game 2"
+    assert sum(engine.analyse.await_count for engine in engines) == 3
+    assert analyzer.games_analyzed == 1
+
+
+def test_run_resumes_past_invalid_lines(pgn_file, tmp_path, monkeypatch, eval_cache):
+    # An invalid line before a completed game, and a partially written last line
+    completed_game = json.dumps({'game': 1, 'moves': []}) + "\n"
+    (tmp_path / "games.ndjson").write_text("not json\n" + completed_game + '{"game": 0, "mo')
+    analyzer, engines = create_analyzer(pgn_file, tmp_path, monkeypatch)
+    asyncio.run(analyzer.run())
+
+    # Test only the partial last line is removed, and results after the invalid line are kept
+    output = (tmp_path / "games.ndjson").read_text().splitlines(keepends=True)
+    assert output[:2] == ["not json\n", completed_game]
+    assert [json.loads(line)['game'] for line in output[2:]] == [0]
+    assert sum(engine.analyse.await_count for engine in engines) == 7
+    assert analyzer.games_analyzed == 1
+
+
+def test_run_restarts_terminated_engine(pgn_file, tmp_path, monkeypatch, eval_cache):
+    analyzer, engines = create_analyzer(pgn_file, tmp_path, monkeypatch, workers=1)
+
+    original_start_engine = analyzer._start_engine
+
+    async def start_engine():
+        engine = await original_start_engine()
+        if len(engines) == 1:
+            engine.analyse.side_effect = chess.engine.EngineTerminatedError("engine process died unexpectedly")
+        return engine
+
+    monkeypatch.setattr(analyzer, "_start_engine", start_engine)
+    monkeypatch.setattr('cli_chess.core.batch_analysis.batch_analyzer.engine_binary_selector', Mock(bench=AsyncMock()))
+    asyncio.run(analyzer.run())
+
+    games = sorted(read_output(tmp_path), key=lambda game: game['game'])
+    assert len(engines) == 2
+    assert "eval" not in games[0]['moves'][0]
+    assert "eval" in games[0]['moves'][1]
+    assert all(engine.quit.await_count == 1 for engine in engines)
@@ -0,0 +1,62 @@
+from cli_chess.core.game import GameModelBase
+from cli_chess.modules.board import BoardPresenter
+from cli_chess.modules.move_list import MoveListPresenter
+from cli_chess.modules.material_difference import MaterialDifferencePresenter
+from cli_chess.utils.config import game_config
+from prompt_toolkit.application import DummyApplication
+from prompt_toolkit.application.current import set_app
+import tracemalloc
+import weakref
+import pytest
+import gc
+
+GAME_MOVES = ["e4", "e5", "Nf3", "Nc6", "Bb5", "a6", "Bxc6", "dxc6"]
+
+
+@pytest.fixture(autouse=True)
+def app():
+    # Views repaint the current app. Outside an app, prompt_toolkit creates a new dummy app on every call
+    with set_app(DummyApplication()):
+        yield
+
+
+def play_game() -> list:
+    """Plays a game with the presenters which subscribe to the global game config.
+       Returns weak references to the presenters once the game is cleaned up.
+    """
+    model = GameModelBase()
+    presenters = [BoardPresenter(model.board_model), MoveListPresenter(model.move_list_model),
+                  MaterialDifferencePresenter(model.material_diff_model)]
+    model.board_model.make_moves_from_list(GAME_MOVES)
+    model.cleanup()
+    return [weakref.ref(presenter) for presenter in presenters]
+
+
+def test_presenters_released_across_games():
+    listener_count = len(game_config.e_game_config_updated.listeners)
+
+    # Test finished games are not kept alive by the global game config
+    refs = [ref for _ in range(10) for ref in play_game()]
+    gc.collect()
+    assert all(ref() is None for ref in refs)
+    assert len(game_config.e_game_config_updated.listeners) == listener_count
+
+
+def test_memory_flat_across_games():
+    # Warm up caches (e.g. dispatch caches and interned strings) before measuring
+    for _ in range(10):
+        play_game()
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.take_snapshot()
+        for _ in range(50):
+            play_game()
+        gc.collect()
+        growth = sum(stat.size_diff for stat in tracemalloc.take_snapshot().compare_to(baseline, "filename"))
+    finally:
+        tracemalloc.stop()
+
+    # A leaked game holds its models, presenters, and prompt_toolkit controls (over 100KB each)
+    assert growth < 256 * 1024
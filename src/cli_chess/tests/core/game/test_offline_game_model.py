@@ -0,0 +1,62 @@
+from cli_chess.core.game.offline_game import OfflineGameModel
+from cli_chess.core.game.game_options import GameOption
+from cli_chess.utils import EventTopics
+from chess import WHITE, BLACK, Termination
+from unittest.mock import Mock
+import asyncio
+
+
+def create_model(time_control=(1, 2)) -> OfflineGameModel:
+    return OfflineGameModel({GameOption.COLOR: "white", GameOption.VARIANT: "standard", GameOption.COMPUTER_SKILL_LEVEL: 1,
+                             GameOption.TIME_CONTROL: time_control})
+
+
+def test_clock_increments():
+    model = create_model()
+    clocks = model.game_metadata.clocks
+
+    # Test the increment is added once a side completes their move
+    model.make_move("e4")
+    assert 60000 < clocks[WHITE].time <= 62000
+    assert clocks[BLACK].ticking and not clocks[WHITE].ticking
+
+    # Test taking back the move does not add the increment for the side whose clock was running
+    model.propose_takeback()
+    assert clocks[BLACK].time <= 60000
+    assert clocks[WHITE].ticking and not clocks[BLACK].ticking
+    model.cleanup()
+
+
+def test_flag_timer():
+    async def run():
+        model = create_model()
+        game_end = Mock()
+        model.board_model.e_board_model_updated.add_listener(game_end, topics=[EventTopics.GAME_END])
+
+        # Test the side to move is flagged once their time runs out, without moving
+        model.game_metadata.clocks[WHITE].time = 20
+        model._schedule_flag_timer()
+        await asyncio.sleep(0.1)
+        assert not model.game_in_progress
+        assert model.board_model.get_game_over_result().termination == "outoftime"
+        assert model.game_metadata.game_status.winner == "black"
+        assert model.game_metadata.clocks[WHITE].time == 0
+        game_end.assert_called_once()
+        model.cleanup()
+    asyncio.run(run())
+
+
+def test_flagging_move_ending_game():
+    model = create_model()
+    game_end = Mock()
+    model.board_model.e_board_model_updated.add_listener(game_end, topics=[EventTopics.GAME_END])
+    for move in ("f3", "e5", "g4"):
+        model.board_model.make_move(move)
+
+    # Test a move which ends the game is not also flagged
+    model.game_metadata.clocks[BLACK].time = 0
+    model.board_model.make_move("Qh4")
+    assert model.board_model.is_game_over()
+    assert model.board_model.get_game_over_result().termination == Termination.CHECKMATE
+    game_end.assert_called_once()
+    model.cleanup()
@@ -0,0 +1,146 @@
+from cli_chess.core.tournament import Tournament, TournamentPlayer, TournamentGame, parse_time_control, fit_ratings
+from cli_chess.modules.engine import EvalCache, OpeningBook, Tablebase
+from unittest.mock import AsyncMock, Mock
+import chess.engine
+import chess.pgn
+import chess
+import asyncio
+import importlib
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def engine_model(monkeypatch):
+    """Mocks the opening book, tablebases, and evaluation cache, which calibration games must not use"""
+    engine_model = Mock(opening_book=Mock(spec=OpeningBook), tablebase=Mock(spec=Tablebase), eval_cache=Mock(spec=EvalCache))
+    for name in ("opening_book", "tablebase", "eval_cache"):
+        monkeypatch.setattr(f'cli_chess.modules.engine.engine_model.{name}', getattr(engine_model, name))
+    return engine_model
+
+
+@pytest.fixture
+def engine_pool(monkeypatch):
+    """Mocks the tournaments engine pool with engines which play the first legal move (Fool's mate for black)"""
+    async def play(board: chess.Board, limit, **kwargs):
+        await asyncio.sleep(0)
+        for move in ("g2g4", "e7e5", "f2f3", "d8h4"):
+            if board.is_legal(chess.Move.from_uci(move)):
+                return chess.engine.PlayResult(chess.Move.from_uci(move), None)
+        return chess.engine.PlayResult(next(iter(board.legal_moves)), None)
+
+    def create_engine(*args):
+        engine = Mock()
+        engine.play = AsyncMock(side_effect=play)
+        engine_pool.engines.append(engine)
+        return engine
+
+    engine_pool = Mock()
+    engine_pool.engines = []
+    engine_pool.new_game_id.return_value = 1
+    engine_pool.get_active_count.return_value = 0
+    engine_pool.checkout = AsyncMock(side_effect=create_engine)
+    engine_pool.checkin = AsyncMock()
+    engine_pool.shutdown = AsyncMock()
+    engine_pool.create = Mock(return_value=engine_pool)
+    monkeypatch.setattr('cli_chess.core.tournament.tournament.EnginePool', engine_pool.create)
+    return engine_pool
+
+
+def create_game(white: TournamentPlayer, black: TournamentPlayer, result: str) -> TournamentGame:
+    return TournamentGame(round=1, white=white, black=black, result=result, termination="checkmate", pgn=chess.pgn.Game())
+
+
+def test_player_from_spec():
+    assert TournamentPlayer.from_spec("level:3") == TournamentPlayer("Level 3", skill_level=3)
+    assert TournamentPlayer.from_spec("8") == TournamentPlayer("Level 8", skill_level=8)
+    assert TournamentPlayer.from_spec("Elo:1500") == TournamentPlayer("Elo 1500", elo=1500)
+    for spec in ("level:9", "level:x", "rating:1500"):
+        with pytest.raises(ValueError):
+            TournamentPlayer.from_spec(spec)
+
+
+def test_parse_time_control():
+    assert parse_time_control("3+2") == (3, 2)
+    assert parse_time_control("5") == (5, 0)
+    assert parse_time_control("none") is None
+    assert parse_time_control("") is None
+    with pytest.raises(ValueError):
+        parse_time_control("fast")
+
+
+def test_fit_ratings():
+    strong, weak, anchor = TournamentPlayer("Strong"), TournamentPlayer("Weak"), TournamentPlayer("Anchor", elo=1500)
+
+    # Even scores give equal ratings
+    ratings = fit_ratings([strong, weak], [create_game(strong, weak, "1-0"), create_game(weak, strong, "1-0")])
+    assert ratings == pytest.approx({"Strong": 0, "Weak": 0}, abs=0.01)
+
+    # A 3/4 score is roughly a 190 Elo difference, shrunk by the prior draws
+    games = [create_game(strong, weak, "1-0"), create_game(weak, strong, "0-1"), create_game(strong, weak, "1/2-1/2"),
+             create_game(weak, strong, "1/2-1/2")]
+    ratings = fit_ratings([strong, weak], games)
+    assert ratings["Strong"] == 0
+    assert -191 < ratings["Weak"] < -100
+
+    # Winning every game still gives finite ratings, anchored to the passed in rating
+    ratings = fit_ratings([strong, anchor], [create_game(strong, anchor, "1-0")] * 4, anchor, 1500)
+    assert ratings["Anchor"] == pytest.approx(1500)
+    assert 1700 < ratings["Strong"] < 2000
+
+
+def test_get_schedule():
+    players = [TournamentPlayer.from_spec(spec) for spec in ("level:1", "level:2", "elo:1500")]
+    tournament = Tournament(players, games_per_pair=4, opening_plies=2, seed=1)
+    schedule = tournament.get_schedule()
+
+    assert len(schedule) == 3 * 4
+    assert [game[0] for game in schedule] == list(range(1, 13))
+    first, second = schedule[0], schedule[1]
+    assert (first[1], first[2]) == (second[2], second[1])
+    assert first[3] == second[3] and len(first[3]) == 2
+
+    with pytest.raises(ValueError):
+        Tournament(players[:1])
+    with pytest.raises(ValueError):
+        Tournament([players[0], players[0]])
+
+
+def test_run(engine_pool, engine_model, tmp_path, monkeypatch):
+    monkeypatch.setattr(importlib.import_module('cli_chess.modules.engine.engine_model').engine_config, 'get_boolean', Mock(return_value=True))
+    players = [TournamentPlayer.from_spec("level:1"), TournamentPlayer.from_spec("elo:1500")]
+    pgn_path = tmp_path / "tournament.pgn"
+    tournament = Tournament(players, games_per_pair=2, time_control=(1, 0), concurrency=2, pgn_path=str(pgn_path))
+    games = asyncio.run(tournament.run())
+
+    # Black mates with Fool's mate in both games
+    assert len(games) == 2
+    assert all(game.result == "0-1" and game.termination == "checkmate" and game.moves == 4 for game in games)
+    assert all(len(game.move_times[chess.WHITE]) == 2 for game in games)
+    assert engine_pool.checkout.await_count == engine_pool.checkin.await_count == 4
+
+    # Test the tournament plays with its own engine pool, which is shut down once finished
+    engine_pool.create.assert_called_once_with(max_idle=4)
+    engine_pool.shutdown.assert_awaited_once()
+
+    # Only the engines own search is used
+    assert engine_model.mock_calls == []
+    assert all(call.kwargs['ponder'] is False for engine in engine_pool.engines for call in engine.play.await_args_list)
+
+    with open(pgn_path) as pgn:
+        recorded = [chess.pgn.read_game(pgn) for _ in range(2)]
+    assert {game.headers["White"] for game in recorded} == {"Level 1", "Elo 1500"}
+    assert all(game.headers["Result"] == "0-1" and game.headers["TimeControl"] == "60+0" for game in recorded)
+    assert recorded[0].end().board().is_checkmate()
+    assert all(node.comment.startswith("[%emt ") for node in recorded[0].mainline())
+
+    standings = tournament.get_standings()
+    assert [(standing.games, standing.wins, standing.losses) for standing in standings] == [(2, 1, 1), (2, 1, 1)]
+    assert next(standing for standing in standings if standing.player.elo).rating == pytest.approx(1500)
+    assert "Level 1" in tournament.get_standings_table()
+
+
+def test_run_counts_errors(engine_pool):
+    engine_pool.checkout.side_effect = OSError("engine not found")
+    tournament = Tournament([TournamentPlayer.from_spec("level:1"), TournamentPlayer.from_spec("level:2")])
+    assert asyncio.run(tournament.run()) == []
+    assert tournament.errors == 2
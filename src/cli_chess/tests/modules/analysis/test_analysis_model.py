@@ -0,0 +1,159 @@
+from cli_chess.modules.analysis import AnalysisModel
+from cli_chess.modules.board import BoardModel
+from cli_chess.modules.engine import EvalCache, Tablebase
+from cli_chess.utils.config import EngineConfig
+from os import remove
+from unittest.mock import AsyncMock, Mock
+import chess.engine
+import asyncio
+import pytest
+
+
+class MockAnalysis:
+    """Mocks a python-chess analysis which streams the passed in info lines"""
+    def __init__(self, infos: list):
+        self.infos = infos
+        self.stop = Mock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def __aiter__(self):
+        return self._stream()
+
+    async def _stream(self):
+        for info in self.infos:
+            yield info
+        await asyncio.Event().wait()
+
+
+def make_info(multipv: int, depth: int) -> dict:
+    return {'multipv': multipv, 'depth': depth, 'score': chess.engine.PovScore(chess.engine.Cp(depth), chess.WHITE),
+            'pv': [chess.Move.from_uci("e2e4")]}
+
+
+@pytest.fixture
+def engine_config(monkeypatch):
+    engine_config = EngineConfig("unit_test_config.ini")
+    monkeypatch.setattr('cli_chess.modules.analysis.analysis_model.engine_config', engine_config)
+    yield engine_config
+    remove(engine_config.full_filename)
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    engine = AsyncMock()
+    infos = [make_info(multipv, depth) for depth in range(1, 31) for multipv in range(1, 4)]
+    engine.analysis.side_effect = lambda *args, **kwargs: MockAnalysis(infos)
+    monkeypatch.setattr('cli_chess.modules.analysis.analysis_model.engine_pool.checkout', AsyncMock(return_value=engine))
+    monkeypatch.setattr('cli_chess.modules.analysis.analysis_model.engine_pool.checkin', AsyncMock())
+    return engine
+
+
+@pytest.fixture
+def eval_cache(tmp_path, monkeypatch):
+    eval_cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=1000)
+    monkeypatch.setattr('cli_chess.modules.analysis.analysis_model.eval_cache', eval_cache)
+    yield eval_cache
+    eval_cache.close()
+
+
+@pytest.fixture(autouse=True)
+def tablebase(monkeypatch):
+    tablebase = Tablebase("")
+    monkeypatch.setattr('cli_chess.modules.analysis.analysis_model.tablebase', tablebase)
+    return tablebase
+
+
+@pytest.fixture
+def model(engine_config: EngineConfig, eval_cache: EvalCache):
+    return AnalysisModel(BoardModel())
+
+
+def test_config(engine_config: EngineConfig):
+    engine_config.set_value(engine_config.Keys.ANALYSIS_LINES, "5")
+    engine_config.set_value(engine_config.Keys.ANALYSIS_UPDATES_PER_SECOND, "10")
+    model = AnalysisModel(BoardModel())
+    assert model.multipv == 5
+    assert model.update_interval == 0.1
+
+    # Test invalid values fall back to the defaults
+    engine_config.set_value(engine_config.Keys.ANALYSIS_LINES, "abc")
+    assert AnalysisModel(BoardModel()).multipv == engine_config.Keys.ANALYSIS_LINES.default_value
+
+
+def test_throttled_updates(model: AnalysisModel, engine: AsyncMock):
+    async def run():
+        listener = Mock()
+        model.e_analysis_model_updated.add_listener(listener)
+        model.update_interval = 0.05
+
+        await model.start_analysis()
+        await asyncio.sleep(0.2)
+        engine.analysis.assert_called_once_with(model.analysis_board, multipv=3, game=model.game_id)
+
+        # Test the streamed info lines are coalesced into the latest info per PV
+        assert [info['multipv'] for info in model.get_analysis_data()] == [1, 2, 3]
+        assert all(info['depth'] == 30 for info in model.get_analysis_data())
+        assert listener.call_count <= 3
+
+        await model.stop_analysis()
+        assert not model.get_analysis_data()
+    asyncio.run(run())
+
+
+def test_restart_on_position_change(model: AnalysisModel, engine: AsyncMock):
+    async def run():
+        await model.start_analysis()
+        await asyncio.sleep(0.01)
+        analysis = model._analysis_task
+
+        # Test changes which do not alter the position do not restart the analysis
+        model.board_model.set_board_orientation(chess.BLACK)
+        assert model._analysis_task is analysis
+
+        # Test the analysis is restarted (using the same engine) when the position changes
+        model.board_model.make_move("e4")
+        await asyncio.sleep(0.01)
+        assert analysis.cancelled()
+        assert engine.analysis.call_count == 2
+        assert model.analysis_board.fen() == model.board_model.board.fen()
+
+        # Test the analysis is not restarted when disabled
+        await model.stop_analysis()
+        model.board_model.make_move("e5")
+        assert engine.analysis.call_count == 2
+    asyncio.run(run())
+
+
+def test_eval_cache(model: AnalysisModel, engine: AsyncMock, eval_cache: EvalCache):
+    async def run():
+        await model.start_analysis()
+        await asyncio.sleep(0.1)
+
+        # Test the top line is saved to the cache when the position changes
+        model.board_model.make_move("e4")
+        assert eval_cache.get(chess.Board()).depth == 30
+
+        # Test the top line is seeded from the cache when returning to a cached position
+        model.board_model.takeback(chess.WHITE)
+        assert model.get_analysis_data()[0]['depth'] == 30
+        await model.stop_analysis()
+    asyncio.run(run())
+
+
+def test_tablebase(model: AnalysisModel, engine: AsyncMock, tablebase: Tablebase, monkeypatch):
+    async def run():
+        info = {'score': chess.engine.PovScore(chess.engine.Cp(19989), chess.WHITE), 'depth': 0, 'pv': [], 'tbhits': 1}
+        monkeypatch.setattr(tablebase, 'get_info', Mock(return_value=info))
+
+        # Test tablebase positions are looked up rather than analysed
+        await model.start_analysis()
+        assert model.get_analysis_data() == [info]
+        await asyncio.sleep(0.01)
+        engine.analysis.assert_not_called()
+        await model.stop_analysis()
+    asyncio.run(run())
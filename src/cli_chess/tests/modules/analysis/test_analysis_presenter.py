@@ -0,0 +1,40 @@
+from cli_chess.modules.analysis import AnalysisModel, AnalysisPresenter
+from cli_chess.modules.board import BoardModel
+from chess.engine import PovScore, Cp, Mate
+from chess import WHITE, BLACK, Move
+import pytest
+
+
+@pytest.fixture
+def presenter():
+    return AnalysisPresenter(AnalysisModel(BoardModel()))
+
+
+def test_format_score():
+    assert AnalysisPresenter.format_score(PovScore(Cp(35), WHITE)) == "+0.35"
+    assert AnalysisPresenter.format_score(PovScore(Cp(35), BLACK)) == "-0.35"
+    assert AnalysisPresenter.format_score(PovScore(Cp(0), WHITE)) == "+0.00"
+    assert AnalysisPresenter.format_score(PovScore(Mate(3), WHITE)) == "#3"
+    assert AnalysisPresenter.format_score(PovScore(Mate(3), BLACK)) == "#-3"
+
+
+def test_get_formatted_analysis(presenter: AnalysisPresenter):
+    assert presenter.get_formatted_analysis() == []
+
+    pv = [Move.from_uci(move) for move in ["e2e4", "e7e5", "g1f3", "b8c6", "f1b5", "a7a6", "b5a4", "g8f6", "e1g1"]]
+    presenter.model.analysis_data = [{'multipv': 1, 'depth': 18, 'score': PovScore(Cp(31), WHITE), 'pv': pv},
+                                     {}]
+    assert presenter.get_formatted_analysis() == [" +0.31  d18  1. e4 e5 2. Nf3 Nc6 3. Bb5 a6 4. Ba4 Nf6"]
+
+    # Test PVs which are illegal in the analysed position fall back to UCI notation
+    presenter.model.analysis_data[0]['pv'] = [Move.from_uci("e2e5")]
+    assert presenter.get_formatted_analysis() == [" +0.31  d18  e2e5"]
+
+
+def test_format_tablebase_result(presenter: AnalysisPresenter):
+    assert AnalysisPresenter.format_tablebase_result(PovScore(Cp(19989), WHITE)) == "1-0"
+    assert AnalysisPresenter.format_tablebase_result(PovScore(Cp(19989), BLACK)) == "0-1"
+    assert AnalysisPresenter.format_tablebase_result(PovScore(Cp(0), BLACK)) == "½-½"
+
+    presenter.model.analysis_data = [{'score': PovScore(Cp(19989), WHITE), 'depth': 0, 'pv': [Move.from_uci("e2e4")], 'tbhits': 1}]
+    assert presenter.get_formatted_analysis() == ["   1-0   TB  1. e4"]
@@ -1,4 +1,5 @@
 from cli_chess.modules.board import BoardModel
+from cli_chess.utils import EventTopics
 from unittest.mock import Mock
 import pytest
 import chess
@@ -380,6 +381,19 @@ def test_handle_resignation(model: BoardModel):
     assert model.get_game_over_result() == chess.Outcome("resignation", chess.WHITE)  # noqa
 
 
+def test_handle_timeout(model: BoardModel, board_updated_listener: Mock):
+    # Test white running out of time
+    model.handle_timeout(chess.WHITE)
+    assert model.get_game_over_result() == chess.Outcome("outoftime", chess.BLACK)  # noqa
+    assert model.is_game_over()
+    board_updated_listener.assert_called_with(EventTopics.GAME_END)
+
+    # Test black running out of time
+    model.reset()
+    model.handle_timeout(chess.BLACK)
+    assert model.get_game_over_result() == chess.Outcome("outoftime", chess.WHITE)  # noqa
+
+
 def test_cleanup(model: BoardModel, board_updated_listener: Mock):
     assert len(model.e_board_model_updated.listeners) > 0
     model.cleanup()
@@ -43,27 +43,27 @@ def test_update_cached_config_values(model: BoardModel, presenter: BoardPresente
     assert presenter._update_cached_config_values in game_config.e_game_config_updated.listeners
 
     # Test initial assignment
-    assert presenter.game_config_values == game_config.get_all_values()
+    assert presenter.game_config_values == game_config.snapshot
 
     # Test game_config listener notification is working
     # (manual calls to _update_cached_config_values shouldn't be required)
     game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "yes")
     game_config.set_value(game_config.Keys.USE_UNICODE_PIECES, "no")
-    assert presenter.game_config_values == game_config.get_all_values()
-    assert presenter.game_config_values[game_config.Keys.BLINDFOLD_CHESS]
-    assert not presenter.game_config_values[game_config.Keys.USE_UNICODE_PIECES]
+    assert presenter.game_config_values == game_config.snapshot
+    assert presenter.game_config_values.blindfold_chess
+    assert not presenter.game_config_values.use_unicode_pieces
 
     # Remove game config notification listener and verify updates don't come through
     game_config.e_game_config_updated.remove_listener(presenter._update_cached_config_values)
-    assert presenter.game_config_values == game_config.get_all_values()
+    assert presenter.game_config_values == game_config.snapshot
     game_config.set_value(game_config.Keys.USE_UNICODE_PIECES, "yes")
-    assert presenter.game_config_values != game_config.get_all_values()
+    assert presenter.game_config_values != game_config.snapshot
 
     # With listener removed, manually call the function and verify it works by itself
     game_config.set_value(game_config.Keys.BLINDFOLD_CHESS, "no")
-    assert presenter.game_config_values != game_config.get_all_values()
+    assert presenter.game_config_values != game_config.snapshot
     presenter._update_cached_config_values()
-    assert presenter.game_config_values == game_config.get_all_values()
+    assert presenter.game_config_values == game_config.snapshot
 
 
 def test_make_move(model: BoardModel, presenter: BoardPresenter):
@@ -0,0 +1,110 @@
+from cli_chess.modules.engine import EngineBinarySelector, get_cpu_flags
+from cli_chess.modules.engine.engine_binaries import get_platform_suffix
+import asyncio
+import json
+import os
+import pytest
+
+
+@pytest.fixture
+def binaries_dir(tmp_path):
+    binaries_dir = tmp_path / "binaries"
+    binaries_dir.mkdir()
+    return binaries_dir
+
+
+@pytest.fixture(autouse=True)
+def configured_path(monkeypatch):
+    configured_path = {'value': ""}
+    monkeypatch.setattr(EngineBinarySelector, "_get_configured_path", staticmethod(lambda: configured_path['value']))
+    return configured_path
+
+
+def create_binary(directory, arch: str, nps: int = 1000, exit_code: int = 0) -> str:
+    """Creates a fake engine binary which prints the passed in NPS for `bench`"""
+    path = directory / f"fairy-stockfish_{arch}_{get_platform_suffix()}"
+    path.write_text(f"#!/bin/sh\necho 'Nodes/second    : {nps}'\nexit {exit_code}\n")
+    path.chmod(0o755)
+    return str(path)
+
+
+def create_selector(binaries_dir, tmp_path, cpu_flags) -> EngineBinarySelector:
+    return EngineBinarySelector(str(binaries_dir), str(tmp_path / "engine_bench.json"), cpu_flags)
+
+
+def test_get_cpu_flags(tmp_path):
+    cpuinfo = tmp_path / "cpuinfo"
+    cpuinfo.write_text("processor\t: 0\nmodel name\t: CPU\nflags\t\t: fpu sse2 popcnt avx2 bmi2\n\nprocessor\t: 1\n")
+    assert get_cpu_flags(str(cpuinfo)) == {"fpu", "sse2", "popcnt", "avx2", "bmi2"}
+    assert get_cpu_flags(str(tmp_path / "missing")) == set()
+
+
+def test_get_candidates(binaries_dir, tmp_path, configured_path):
+    generic = create_binary(binaries_dir, "x86-64")
+    bmi2 = create_binary(binaries_dir, "x86-64-bmi2")
+    create_binary(binaries_dir, "x86-64-avx512")
+
+    # Test builds are only used if the CPU supports them, fastest build first
+    assert create_selector(binaries_dir, tmp_path, {"popcnt", "avx2", "bmi2"}).get_candidates() == [bmi2, generic]
+    assert create_selector(binaries_dir, tmp_path, {"popcnt", "avx2"}).get_candidates() == [generic]
+
+    # Test only the generic build is used when the CPU flags are unknown
+    assert create_selector(binaries_dir, tmp_path, set()).get_candidates() == [generic]
+
+    # Test builds in the configured directory are preferred
+    user_dir = tmp_path / "user"
+    user_dir.mkdir()
+    user_bmi2 = create_binary(user_dir, "x86-64-bmi2")
+    configured_path['value'] = str(user_dir)
+    assert create_selector(binaries_dir, tmp_path, {"popcnt", "avx2", "bmi2"}).get_candidates() == [user_bmi2, bmi2, generic]
+
+
+def test_get_engine_path(binaries_dir, tmp_path, configured_path):
+    selector = create_selector(binaries_dir, tmp_path, {"popcnt", "avx2", "bmi2"})
+
+    # Test the generic build path is returned when no binaries are found
+    assert selector.get_engine_path() == os.path.join(str(binaries_dir), f"fairy-stockfish_x86-64_{get_platform_suffix()}")
+
+    generic = create_binary(binaries_dir, "x86-64")
+    bmi2 = create_binary(binaries_dir, "x86-64-bmi2")
+    selector = create_selector(binaries_dir, tmp_path, {"popcnt", "avx2", "bmi2"})
+    assert selector.get_engine_path() == bmi2
+
+    # Test a configured binary is used as-is
+    configured_path['value'] = generic
+    assert selector.get_engine_path() == generic
+
+
+def test_bench(binaries_dir, tmp_path):
+    async def run():
+        generic = create_binary(binaries_dir, "x86-64", nps=2000)
+        bmi2 = create_binary(binaries_dir, "x86-64-bmi2", nps=0, exit_code=1)
+        avx2 = create_binary(binaries_dir, "x86-64-avx2", nps=1500)
+        selector = create_selector(binaries_dir, tmp_path, {"popcnt", "avx2", "bmi2"})
+        assert selector.get_engine_path() == bmi2
+
+        # Test failing binaries are skipped and the fastest binary is selected
+        assert await selector.bench() == {bmi2: None, avx2: 1500, generic: 2000}
+        assert selector.get_engine_path() == generic
+        with open(tmp_path / "engine_bench.json") as results_file:
+            assert json.load(results_file)[generic]['nps'] == 2000
+
+        # Test binaries are only benchmarked again when they change
+        create_binary(binaries_dir, "x86-64", nps=3000)
+        os.utime(generic, (0, 0))
+        assert await selector.bench() == {bmi2: None, avx2: 1500, generic: 3000}
+        assert create_selector(binaries_dir, tmp_path, {"popcnt", "avx2", "bmi2"}).get_bench_results()[generic] == 3000
+    asyncio.run(run())
+
+
+def test_bench_single_candidate(binaries_dir, tmp_path):
+    async def run():
+        generic = create_binary(binaries_dir, "x86-64", nps=2000)
+        create_binary(binaries_dir, "x86-64-bmi2", nps=3000)
+
+        # Test nothing is benchmarked when the generic build is the only candidate
+        selector = create_selector(binaries_dir, tmp_path, set())
+        assert await selector.bench() == {}
+        assert not os.path.exists(tmp_path / "engine_bench.json")
+        assert selector.get_engine_path() == generic
+    asyncio.run(run())
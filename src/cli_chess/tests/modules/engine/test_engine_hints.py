@@ -0,0 +1,109 @@
+from cli_chess.modules.engine import EngineHints, EvalCache
+from unittest.mock import AsyncMock, Mock
+import chess.engine
+import chess
+import asyncio
+import pytest
+
+
+def mock_info(board: chess.Board, **kwargs) -> chess.engine.InfoDict:
+    """Returns a search result playing the first legal move"""
+    return {'score': chess.engine.PovScore(chess.engine.Cp(30), board.turn), 'depth': 12, 'pv': [next(iter(board.legal_moves))]}
+
+
+@pytest.fixture
+def engine():
+    async def analyse(board, *args, **kwargs):
+        await asyncio.sleep(0)
+        return mock_info(board)
+    engine = AsyncMock()
+    engine.analyse = AsyncMock(side_effect=analyse)
+    return engine
+
+
+@pytest.fixture
+def pool(monkeypatch, engine: AsyncMock):
+    pool = Mock(checkout=AsyncMock(return_value=engine), checkin=AsyncMock(), new_game_id=Mock(return_value=1))
+    monkeypatch.setattr('cli_chess.modules.engine.engine_hints.engine_pool', pool)
+    pool.engine_binary_selector = Mock(get_engine_path=Mock(return_value="engine_path"))
+    monkeypatch.setattr('cli_chess.modules.engine.engine_hints.engine_binary_selector', pool.engine_binary_selector)
+    return pool
+
+
+@pytest.fixture(autouse=True)
+def eval_cache(tmp_path, monkeypatch):
+    eval_cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=1000)
+    monkeypatch.setattr('cli_chess.modules.engine.engine_hints.eval_cache', eval_cache)
+    yield eval_cache
+    eval_cache.close()
+
+
+def test_get_hint(pool: Mock, engine: AsyncMock, eval_cache: EvalCache):
+    async def run():
+        hints = EngineHints()
+        board = chess.Board()
+        hint = await hints.get_hint(board)
+        assert hint.move == next(iter(board.legal_moves))
+        assert hint.san == board.san(hint.move)
+        assert hint.depth == 12
+        engine.analyse.assert_awaited_once()
+        pool.checkout.assert_awaited_once()
+
+        # Test repeat requests for the same position are served from the cache
+        assert await hints.get_hint(board.copy()) is hint
+        assert engine.analyse.await_count == 1
+
+        # Test results are written to the evaluation cache and reused by new instances
+        assert eval_cache.get(board, min_depth=12).best_move == hint.move
+        assert (await EngineHints().get_hint(board)).move == hint.move
+        assert engine.analyse.await_count == 1
+
+        # Test the engine is released on quit, under the binary it was checked out for
+        pool.engine_binary_selector.get_engine_path.return_value = "new_engine_path"
+        await hints.quit()
+        pool.checkin.assert_awaited_once_with("engine_path", engine)
+
+        # Test no hint is given once the game is over
+        with pytest.raises(Warning):
+            await hints.get_hint(chess.Board("7k/5QQ1/8/8/8/8/8/K7 b - - 0 1"))
+    asyncio.run(run())
+
+
+def test_get_threat(pool: Mock, engine: AsyncMock):
+    async def run():
+        hints = EngineHints()
+        board = chess.Board("rnbqkbnr/pppp1ppp/8/4p3/4P3/8/PPPP1PPP/RNBQKBNR w KQkq - 0 2")
+
+        # Test the threat is the opponents move from the position with the turn passed
+        threat = await hints.get_threat(board)
+        searched_board = engine.analyse.await_args.args[0]
+        assert searched_board.turn == chess.BLACK
+        assert searched_board.board_fen() == board.board_fen()
+        assert threat.san == searched_board.san(threat.move)
+
+        # Test threats are not searched while in check
+        with pytest.raises(Warning):
+            await hints.get_threat(chess.Board("rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3"))
+    asyncio.run(run())
+
+
+def test_concurrent_requests(pool: Mock, engine: AsyncMock):
+    async def run():
+        hints = EngineHints()
+
+        # Test concurrent requests for the same position share a single search
+        board = chess.Board()
+        first, second = await asyncio.gather(hints.get_hint(board), hints.get_hint(board))
+        assert first is second
+        assert engine.analyse.await_count == 1
+        pool.checkout.assert_awaited_once()
+
+        # Test a request for a different position supersedes the running search
+        board.push_san("e4")
+        superseded = asyncio.ensure_future(hints.get_hint(board))
+        await asyncio.sleep(0)
+        board.push_san("e5")
+        latest = await hints.get_hint(board)
+        assert await superseded is None
+        assert latest.move == next(iter(board.legal_moves))
+    asyncio.run(run())
@@ -0,0 +1,212 @@
+from cli_chess.modules.engine import EngineModel, EvalCache, OpeningBook, Tablebase
+from cli_chess.modules.board import BoardModel
+from cli_chess.core.game import GameMetadata
+from cli_chess.core.game.game_options import GameOption
+from chess import WHITE, BLACK
+from unittest.mock import AsyncMock, Mock
+import chess.engine
+import asyncio
+import pytest
+
+
+@pytest.fixture
+def game_metadata():
+    return GameMetadata()
+
+
+@pytest.fixture(autouse=True)
+def opening_book(monkeypatch):
+    opening_book = OpeningBook("")
+    monkeypatch.setattr('cli_chess.modules.engine.engine_model.opening_book', opening_book)
+    return opening_book
+
+
+@pytest.fixture(autouse=True)
+def tablebase(monkeypatch):
+    tablebase = Tablebase("")
+    monkeypatch.setattr('cli_chess.modules.engine.engine_model.tablebase', tablebase)
+    return tablebase
+
+
+@pytest.fixture
+def eval_cache(tmp_path, monkeypatch):
+    eval_cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=1000)
+    monkeypatch.setattr('cli_chess.modules.engine.engine_model.eval_cache', eval_cache)
+    yield eval_cache
+    eval_cache.close()
+
+
+def test_get_search_limit(game_metadata: GameMetadata):
+    # Test untimed skill level games are capped by the skill level limits
+    model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 1}, game_metadata)
+    assert model.get_search_limit() == chess.engine.Limit(depth=5, time=0.05)
+
+    model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 8}, game_metadata)
+    assert model.get_search_limit() == chess.engine.Limit(depth=22, time=1.0)
+
+    # Test untimed specified Elo games fall back to the default search time
+    model = EngineModel(BoardModel(), {GameOption.SPECIFY_ELO: True, GameOption.COMPUTER_ELO: 1500}, game_metadata)
+    assert model.get_search_limit() == chess.engine.Limit(time=2)
+
+    # Test timed games pass the clocks (in seconds) to the engine
+    for color in [WHITE, BLACK]:
+        game_metadata.clocks[color].time = 60000
+        game_metadata.clocks[color].increment = 1000
+    game_metadata.clocks[BLACK].time = 45500
+    assert model.get_search_limit() == chess.engine.Limit(white_clock=60, black_clock=45.5, white_inc=1, black_inc=1)
+
+    # Test timed skill level games are still capped by the skill level limits
+    model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 6}, game_metadata)
+    assert model.get_search_limit() == chess.engine.Limit(depth=8, time=0.4, white_clock=60, black_clock=45.5, white_inc=1, black_inc=1)
+
+    # Test an engine model without game metadata
+    model = EngineModel(BoardModel(), {GameOption.SPECIFY_ELO: True})
+    assert model.get_search_limit() == chess.engine.Limit(time=2)
+
+
+def test_engine_pool_checkin(game_metadata: GameMetadata, monkeypatch):
+    async def run():
+        engine_binary_selector = Mock(get_engine_path=Mock(return_value="engine_path"))
+        monkeypatch.setattr('cli_chess.modules.engine.engine_model.engine_binary_selector', engine_binary_selector)
+        pool = Mock(checkout=AsyncMock(return_value=AsyncMock()), checkin=AsyncMock(), get_active_count=Mock(return_value=0))
+        model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 3}, game_metadata, pool=pool)
+        await model.start_engine()
+        engine = model.engine
+
+        # Test the engine is checked in under the binary it was checked out for, even if the selection changed
+        engine_binary_selector.get_engine_path.return_value = "new_engine_path"
+        await model.quit_engine()
+        pool.checkin.assert_awaited_once_with("engine_path", engine)
+    asyncio.run(run())
+
+
+def test_cancel_search(game_metadata: GameMetadata, eval_cache: EvalCache):
+    async def run():
+        model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 8}, game_metadata)
+        search_started = asyncio.Event()
+
+        async def play(*args, **kwargs):
+            search_started.set()
+            await asyncio.Event().wait()
+
+        model.engine = AsyncMock()
+        model.engine.play.side_effect = play
+
+        # Test cancelling a running search stops the engine and returns an empty result
+        search = asyncio.ensure_future(model.get_best_move())
+        await search_started.wait()
+        model.cancel_search()
+        assert (await search).move is None
+
+        # Test a search which completed before being cancelled is discarded
+        model.engine.play.side_effect = None
+        model.engine.play.return_value = chess.engine.PlayResult(chess.Move.from_uci("e2e4"), None)
+        search = asyncio.ensure_future(model.get_best_move())
+        while not model._search or not model._search.done():
+            await asyncio.sleep(0)
+        model.cancel_search()
+        assert (await search).move is None
+
+        # Test searches which are not cancelled return the engines move
+        assert (await model.get_best_move()).move == chess.Move.from_uci("e2e4")
+    asyncio.run(run())
+
+
+def test_eval_cache(game_metadata: GameMetadata, eval_cache: EvalCache):
+    async def run():
+        move = chess.Move.from_uci("e2e4")
+        # Time limited searches stop short of the full strength depth cap (22)
+        info = {'score': chess.engine.PovScore(chess.engine.Cp(30), WHITE), 'depth': 18, 'pv': [move, chess.Move.from_uci("e7e5")]}
+        model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 8}, game_metadata)
+        model.engine = AsyncMock()
+        model.engine.play.return_value = chess.engine.PlayResult(move, None, info=info)
+
+        # Test full strength results are written to the cache, and reused without searching
+        assert (await model.get_best_move()).move == move
+        result = await model.get_best_move()
+        assert result.move == move
+        assert result.ponder == chess.Move.from_uci("e7e5")
+        assert model.engine.play.await_count == 1
+        assert eval_cache.hits == 1
+        assert model.get_min_cached_depth() == 18
+
+        # Test engines which have not searched yet reuse results stored by other engines
+        other_model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 8}, game_metadata)
+        other_model.engine = AsyncMock()
+        assert (await other_model.get_best_move()).move == move
+        other_model.engine.play.assert_not_awaited()
+        assert eval_cache.hits == 2
+
+        # Test results shallower than the engines search depth (e.g. from hints) are searched again
+        board = chess.Board()
+        board.push(move)
+        eval_cache.put(board, {'score': chess.engine.PovScore(chess.engine.Cp(-30), WHITE), 'depth': 5, 'pv': [chess.Move.from_uci("c7c5")]})
+        model.board_model.board.push(move)
+        model.engine.play.return_value = chess.engine.PlayResult(chess.Move.from_uci("e7e5"), None, info=dict(info, pv=[chess.Move.from_uci("e7e5")]))
+        assert (await model.get_best_move()).move == chess.Move.from_uci("e7e5")
+        assert model.engine.play.await_count == 2
+        assert eval_cache.hits == 2
+
+        # Test weakened engines do not use the cache
+        model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 7}, game_metadata)
+        model.engine = AsyncMock()
+        model.engine.play.return_value = chess.engine.PlayResult(chess.Move.from_uci("d2d4"), None, info=info)
+        assert (await model.get_best_move()).move == chess.Move.from_uci("d2d4")
+        assert eval_cache.hits == 2
+    asyncio.run(run())
+
+
+def test_opening_book(game_metadata: GameMetadata, opening_book: OpeningBook, monkeypatch):
+    async def run():
+        model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 3}, game_metadata)
+        model.engine = AsyncMock()
+        monkeypatch.setattr(opening_book, 'get_move', Mock(return_value=chess.Move.from_uci("e2e4")))
+
+        # Test book moves are returned without searching
+        assert (await model.get_best_move()).move == chess.Move.from_uci("e2e4")
+        opening_book.get_move.assert_called_once_with(model.board_model.board, 3)
+        model.engine.play.assert_not_awaited()
+    asyncio.run(run())
+
+
+def test_tablebase(game_metadata: GameMetadata, tablebase: Tablebase, eval_cache: EvalCache, monkeypatch):
+    async def run():
+        monkeypatch.setattr(tablebase, 'get_best_move', Mock(return_value=chess.Move.from_uci("h1h8")))
+
+        # Test tablebase moves are returned without searching
+        model = EngineModel(BoardModel(fen="8/8/8/4k3/8/8/8/K6Q w - - 0 1"), {GameOption.COMPUTER_SKILL_LEVEL: 8}, game_metadata)
+        model.engine = AsyncMock()
+        assert (await model.get_best_move()).move == chess.Move.from_uci("h1h8")
+        model.engine.play.assert_not_awaited()
+
+        # Test weakened engines do not use the tablebases
+        model = EngineModel(BoardModel(fen="8/8/8/4k3/8/8/8/K6Q w - - 0 1"), {GameOption.COMPUTER_SKILL_LEVEL: 1}, game_metadata)
+        model.engine = AsyncMock()
+        model.engine.play.return_value = chess.engine.PlayResult(chess.Move.from_uci("h1h2"), None)
+        await model.get_best_move()
+        model.engine.play.assert_awaited_once()
+    asyncio.run(run())
+
+
+def test_telemetry(game_metadata: GameMetadata, opening_book: OpeningBook, monkeypatch):
+    async def run():
+        model = EngineModel(BoardModel(), {GameOption.COMPUTER_SKILL_LEVEL: 3}, game_metadata)
+        model.engine = AsyncMock()
+        info = {'depth': 5, 'seldepth': 7, 'nodes': 1200, 'nps': 60000, 'time': 0.02}
+        model.engine.play.return_value = chess.engine.PlayResult(chess.Move.from_uci("e2e4"), None, info=info)
+
+        # Test the search telemetry is recorded from the engines info
+        await model.get_best_move()
+        assert model.engine.play.await_args.kwargs['info'] & chess.engine.INFO_BASIC
+        telemetry = model.telemetry.get_latest()
+        assert (telemetry.ply, telemetry.move, telemetry.source) == (1, "e2e4", "engine")
+        assert (telemetry.depth, telemetry.seldepth, telemetry.nodes, telemetry.nps) == (5, 7, 1200, 60000)
+        assert telemetry.think_time >= 0
+
+        # Test moves which were not searched are recorded with their source
+        monkeypatch.setattr(opening_book, 'get_move', Mock(return_value=chess.Move.from_uci("d2d4")))
+        await model.get_best_move()
+        telemetry = model.telemetry.get_latest()
+        assert (telemetry.move, telemetry.source, telemetry.nps) == ("d2d4", "book", None)
+        assert len(model.telemetry.get_searches()) == 2
+    asyncio.run(run())
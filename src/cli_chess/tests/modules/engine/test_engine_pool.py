@@ -0,0 +1,128 @@
+from cli_chess.modules.engine import EnginePool
+from unittest.mock import AsyncMock, Mock
+import importlib
+import asyncio
+import pytest
+
+
+def mock_engine(alive: bool = True) -> AsyncMock:
+    engine = AsyncMock()
+    engine.returncode.done = Mock(return_value=not alive)
+    engine.transport.get_pid = Mock(return_value=1)
+    return engine
+
+
+@pytest.fixture
+def popen_uci(monkeypatch):
+    popen_uci = AsyncMock(side_effect=lambda *args, **kwargs: mock_engine())
+    monkeypatch.setattr(importlib.import_module('cli_chess.modules.engine.engine_pool'), 'popen_engine', popen_uci)
+    return popen_uci
+
+
+@pytest.fixture
+def pool():
+    return EnginePool(max_idle=1)
+
+
+def test_checkout(pool: EnginePool, popen_uci: AsyncMock):
+    async def run():
+        # Test a new engine is started and configured when the pool is empty
+        engine_cfg = {'Skill Level': 3, 'UCI_LimitStrength': False, 'UCI_Elo': 1350}
+        engine = await pool.checkout("engine_path", engine_cfg)
+        popen_uci.assert_awaited_once_with("engine_path")
+        engine.configure.assert_awaited_once_with(engine_cfg)
+
+        # Test the warm engine is reused and reconfigured on the next checkout
+        await pool.checkin("engine_path", engine)
+        engine_cfg = {'Skill Level': 20, 'UCI_LimitStrength': True, 'UCI_Elo': 2000}
+        assert await pool.checkout("engine_path", engine_cfg) is engine
+        engine.configure.assert_awaited_with(engine_cfg)
+        assert popen_uci.await_count == 1
+
+        # Test engines are only reused for the same binary
+        await pool.checkin("engine_path", engine)
+        assert await pool.checkout("other_engine_path", engine_cfg) is not engine
+
+        # Test a warm engine that has died is discarded
+        engine.returncode.done.return_value = True
+        assert await pool.checkout("engine_path", engine_cfg) is not engine
+
+        # Test a warm engine which fails configuration is discarded
+        engine = mock_engine()
+        await pool.checkin("engine_path", engine)
+        engine.configure.side_effect = Exception("Engine error")
+        assert await pool.checkout("engine_path", engine_cfg) is not engine
+        engine.quit.assert_awaited()
+    asyncio.run(run())
+
+
+def test_checkin(pool: EnginePool, popen_uci: AsyncMock):
+    async def run():
+        engine1 = await pool.checkout("engine_path", {})
+        engine2 = await pool.checkout("engine_path", {})
+
+        # Test engines are stopped (e.g. from pondering) before being returned
+        await pool.checkin("engine_path", engine1)
+        engine1.ping.assert_awaited_once()
+
+        # Test engines in use are not capped, but engines over the idle capacity are quit when returned
+        await pool.checkin("engine_path", engine2)
+        engine1.quit.assert_not_awaited()
+        engine2.quit.assert_awaited_once()
+
+        # Test dead engines are not returned to the pool
+        await pool.shutdown()
+        dead_engine = mock_engine(alive=False)
+        await pool.checkin("engine_path", dead_engine)
+        assert await pool.checkout("engine_path", {}) is not dead_engine
+
+        # Test unresponsive engines are not returned to the pool
+        await pool.shutdown()
+        unresponsive_engine = mock_engine()
+        unresponsive_engine.ping.side_effect = Exception("Engine error")
+        await pool.checkin("engine_path", unresponsive_engine)
+        unresponsive_engine.quit.assert_awaited_once()
+        assert await pool.checkout("engine_path", {}) is not unresponsive_engine
+    asyncio.run(run())
+
+
+def test_new_game_id(pool: EnginePool):
+    assert pool.new_game_id() != pool.new_game_id()
+
+
+def test_shutdown(pool: EnginePool, popen_uci: AsyncMock):
+    async def run():
+        engine = await pool.checkout("engine_path", {})
+        await pool.checkin("engine_path", engine)
+        assert await pool.checkout("engine_path", {}) is engine
+
+        # Test engines which were never returned to the pool are also quit
+        await pool.shutdown()
+        engine.quit.assert_awaited_once()
+
+        # Test the pool is empty after shutdown
+        assert await pool.checkout("engine_path", {}) is not engine
+    asyncio.run(run())
+
+
+def test_get_active_count(pool: EnginePool, popen_uci: AsyncMock):
+    async def run():
+        # Test engines being started are counted so concurrent starts split resources
+        started = asyncio.Event()
+
+        async def start_engine(*args):
+            started.set()
+            await asyncio.sleep(0)
+            return mock_engine()
+        popen_uci.side_effect = start_engine
+
+        assert pool.get_active_count() == 0
+        task = asyncio.create_task(pool.checkout("engine_path", {}))
+        await started.wait()
+        assert pool.get_active_count() == 1
+        engine = await task
+        assert pool.get_active_count() == 1
+
+        await pool.checkin("engine_path", engine)
+        assert pool.get_active_count() == 0
+    asyncio.run(run())
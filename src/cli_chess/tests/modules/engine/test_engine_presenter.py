@@ -0,0 +1,23 @@
+from cli_chess.modules.engine import EnginePresenter, SearchTelemetry, EngineTelemetry
+from unittest.mock import Mock
+
+
+def test_get_formatted_telemetry():
+    model = Mock()
+    model.telemetry = EngineTelemetry()
+    presenter = EnginePresenter(model)
+    assert presenter.get_formatted_telemetry() == "Engine: waiting for the first move"
+
+    model.telemetry.record(SearchTelemetry(ply=1, move="e2e4", source="book", think_time=0.001))
+    assert presenter.get_formatted_telemetry() == "Engine: book move in 0.00s"
+
+    model.telemetry.record(SearchTelemetry(ply=3, move="g1f3", source="engine", think_time=1.25, time_to_first_info=0.004,
+                                           depth=14, seldepth=20, nodes=1_500_000, nps=1_200_000))
+    assert presenter.get_formatted_telemetry() == ("Engine: 1.25s · depth 14/20 · 1.2M nps · 1.5M nodes · first info 4ms\n"
+                                                   "Average: 1.2M nps")
+
+
+def test_format_count():
+    assert EnginePresenter.format_count(950) == "950"
+    assert EnginePresenter.format_count(45_600) == "46k"
+    assert EnginePresenter.format_count(2_340_000) == "2.3M"
@@ -0,0 +1,69 @@
+from cli_chess.modules.engine import get_engine_resources, split_engine_resources
+from cli_chess.utils.config import EngineConfig
+from unittest.mock import Mock
+import pytest
+
+
+@pytest.fixture
+def resources(monkeypatch):
+    """Mocks the available resources (8 CPUs and 16 GB) and the engine configuration"""
+    resources = {'cpus': 8, 'memory': 16384, EngineConfig.Keys.THREADS: 0, EngineConfig.Keys.HASH: 0}
+    monkeypatch.setattr('cli_chess.modules.engine.engine_resources.get_available_cpus', lambda: resources['cpus'])
+    monkeypatch.setattr('cli_chess.modules.engine.engine_resources.get_available_memory', lambda: resources['memory'])
+    monkeypatch.setattr('cli_chess.modules.engine.engine_resources.engine_config',
+                        Mock(Keys=EngineConfig.Keys, get_value=lambda key: resources[key]))
+    return resources
+
+
+def test_weakened_engines(resources):
+    assert get_engine_resources(full_strength=False) == {'Threads': 1, 'Hash': 16}
+    resources[EngineConfig.Keys.THREADS] = 4
+    assert get_engine_resources(full_strength=False) == {'Threads': 1, 'Hash': 16}
+
+
+def test_auto_resources(resources):
+    # Test a CPU is left for the UI and the hash scales with the threads
+    assert get_engine_resources(full_strength=True) == {'Threads': 7, 'Hash': 256}
+
+    # Test concurrent engines split the CPUs
+    assert get_engine_resources(full_strength=True, concurrent_engines=2) == {'Threads': 3, 'Hash': 128}
+    assert get_engine_resources(full_strength=True, concurrent_engines=16) == {'Threads': 1, 'Hash': 64}
+
+    # Test the hash is capped and limited by the available memory
+    resources['cpus'] = 64
+    assert get_engine_resources(full_strength=True) == {'Threads': 63, 'Hash': 1024}
+    resources['memory'] = 1000
+    assert get_engine_resources(full_strength=True, concurrent_engines=2) == {'Threads': 31, 'Hash': 64}
+
+    # Test small machines use every CPU
+    resources['cpus'] = 2
+    assert get_engine_resources(full_strength=True)['Threads'] == 2
+
+    # Test unknown memory does not limit the hash
+    resources['memory'] = None
+    assert get_engine_resources(full_strength=True)['Hash'] == 128
+
+
+def test_configured_resources(resources):
+    resources[EngineConfig.Keys.THREADS] = 4
+    resources[EngineConfig.Keys.HASH] = 300
+    assert get_engine_resources(full_strength=True) == {'Threads': 4, 'Hash': 300}
+
+    # Test configured values are limited to the available resources
+    resources[EngineConfig.Keys.THREADS] = 32
+    resources[EngineConfig.Keys.HASH] = 100000
+    assert get_engine_resources(full_strength=True, concurrent_engines=2) == {'Threads': 8, 'Hash': 4096}
+
+    # Test invalid values fall back to auto
+    resources[EngineConfig.Keys.THREADS] = "many"
+    assert get_engine_resources(full_strength=True)['Threads'] == 7
+
+
+def test_split_resources(resources):
+    # Test engines sharing the machine (e.g. batch analysis workers) each get a share of the CPUs
+    assert split_engine_resources(0, 0, concurrent_engines=8) == {'Threads': 1, 'Hash': 64}
+    assert split_engine_resources(0, 0, concurrent_engines=2) == {'Threads': 3, 'Hash': 128}
+
+    # Test a passed in hash size is limited to each engines share of the memory
+    assert split_engine_resources(0, 10000, concurrent_engines=4) == {'Threads': 1, 'Hash': 2048}
+    assert split_engine_resources(2, 100, concurrent_engines=4) == {'Threads': 2, 'Hash': 100}
@@ -0,0 +1,63 @@
+from cli_chess.modules.engine import EngineTelemetry, SearchTelemetry, TelemetryUciProtocol
+from unittest.mock import Mock
+import asyncio
+
+
+def create_search(ply: int, source: str = "engine", nps: int = 1000) -> SearchTelemetry:
+    return SearchTelemetry(ply=ply, move="e2e4", source=source, think_time=0.5, time_to_first_info=0.01,
+                           depth=12, seldepth=18, nodes=500, nps=nps)
+
+
+def test_ring_buffer():
+    telemetry = EngineTelemetry(max_size=3)
+    assert telemetry.get_latest() is None
+    assert telemetry.get_average_nps() is None
+
+    for ply in range(1, 6):
+        telemetry.record(create_search(ply, nps=ply * 1000))
+
+    # Test the oldest entries are dropped once the buffer is full
+    assert [search.ply for search in telemetry.get_searches()] == [3, 4, 5]
+    assert telemetry.get_latest().ply == 5
+    assert telemetry.get_telemetry_for_ply(4).nps == 4000
+    assert telemetry.get_telemetry_for_ply(1) is None
+    assert telemetry.get_average_nps() == 4000
+
+    # Test moves which were not searched are excluded from the average NPS
+    telemetry.record(create_search(6, source="book", nps=0))
+    assert telemetry.get_average_nps() == 4500
+
+    telemetry.clear()
+    assert telemetry.get_searches() == []
+
+
+def test_to_pgn_comment():
+    assert create_search(1).to_pgn_comment() == "[%emt 0:00:00.50] depth 12/18 500 nodes 1000 nps first info 0.010s"
+    assert SearchTelemetry(ply=1, move="e2e4", source="book", think_time=3725.5).to_pgn_comment() == "[%emt 1:02:05.50] book"
+
+
+def test_first_info_received():
+    async def run():
+        engine = TelemetryUciProtocol()
+        engine.transport = Mock()
+        assert engine.search_started is None
+
+        # Test the first info line with a depth after `go` is recorded
+        engine.line_received("info depth 1 score cp 20")
+        assert engine.first_info_received is None
+
+        engine.send_line("go movetime 100")
+        assert engine.search_started is not None
+        engine.line_received("info string NNUE evaluation enabled")
+        assert engine.first_info_received is None
+        engine.line_received("info depth 1 seldepth 1 score cp 20 nodes 20 nps 20000 time 1 pv e2e4")
+        first_info_received = engine.first_info_received
+        assert first_info_received >= engine.search_started
+
+        engine.line_received("info depth 2 seldepth 2 score cp 25 nodes 60 nps 30000 time 2 pv e2e4")
+        assert engine.first_info_received == first_info_received
+
+        # Test a new search resets the first info time
+        engine.send_line("go depth 5")
+        assert engine.first_info_received is None
+    asyncio.run(run())
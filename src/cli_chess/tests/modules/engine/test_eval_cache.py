@@ -0,0 +1,132 @@
+from cli_chess.modules.engine.eval_cache import EvalCache
+from unittest.mock import patch
+from chess.engine import PovScore, Cp, Mate
+import chess.variant
+import chess
+import pytest
+
+
+def make_info(board: chess.Board, moves: str, depth: int, score: PovScore) -> dict:
+    return {'pv': [chess.Move.from_uci(move) for move in moves.split()], 'depth': depth, 'score': score}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=1000)
+    yield cache
+    cache.close()
+
+
+def test_get_and_put(cache: EvalCache):
+    board = chess.Board()
+    assert cache.get(board) is None
+
+    cache.put(board, make_info(board, "e2e4 e7e5", 20, PovScore(Cp(30), chess.WHITE)))
+    cached = cache.get(board)
+    assert cached.best_move == chess.Move.from_uci("e2e4")
+    assert cached.pv == [chess.Move.from_uci("e2e4"), chess.Move.from_uci("e7e5")]
+    assert cached.depth == 20
+    assert cached.score == PovScore(Cp(30), chess.WHITE)
+
+    # Test scores are stored from white's point of view
+    board.push_uci("f2f3")
+    board.push_uci("e7e5")
+    board.push_uci("g2g4")
+    cache.put(board, make_info(board, "d8h4", 30, PovScore(Mate(1), chess.BLACK)))
+    assert cache.get(board).score.white() == Mate(-1)
+
+    # Test the minimum depth is respected
+    assert cache.get(board, min_depth=31) is None
+
+    # Test the cache persists across connections
+    cache.close()
+    assert cache.get(board).best_move == chess.Move.from_uci("d8h4")
+
+
+def test_put_keeps_deepest_result(cache: EvalCache):
+    board = chess.Board()
+    cache.put(board, make_info(board, "e2e4", 20, PovScore(Cp(30), chess.WHITE)))
+    cache.put(board, make_info(board, "d2d4", 10, PovScore(Cp(20), chess.WHITE)))
+    assert cache.get(board).best_move == chess.Move.from_uci("e2e4")
+
+    cache.put(board, make_info(board, "c2c4", 25, PovScore(Cp(25), chess.WHITE)))
+    assert cache.get(board).best_move == chess.Move.from_uci("c2c4")
+
+    # Test incomplete results are not stored
+    cache.put(chess.Board(), {'depth': 30})
+    assert cache.get(board).depth == 25
+
+
+def test_variant_and_collision_handling(cache: EvalCache):
+    # Test positions are keyed by variant
+    board = chess.Board()
+    cache.put(board, make_info(board, "e2e4", 20, PovScore(Cp(30), chess.WHITE)))
+    assert cache.get(chess.variant.AntichessBoard()) is None
+    assert cache.get(chess.variant.AtomicBoard()) is None
+
+    # Test variant state which is not part of the Zobrist hash is verified (e.g. check counts)
+    three_check = chess.variant.ThreeCheckBoard()
+    cache.put(three_check, make_info(three_check, "e2e4", 20, PovScore(Cp(30), chess.WHITE)))
+    three_check.remaining_checks[chess.WHITE] = 1
+    assert cache.get(three_check) is None
+
+    # Test a colliding position with the same hash is not returned
+    with patch.object(EvalCache, '_get_key', return_value=1):
+        cache.put(chess.Board(), make_info(board, "e2e4", 20, PovScore(Cp(30), chess.WHITE)))
+        assert cache.get(chess.Board("8/8/8/8/8/8/8/K1k5 w - - 0 1")) is None
+
+
+def test_eviction(tmp_path):
+    cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=10)
+    with patch('cli_chess.modules.engine.eval_cache.EVICTION_CHECK_INTERVAL', 5):
+        board = chess.Board()
+        boards = []
+        for move in list(board.legal_moves)[:15]:
+            child = board.copy()
+            child.push(move)
+            boards.append(child)
+            cache.put(child, make_info(child, next(iter(child.legal_moves)).uci(), 10, PovScore(Cp(0), chess.WHITE)))
+
+        # Test the least recently used positions are evicted
+        assert cache._connection.execute("SELECT COUNT(*) FROM evals").fetchone()[0] == 10
+        assert cache.get(boards[0]) is None
+        assert cache.get(boards[-1]) is not None
+    cache.close()
+
+
+def test_last_used_writes(tmp_path):
+    cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=1000)
+    board = chess.Board()
+    cache.put(board, make_info(board, "e2e4", 20, PovScore(Cp(30), chess.WHITE)))
+    stored = cache._connection.execute("SELECT last_used FROM evals").fetchone()[0]
+
+    # Test lookups do not write to the database, and the last used times are written when closed
+    with patch('time.time', return_value=stored + 10):
+        assert cache.get(board) is not None
+    assert cache._connection.execute("SELECT last_used FROM evals").fetchone()[0] == stored
+    assert cache._connection.in_transaction is False
+    cache.close()
+
+    cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=1000)
+    assert cache.get(board) is not None
+    assert cache._connection.execute("SELECT last_used FROM evals").fetchone()[0] == stored + 10
+    cache.close()
+
+
+def test_hit_rate(cache: EvalCache):
+    assert cache.get_hit_rate() == 0
+    board = chess.Board()
+    cache.get(board)
+    cache.put(board, make_info(board, "e2e4", 20, PovScore(Cp(30), chess.WHITE)))
+    cache.get(board)
+    cache.get(board)
+    cache.get(board, min_depth=50)
+    assert cache.get_hit_rate() == 0.5
+
+
+def test_disabled_cache(tmp_path):
+    cache = EvalCache(str(tmp_path / "eval_cache.db"), max_entries=0)
+    board = chess.Board()
+    cache.put(board, make_info(board, "e2e4", 20, PovScore(Cp(30), chess.WHITE)))
+    assert cache.get(board) is None
+    assert not (tmp_path / "eval_cache.db").exists()
@@ -0,0 +1,79 @@
+from cli_chess.modules.engine import OpeningBook
+from collections import Counter
+import chess.polyglot
+import chess.variant
+import chess
+import random
+import struct
+import pytest
+
+
+def write_book(path, entries: list) -> str:
+    """Writes a polyglot book of (board, move uci, weight) entries, sorted by key"""
+    raw = []
+    for board, move, weight in entries:
+        move = chess.Move.from_uci(move)
+        raw.append((chess.polyglot.zobrist_hash(board), move.to_square | move.from_square << 6, weight))
+    with open(path, "wb") as book:
+        for key, move, weight in sorted(raw):
+            book.write(struct.pack(">QHHI", key, move, weight, 0))
+    return str(path)
+
+
+@pytest.fixture
+def book_path(tmp_path):
+    after_e4 = chess.Board()
+    after_e4.push_uci("e2e4")
+    return write_book(tmp_path / "book.bin", [
+        (chess.Board(), "e2e4", 100),
+        (chess.Board(), "d2d4", 50),
+        (chess.Board(), "b2b3", 1),
+        (after_e4, "e7e5", 10),
+    ])
+
+
+def test_get_move(book_path: str):
+    book = OpeningBook(book_path, rng=random.Random(1))
+    assert book.get_move(chess.Board(), 8) in [chess.Move.from_uci(move) for move in ["e2e4", "d2d4", "b2b3"]]
+
+    board = chess.Board()
+    board.push_uci("e2e4")
+    assert book.get_move(board, 8) == chess.Move.from_uci("e7e5")
+
+    # Test positions which are out of book
+    board.push_uci("e7e5")
+    assert book.get_move(board, 8) is None
+
+    # Test the book is only used for standard chess
+    assert book.get_move(chess.variant.AtomicBoard(), 8) is None
+    assert book.get_move(chess.Board(chess960=True), 8) is None
+    book.close()
+
+
+def test_skill_level_weighting(book_path: str):
+    book = OpeningBook(book_path, rng=random.Random(1))
+    strong = Counter(book.get_move(chess.Board(), 8).uci() for _ in range(1000))
+    weak = Counter(book.get_move(chess.Board(), 1).uci() for _ in range(1000))
+
+    # Test stronger levels favour the main lines, and weaker levels pick more evenly
+    assert strong["e2e4"] > strong["d2d4"] > strong["b2b3"]
+    assert strong["b2b3"] < 5
+    assert 250 < weak["b2b3"] < 420
+
+    # Test weaker levels leave the book earlier
+    board = chess.Board()
+    board.push_uci("e2e4")
+    board.push_uci("e7e5")
+    board.push_uci("g1f3")
+    assert book.get_move(board, 1) is None
+    book.close()
+
+
+def test_invalid_book(tmp_path):
+    # Test a book which is not configured or cannot be opened is ignored
+    assert OpeningBook("").get_move(chess.Board(), 8) is None
+    assert OpeningBook(str(tmp_path / "missing.bin")).get_move(chess.Board(), 8) is None
+
+    with open(tmp_path / "invalid.bin", "wb") as book:
+        book.write(b"invalid")
+    assert OpeningBook(str(tmp_path / "invalid.bin")).get_move(chess.Board(), 8) is None
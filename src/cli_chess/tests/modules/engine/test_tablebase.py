@@ -0,0 +1,87 @@
+from cli_chess.modules.engine import Tablebase
+from cli_chess.modules.engine.tablebase import TABLEBASE_WIN_SCORE
+from unittest.mock import Mock
+import chess.engine
+import chess.variant
+import chess
+import pytest
+
+KQK_FEN = "8/8/8/4k3/8/8/8/K6Q w - - 0 1"
+
+
+def mock_probe(board: chess.Board):
+    """Mocks a KQvK tablebase where Qh8 is the fastest win"""
+    if not board.pieces(chess.QUEEN, chess.WHITE):
+        return 0, 0
+    if board.turn == chess.WHITE:
+        return 2, 11
+    return -2, -3 if board.piece_at(chess.H8) else -10
+
+
+@pytest.fixture
+def syzygy(monkeypatch):
+    syzygy = Mock()
+    syzygy.probe_wdl.side_effect = lambda board: mock_probe(board)[0]
+    syzygy.probe_dtz.side_effect = lambda board: mock_probe(board)[1]
+    monkeypatch.setattr(Tablebase, '_get_tablebase', Mock(return_value=syzygy))
+    return syzygy
+
+
+def test_probe(syzygy: Mock):
+    tablebase = Tablebase("syzygy", cache_size=2)
+    board = chess.Board(KQK_FEN)
+    assert tablebase.probe(board) == (2, 11)
+
+    # Test repeated probes are served from the probe cache
+    assert tablebase.probe(board) == (2, 11)
+    assert syzygy.probe_wdl.call_count == 1
+    assert tablebase.get_hit_rate() == 0.5
+
+    # Test the probe cache is size capped
+    for move in ["h1h2", "h1h3"]:
+        board.push_uci(move)
+        tablebase.probe(board)
+        board.pop()
+    tablebase.probe(board)
+    assert syzygy.probe_wdl.call_count == 4
+
+    # Test positions which cannot be in the tablebases are not probed
+    assert tablebase.probe(chess.Board()) is None
+    assert tablebase.probe(chess.variant.AtomicBoard(KQK_FEN)) is None
+    assert tablebase.probe(chess.Board("r3k3/8/8/8/8/8/8/K6Q b q - 0 1")) is None
+    assert syzygy.probe_wdl.call_count == 4
+
+    # Test positions missing from the tablebases
+    syzygy.probe_wdl.side_effect = KeyError("Missing table")
+    assert tablebase.probe(chess.Board("8/8/8/4k3/8/8/8/K6R w - - 0 1")) is None
+
+
+def test_get_best_move(syzygy: Mock):
+    tablebase = Tablebase("syzygy")
+    assert tablebase.get_best_move(chess.Board(KQK_FEN)) == chess.Move.from_uci("h1h8")
+
+    # Test checkmating moves are always played
+    board = chess.Board("k7/8/1K6/8/8/8/8/7Q w - - 0 1")
+    board.push(tablebase.get_best_move(board))
+    assert board.is_checkmate()
+
+    # Test positions not covered by the tablebases
+    assert tablebase.get_best_move(chess.Board()) is None
+
+
+def test_get_info(syzygy: Mock):
+    tablebase = Tablebase("syzygy")
+    info = tablebase.get_info(chess.Board(KQK_FEN))
+    assert info['score'].white() == chess.engine.Cp(TABLEBASE_WIN_SCORE - 11)
+    assert info['pv'] == [chess.Move.from_uci("h1h8")]
+
+    # Test scores are reported relative to the side to move
+    board = chess.Board(KQK_FEN)
+    board.push_uci("h1h8")
+    assert tablebase.get_info(board)['score'].white() == chess.engine.Cp(TABLEBASE_WIN_SCORE - 3)
+
+    assert tablebase.get_info(chess.Board()) is None
+
+
+def test_no_tablebase():
+    assert Tablebase("").get_best_move(chess.Board(KQK_FEN)) is None
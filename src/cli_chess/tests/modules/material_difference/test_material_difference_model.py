@@ -1,6 +1,6 @@
 from cli_chess.modules.material_difference.material_difference_model import MaterialDifferenceModel, PIECE_VALUE
 from cli_chess.modules.board import BoardModel
-from chess import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING
+from chess import WHITE, BLACK, PAWN, KNIGHT, BISHOP, ROOK, QUEEN, KING, Move
 from unittest.mock import Mock
 import pytest
 
@@ -91,6 +91,18 @@ def test_update(model: MaterialDifferenceModel, model_listener: Mock):
     }
 
 
+def test_board_update_topics(model: MaterialDifferenceModel, model_listener: Mock):
+    # Verify premove highlight changes do not recalculate the material difference
+    model.board_model.set_premove_highlight(Move.from_uci("e2e4"))
+    model_listener.assert_not_called()
+
+    # Verify orientation changes notify listeners without recalculating the material difference
+    model._reset_all = Mock()
+    model.board_model.set_board_orientation(BLACK)
+    model_listener.assert_called_once()
+    model._reset_all.assert_not_called()
+
+
 def test_update_material_difference(model: MaterialDifferenceModel):
     assert model.material_difference == {
         WHITE: {KING: 0, QUEEN: 0, ROOK: 1, BISHOP: 0, KNIGHT: 0, PAWN: 1},
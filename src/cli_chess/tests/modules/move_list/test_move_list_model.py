@@ -1,6 +1,6 @@
 from cli_chess.modules.move_list import MoveListModel
 from cli_chess.modules.board import BoardModel
-from chess import WHITE, BLACK, PIECE_SYMBOLS, KING, QUEEN, BISHOP, PAWN
+from chess import WHITE, BLACK, PIECE_SYMBOLS, KING, QUEEN, BISHOP, PAWN, Move
 from unittest.mock import Mock
 import pytest
 
@@ -91,6 +91,13 @@ def test_update(model: MoveListModel, model_listener: Mock):
     # Verify the move list model update notification is sent to listeners
     model_listener.assert_called()
 
+    # Verify board updates which do not change the position do not rebuild the move list
+    model_listener.reset_mock()
+    model.board_model.set_premove_highlight(Move.from_uci("e2e4"))
+    model.board_model.clear_premove_highlight()
+    model.board_model.set_board_orientation(BLACK)
+    model_listener.assert_not_called()
+
 
 def test_get_move_list_data(model: MoveListModel):
     assert len(model.get_move_list_data()) == 0
@@ -0,0 +1,32 @@
+import subprocess
+import importlib
+import sys
+import os
+import pytest
+
+
+def test_lazy_exports(monkeypatch):
+    package = importlib.import_module('cli_chess.core.api')
+    monkeypatch.delitem(package.__dict__, 'required_token_scopes', raising=False)
+
+    # Test exports are imported from their submodule on first access, and then set on the package
+    from cli_chess.core.api import required_token_scopes
+    assert required_token_scopes is importlib.import_module('cli_chess.core.api.api_manager').required_token_scopes
+    assert package.__dict__['required_token_scopes'] is required_token_scopes
+
+    # Test unknown names raise an AttributeError
+    with pytest.raises(AttributeError):
+        package.unknown_export
+    with pytest.raises(ImportError):
+        from cli_chess.core.api import unknown_export  # noqa: F401
+
+
+def test_deferred_imports(tmp_path):
+    # Test the entry point and main menu do not import modules which are only needed on first use
+    code = ("import sys, cli_chess.__main__; before_menus = set(sys.modules); import cli_chess.core.main.main_view, cli_chess.menus.main_menu; "
+            "print(' '.join(module for module in ('prompt_toolkit', 'chess', 'berserk') if module in before_menus), '|', "
+            "' '.join(module for module in ('berserk', 'requests') if module in sys.modules))")
+    env = {"HOME": str(tmp_path), "APPDATA": str(tmp_path), "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.split() == ["|"]
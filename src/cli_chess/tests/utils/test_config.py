@@ -0,0 +1,237 @@
+from cli_chess.utils.config import BaseConfig, ConfigDocument, GameConfig, EngineConfig, LichessConfig
+from cli_chess.utils.logging import log_redactions
+from unittest.mock import Mock
+import configparser
+import importlib
+import os
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def config_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(importlib.import_module('cli_chess.utils.config'), 'get_config_path', lambda: f"{tmp_path}{os.sep}")
+    return tmp_path
+
+
+@pytest.fixture
+def writes(monkeypatch):
+    """Counts the configuration file writes"""
+    writes = Mock(side_effect=ConfigDocument.write)
+    monkeypatch.setattr(ConfigDocument, 'write', lambda self: writes(self))
+    return writes
+
+
+def read_config(config: BaseConfig) -> configparser.ConfigParser:
+    parser = configparser.ConfigParser()
+    parser.read(config.full_filename)
+    return parser
+
+
+def test_section_writes(writes: Mock):
+    # Test a new section is written once
+    game_config = GameConfig()
+    assert writes.call_count == 1
+    assert dict(read_config(game_config)["game"]) == {key.name.lower(): str(key.default_value) for key in GameConfig.Keys}
+
+    # Test an intact section is not rewritten
+    GameConfig()
+    assert writes.call_count == 1
+
+    # Test missing keys are restored with a single write
+    game_config.parser.remove_option("game", GameConfig.Keys.PAD_UNICODE.name)
+    game_config.parser.remove_option("game", GameConfig.Keys.BLINDFOLD_CHESS.name)
+    game_config.write_config()
+    writes.reset_mock()
+    assert GameConfig().get_boolean(GameConfig.Keys.PAD_UNICODE)
+    assert writes.call_count == 1
+
+
+def test_batch(writes: Mock):
+    game_config = GameConfig()
+    writes.reset_mock()
+    listener = Mock()
+    game_config.e_game_config_updated.add_listener(listener)
+
+    # Test changes made in a batch are written, and write events fired, once the outermost batch closes
+    with game_config.batch():
+        game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, "yes")
+        with game_config.batch():
+            game_config.set_value(GameConfig.Keys.PAD_UNICODE, "no")
+        game_config.set_value(GameConfig.Keys.USE_UNICODE_PIECES, "no")
+        assert game_config.get_boolean(GameConfig.Keys.BLINDFOLD_CHESS)
+        writes.assert_not_called()
+        listener.assert_not_called()
+
+    writes.assert_called_once()
+    listener.assert_called_once()
+    assert read_config(game_config).getboolean("game", GameConfig.Keys.BLINDFOLD_CHESS.name)
+    assert not read_config(game_config).getboolean("game", GameConfig.Keys.USE_UNICODE_PIECES.name)
+
+    # Test a batch without changes does not write
+    with game_config.batch():
+        pass
+    writes.assert_called_once()
+
+    # Test changes outside a batch are written immediately
+    game_config.set_value(GameConfig.Keys.PAD_UNICODE, "yes")
+    assert writes.call_count == 2
+    assert listener.call_count == 2
+
+
+def test_atomic_write(config_path):
+    game_config = GameConfig()
+    with open(game_config.full_filename) as config_file:
+        contents = config_file.read()
+
+    # Test a failed write leaves the configuration file intact, and cleans up the temporary file
+    def partial_write(config_file, *args, **kwargs):
+        config_file.write("[game]\nshow_board")
+        raise OSError("No space left on device")
+
+    game_config.parser.write = partial_write
+    with pytest.raises(OSError):
+        game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, "yes")
+
+    with open(game_config.full_filename) as config_file:
+        assert config_file.read() == contents
+    assert os.listdir(config_path) == [os.path.basename(game_config.full_filename)]
+
+
+def test_snapshot():
+    game_config = GameConfig()
+    engine_config = EngineConfig()
+
+    # Test values are typed from the keys default values
+    assert game_config.snapshot.show_board_coordinates is True
+    assert engine_config.snapshot.analysis_lines == 3
+    assert engine_config.snapshot.opening_book == ""
+    with pytest.raises(AttributeError):
+        game_config.snapshot.pad_unicode = False
+
+    # Test the snapshot is rebuilt once changes are written
+    snapshot = game_config.snapshot
+    with game_config.batch():
+        game_config.set_value(GameConfig.Keys.PAD_UNICODE, "no")
+        assert game_config.snapshot is snapshot
+    assert game_config.snapshot.pad_unicode is False
+    assert snapshot.pad_unicode is True
+
+    # Test invalid values use the default value
+    engine_config.set_value(EngineConfig.Keys.ANALYSIS_LINES, "abc")
+    engine_config.set_value(EngineConfig.Keys.PONDER, "maybe")
+    assert engine_config.snapshot.analysis_lines == 3
+    assert engine_config.snapshot.ponder is False
+
+    # Test the snapshot is read from an existing configuration
+    assert GameConfig().snapshot == game_config.snapshot
+
+
+def test_shared_document(writes: Mock, monkeypatch):
+    reads = Mock(side_effect=configparser.ConfigParser.read)
+    monkeypatch.setattr(configparser.ConfigParser, 'read', lambda self, *args, **kwargs: reads(self, *args, **kwargs))
+
+    # Test sections in the same file share a single parse, and are created with a single write
+    with BaseConfig().batch():
+        game_config = GameConfig()
+        engine_config = EngineConfig()
+    assert game_config.document is engine_config.document
+    reads.assert_called_once()
+    writes.assert_called_once()
+
+    # Test writing one section does not overwrite changes to another section
+    game_config.set_value(GameConfig.Keys.PAD_UNICODE, "no")
+    engine_config.set_value(EngineConfig.Keys.PONDER, "yes")
+    assert not read_config(game_config).getboolean("game", GameConfig.Keys.PAD_UNICODE.name)
+
+    # Test a batch across sections is written once, firing each changed sections events once
+    game_listener, engine_listener = Mock(), Mock()
+    game_config.e_game_config_updated.add_listener(game_listener)
+    engine_config.e_engine_config_updated.add_listener(engine_listener)
+    writes.reset_mock()
+    with game_config.batch():
+        game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, "yes")
+        game_config.set_value(GameConfig.Keys.PAD_UNICODE, "yes")
+        engine_config.set_value(EngineConfig.Keys.PONDER, "no")
+    writes.assert_called_once()
+    game_listener.assert_called_once()
+    engine_listener.assert_called_once()
+
+    # Test a removed file is reloaded by the next configuration created
+    reads.reset_mock()
+    os.remove(game_config.full_filename)
+    assert not GameConfig().get_boolean(GameConfig.Keys.BLINDFOLD_CHESS)
+    reads.assert_called_once()
+
+
+def test_refresh(writes: Mock):
+    with BaseConfig().batch():
+        game_config = GameConfig()
+        engine_config = EngineConfig()
+    game_listener, engine_listener = Mock(), Mock()
+    game_config.e_game_config_updated.add_listener(game_listener)
+    engine_config.e_engine_config_updated.add_listener(engine_listener)
+
+    def edit_config(edit) -> None:
+        parser = read_config(game_config)
+        edit(parser)
+        modified_time = os.stat(game_config.full_filename).st_mtime_ns
+        with open(game_config.full_filename, 'w') as config_file:
+            parser.write(config_file)
+        # Ensure the edit is seen as a change on filesystems with coarse timestamps
+        os.utime(game_config.full_filename, ns=(modified_time, modified_time + 10**9))
+
+    # Test changes written by cli-chess are not reloaded
+    game_config.set_value(GameConfig.Keys.PAD_UNICODE, "no")
+    game_listener.reset_mock()
+    game_config.document.refresh()
+    game_listener.assert_not_called()
+
+    # Test external changes are reloaded, only notifying the changed sections of the changed keys
+    edit_config(lambda parser: parser.set("game", GameConfig.Keys.BLINDFOLD_CHESS.name, "yes"))
+    game_config.document.refresh()
+    game_listener.assert_called_once_with(GameConfig.Keys.BLINDFOLD_CHESS)
+    engine_listener.assert_not_called()
+    assert game_config.snapshot.blindfold_chess and not game_config.snapshot.pad_unicode
+
+    # Test listeners subscribed to other keys are not notified
+    topic_listener = Mock()
+    game_config.e_game_config_updated.add_listener(topic_listener, topics=[GameConfig.Keys.PAD_UNICODE])
+    game_config.set_value(GameConfig.Keys.BLINDFOLD_CHESS, "no")
+    topic_listener.assert_not_called()
+    game_config.set_value(GameConfig.Keys.PAD_UNICODE, "yes")
+    topic_listener.assert_called_once_with(GameConfig.Keys.PAD_UNICODE)
+
+    # Test reloaded sections are repaired
+    writes.reset_mock()
+    edit_config(lambda parser: parser.remove_section("engine"))
+    game_config.document.refresh()
+    writes.assert_called_once()
+    assert read_config(engine_config).has_section("engine")
+
+    # Test invalid and removed files are ignored
+    game_listener.reset_mock()
+    with open(game_config.full_filename, 'a') as config_file:
+        config_file.write("invalid")
+    game_config.document.refresh()
+    os.remove(game_config.full_filename)
+    game_config.document.refresh()
+    game_listener.assert_not_called()
+    assert game_config.snapshot.pad_unicode
+
+
+def test_lichess_token_reload():
+    lichess_config = LichessConfig()
+    listener = Mock()
+    lichess_config.e_lichess_config_updated.add_listener(listener)
+
+    # Test an externally changed API token is redacted from the logs, and listeners are notified
+    parser = read_config(lichess_config)
+    parser.set("lichess", LichessConfig.Keys.API_TOKEN.name, "lip_reloadedtoken")
+    modified_time = os.stat(lichess_config.full_filename).st_mtime_ns
+    with open(lichess_config.full_filename, 'w') as config_file:
+        parser.write(config_file)
+    os.utime(lichess_config.full_filename, ns=(modified_time, modified_time + 10**9))
+    lichess_config.document.refresh()
+    assert "lip_reloadedtoken" in log_redactions
+    listener.assert_called_once_with(LichessConfig.Keys.API_TOKEN)
+    log_redactions.remove("lip_reloadedtoken")
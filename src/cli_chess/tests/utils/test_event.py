@@ -1,6 +1,8 @@
-from cli_chess.utils import Event, EventManager
+from cli_chess.utils import Event, EventManager, EventTopics
 from unittest.mock import Mock
+import weakref
 import pytest
+import gc
 
 
 @pytest.fixture
@@ -71,7 +73,7 @@ class TestEvent:
         # Try notifying without any listeners
         listener1.reset_mock()
         listener2.reset_mock()
-        event.listeners.clear()
+        event.remove_all_listeners()
         assert not event.listeners
         event.notify()
         listener1.assert_not_called()
@@ -115,3 +117,97 @@ class TestEventManager:
         # Test firing a previously linked event
         test_event.notify()
         listener2.assert_not_called()
+
+
+class TestEventTopics:
+    def test_topic_listeners(self, event: Event, listener1: Mock, listener2: Mock):
+        event.add_listener(listener2, topics=[EventTopics.MOVE_MADE, EventTopics.GAME_END])
+
+        # Test topic listeners are only notified of their topics
+        event.notify(EventTopics.BOARD_ORIENTATION_CHANGED)
+        listener1.assert_called_once_with(EventTopics.BOARD_ORIENTATION_CHANGED)
+        listener2.assert_not_called()
+
+        event.notify(EventTopics.MOVE_MADE, data="data")
+        listener2.assert_called_once_with(EventTopics.MOVE_MADE, data="data")
+
+        # Test notifications without topics only reach listeners of every event
+        listener2.reset_mock()
+        event.notify()
+        listener2.assert_not_called()
+
+        # Test listeners matching several topics are notified once
+        event.notify(EventTopics.MOVE_MADE, EventTopics.GAME_END)
+        listener2.assert_called_once()
+
+        # Test re-adding a listener without topics subscribes it to every event
+        listener2.reset_mock()
+        event.add_listener(listener2)
+        event.notify()
+        listener2.assert_called_once()
+        assert event.listeners.count(listener2) == 1
+
+    def test_notification_order(self, event: Event, listener1: Mock):
+        calls = []
+        event.remove_listener(listener1)
+        event.add_listener(lambda *args: calls.append(1), topics=[EventTopics.GAME_START])
+        event.add_listener(lambda *args: calls.append(2))
+        event.add_listener(lambda *args: calls.append(3), topics=[EventTopics.GAME_START])
+
+        # Test listeners are notified in the order they subscribed
+        event.notify(EventTopics.GAME_START)
+        assert calls == [1, 2, 3]
+
+    def test_invocation_counts(self, event: Event, listener1: Mock, listener2: Mock):
+        event.add_listener(listener2, topics=[EventTopics.GAME_END])
+        for _ in range(3):
+            event.notify(EventTopics.MOVE_MADE)
+        event.notify(EventTopics.GAME_END)
+        assert event.get_invocation_count(listener1) == 4
+        assert event.get_invocation_count(listener2) == 1
+
+        # Test counts are dropped with the listener
+        event.remove_listener(listener1)
+        assert event.get_invocation_count(listener1) == 0
+
+
+class TestWeakListeners:
+    class Subscriber:
+        def __init__(self):
+            self.calls = 0
+
+        def update(self, *args, **kwargs):
+            self.calls += 1
+
+    def test_weak_listeners(self, event: Event, listener1: Mock):
+        subscriber = self.Subscriber()
+        event.add_listener(subscriber.update, topics=[EventTopics.MOVE_MADE], weak=True)
+        assert subscriber.update in event.listeners
+
+        event.notify(EventTopics.MOVE_MADE)
+        assert subscriber.calls == 1
+        assert event.get_invocation_count(subscriber.update) == 1
+
+        # Test weak listeners are pruned once garbage collected
+        del subscriber
+        gc.collect()
+        assert event.listeners == [listener1]
+        event.notify(EventTopics.MOVE_MADE)
+        assert listener1.call_count == 2
+
+        # Test weak listeners can be removed before being garbage collected
+        subscriber = self.Subscriber()
+        event.add_listener(subscriber.update, weak=True)
+        event.remove_listener(subscriber.update)
+        event.notify()
+        assert subscriber.calls == 0
+
+    def test_strong_listeners(self, event: Event):
+        # Test listeners keep their objects alive unless added as weak listeners
+        subscriber = self.Subscriber()
+        subscriber_ref = weakref.ref(subscriber)
+        event.add_listener(subscriber.update)
+        del subscriber
+        gc.collect()
+        event.notify()
+        assert subscriber_ref().calls == 1
@@ -0,0 +1,83 @@
+from cli_chess.utils import FileWatcher
+from cli_chess.utils.common import is_linux_os
+from unittest.mock import Mock
+import importlib
+import threading
+import os
+import pytest
+
+
+@pytest.fixture
+def watcher():
+    watcher = FileWatcher(poll_interval=0.01)
+    yield watcher
+    watcher.stop()
+
+
+def write_file(path, contents: str) -> None:
+    with open(path, 'w') as file:
+        file.write(contents)
+
+
+def test_check_for_changes(watcher: FileWatcher, tmp_path):
+    path = tmp_path / "config.ini"
+    write_file(path, "[game]")
+    callback = Mock()
+    watcher.watch(str(path), callback)
+
+    # Test callbacks only run for files which changed
+    watcher.check_for_changes()
+    callback.assert_not_called()
+
+    write_file(path, "[game]\nblindfold_chess = yes")
+    watcher.check_for_changes()
+    watcher.check_for_changes()
+    callback.assert_called_once()
+
+    # Test removing and recreating a file is a change
+    os.remove(path)
+    watcher.check_for_changes()
+    assert callback.call_count == 2
+    write_file(path, "[game]")
+    watcher.check_for_changes()
+    assert callback.call_count == 3
+
+    # Test unwatched files are no longer checked
+    watcher.unwatch(str(path))
+    write_file(path, "[engine]")
+    watcher.check_for_changes()
+    assert callback.call_count == 3
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watching(watcher: FileWatcher, tmp_path, monkeypatch, use_inotify: bool):
+    if use_inotify and not is_linux_os():
+        pytest.skip("inotify is only used on Linux")
+    monkeypatch.setattr(importlib.import_module('cli_chess.utils.file_watcher'), 'is_linux_os', lambda: use_inotify)
+
+    style_path, config_path = tmp_path / "custom_style.py", tmp_path / "config.ini"
+    write_file(style_path, "{}")
+    changed = threading.Event()
+    style_callback, config_callback = Mock(side_effect=lambda: changed.set()), Mock()
+    watcher.watch(str(style_path), style_callback)
+    watcher.watch(str(config_path), config_callback)
+    watcher.start()
+    assert watcher.is_running()
+    assert (watcher._inotify is not None) == use_inotify
+
+    # Test a change to a watched file is picked up without affecting the other watched files
+    write_file(style_path, "{'menu': 'bold'}")
+    assert changed.wait(5)
+    style_callback.assert_called_once()
+    config_callback.assert_not_called()
+
+    # Test atomically replaced files are picked up
+    changed.clear()
+    config_callback.side_effect = lambda: changed.set()
+    write_file(tmp_path / "config.tmp", "[game]")
+    os.replace(tmp_path / "config.tmp", config_path)
+    assert changed.wait(5)
+    config_callback.assert_called_once()
+
+    watcher.stop()
+    assert not watcher.is_running()
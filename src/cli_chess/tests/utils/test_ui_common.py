@@ -0,0 +1,71 @@
+from cli_chess.utils.ui_common import StyleCache, parse_custom_style, compile_style
+from cli_chess.utils.styles import default
+from prompt_toolkit.styles import Style, merge_styles
+import importlib
+import os
+import pytest
+
+
+@pytest.fixture
+def custom_style_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(importlib.import_module('cli_chess.utils.ui_common'), 'get_config_path', lambda: f"{tmp_path}{os.sep}")
+    return tmp_path / "custom_style.py"
+
+
+def write_style(path, contents: str) -> None:
+    with open(path, 'w') as file:
+        file.write(contents)
+    # Ensure the write is seen as a change on filesystems with coarse timestamps
+    os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+
+
+def test_parse_custom_style():
+    # Test comments are allowed and the style is returned as a dictionary
+    assert parse_custom_style("# Comment\n{\n  'light-square': 'bg:white',  # Comment\n}") == {'light-square': 'bg:white'}
+    assert parse_custom_style("{\n\n}") == {}
+
+    # Test code is never run
+    with pytest.raises(ValueError):
+        parse_custom_style("{'light-square': __import__('os').getcwd()}")
+
+    # Test invalid styles are rejected
+    for invalid_style in ("['bg:white']", "{'light-square': 1}", "{1: 'bg:white'}"):
+        with pytest.raises(ValueError):
+            parse_custom_style(invalid_style)
+    with pytest.raises(SyntaxError):
+        parse_custom_style("{'light-square': 'bg:white'")
+
+
+def test_compile_style():
+    # Test the compiled style resolves the same attributes as merging the default and custom styles
+    custom_style = {'light-square': 'bg:white', 'light-square.dark-piece': 'fg:red bold', 'clock': 'fg:yellow'}
+    compiled_style = compile_style(custom_style)
+    merged_style = merge_styles([Style.from_dict(default), Style.from_dict(custom_style)])
+    for style_str in ("class:light-square.dark-piece", "class:light-square.light-piece", "class:clock.ticking", "class:move-list"):
+        assert compiled_style.get_attrs_for_style_str(style_str) == merged_style.get_attrs_for_style_str(style_str)
+
+
+def test_style_cache(custom_style_path):
+    style_cache = StyleCache()
+
+    # Test a missing custom style file is created
+    style = style_cache.get_style()
+    assert custom_style_path.is_file()
+    assert style.style_rules == list(default.items())
+
+    # Test an unchanged custom style returns the same style
+    assert style_cache.get_style() is style
+    write_style(custom_style_path, custom_style_path.read_text())
+    assert style_cache.get_style() is style
+
+    # Test a changed custom style is recompiled
+    write_style(custom_style_path, "{'clock': 'fg:yellow'}")
+    style = style_cache.get_style()
+    assert style.style_rules[-1] == ('clock', 'fg:yellow')
+
+    # Test an invalid custom style raises, and is retried once fixed
+    write_style(custom_style_path, "{'clock': open('file')}")
+    with pytest.raises(ValueError):
+        style_cache.get_style()
+    write_style(custom_style_path, "{'clock': 'fg:yellow'}")
+    assert style_cache.get_style() is style
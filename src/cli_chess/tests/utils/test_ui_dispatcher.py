@@ -0,0 +1,108 @@
+from cli_chess.utils import UIDispatcher
+from unittest.mock import Mock
+import importlib
+import asyncio
+import threading
+import pytest
+
+
+@pytest.fixture
+def dispatcher():
+    return UIDispatcher(max_queue_size=4)
+
+
+def run_in_thread(target) -> None:
+    """Runs the passed in function on a background thread and waits for it to finish"""
+    thread = threading.Thread(target=target)
+    thread.start()
+    thread.join()
+
+
+def test_dispatch_not_running(dispatcher: UIDispatcher):
+    # Test calls are made directly when the dispatcher is not running
+    callback = Mock()
+    dispatcher.dispatch(callback, 1, data="data")
+    callback.assert_called_once_with(1, data="data")
+
+
+def test_dispatch(dispatcher: UIDispatcher):
+    async def run():
+        dispatcher.start(asyncio.get_running_loop())
+        calls = []
+        ui_thread = threading.get_ident()
+
+        def callback(*args, **kwargs):
+            calls.append((args, kwargs, threading.get_ident()))
+
+        # Test calls from the UI thread are made directly
+        dispatcher.dispatch(callback, "direct")
+        assert len(calls) == 1
+
+        # Test calls from background threads run on the UI loop in order
+        run_in_thread(lambda: [dispatcher.dispatch(callback, i, data=i) for i in range(3)])
+        assert len(calls) == 1
+        assert dispatcher.get_queue_depth() == 3
+
+        await asyncio.sleep(0)
+        assert [call[0] for call in calls[1:]] == [(0,), (1,), (2,)]
+        assert all(call[2] == ui_thread for call in calls)
+        assert dispatcher.get_queue_depth() == 0
+        assert dispatcher.get_stats()['dispatched'] == 3
+        assert dispatcher.get_stats()['max_queue_depth'] == 3
+        dispatcher.stop()
+    asyncio.run(run())
+
+
+def test_coalescing(dispatcher: UIDispatcher):
+    async def run():
+        dispatcher.start(asyncio.get_running_loop())
+        calls = []
+
+        def callback(*args, **kwargs):
+            calls.append(args)
+
+        def stream():
+            dispatcher.dispatch(callback, "fen1", coalesce_key="fen")
+            dispatcher.dispatch(callback, "start")
+            dispatcher.dispatch(callback, "fen2", coalesce_key="fen")
+            dispatcher.dispatch(callback, "fen3", coalesce_key="fen")
+            dispatcher.dispatch(callback, "other", coalesce_key="other")
+
+        # Test superseded calls are dropped and the latest call runs in its own position
+        run_in_thread(stream)
+        assert dispatcher.get_queue_depth() == 3
+        await asyncio.sleep(0)
+        assert calls == [("start",), ("fen3",), ("other",)]
+        assert dispatcher.get_stats()['coalesced'] == 2
+
+        # Test calls are not coalesced with calls that have already run
+        run_in_thread(lambda: dispatcher.dispatch(callback, "fen4", coalesce_key="fen"))
+        await asyncio.sleep(0)
+        assert calls[-1] == ("fen4",)
+        dispatcher.stop()
+    asyncio.run(run())
+
+
+def test_errors_and_full_queue(dispatcher: UIDispatcher, monkeypatch):
+    async def run():
+        dispatcher.start(asyncio.get_running_loop())
+        callback = Mock()
+
+        # Test a failing call does not stop the remaining calls
+        run_in_thread(lambda: [dispatcher.dispatch(Mock(side_effect=Exception("Error"))), dispatcher.dispatch(callback)])
+        await asyncio.sleep(0)
+        callback.assert_called_once()
+
+        # Test calls are dropped when the queue stays full
+        monkeypatch.setattr(importlib.import_module('cli_chess.utils.ui_dispatcher'), 'QUEUE_PUT_TIMEOUT', 0.01)
+        run_in_thread(lambda: [dispatcher.dispatch(callback, i) for i in range(5)])
+        assert dispatcher.get_queue_depth() == 4
+        assert dispatcher.get_stats()['dropped'] == 1
+
+        # Test queued calls are discarded on stop
+        callback.reset_mock()
+        dispatcher.stop()
+        await asyncio.sleep(0)
+        callback.assert_not_called()
+        assert not dispatcher.is_running()
+    asyncio.run(run())
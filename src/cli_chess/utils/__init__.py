@@ -1,7 +1,12 @@
 from .common import AlertType, is_linux_os, is_windows_os, is_mac_os, str_to_bool, threaded, retry, open_url_in_browser, RequestSuccessfullySent
+from .common import lazy_exports
 from .config import force_recreate_configs, print_program_config
 from .event import Event, EventManager, EventTopics
 from .logging import log, redact_from_logs
+from .ui_dispatcher import UIDispatcher, ui_dispatcher
+from .file_watcher import FileWatcher, file_watcher
 from .argparse import setup_argparse
 from .styles import default
-from .ui_common import AlertContainer
+
+# Exports with heavy dependencies (e.g. prompt_toolkit) are imported on first use
+__getattr__ = lazy_exports(__name__, {"AlertContainer": "ui_common"})
@@ -2,7 +2,6 @@ import argparse
 from cli_chess.__metadata__ import __name__, __version__, __description__
 from cli_chess.utils.logging import log, redact_from_logs
 from cli_chess.utils.config import get_config_path
-from cli_chess.core.api import required_token_scopes
 
 
 class ArgumentParser(argparse.ArgumentParser):
@@ -24,6 +23,7 @@ class ArgumentParser(argparse.ArgumentParser):
 
 def setup_argparse() -> ArgumentParser:
     """Sets up argparse and parses the arguments passed in at startup"""
+    from cli_chess.core.api import required_token_scopes
     parser = ArgumentParser(description=f"{__name__}: {__description__}")
     parser.add_argument(
         "--token",
@@ -57,4 +57,48 @@ def setup_argparse() -> ArgumentParser:
         action="store_true"
     )
 
+    subparsers = parser.add_subparsers(dest="command", metavar="command")
+    analyze_parser = subparsers.add_parser(
+        "analyze",
+        help="Analyses every game in a PGN file using a pool of engines and exits.",
+        description="Analyses every game in a PGN file using a pool of engines (one per worker). "
+                    "Per move evaluations, judgements, and accuracy are written to the output file "
+                    "as one JSON object per game. Interrupted analyses are resumed when run again."
+    )
+    analyze_parser.add_argument(
+        "pgn",
+        help="The PGN file containing the games to analyse",
+        type=str
+    )
+    analyze_parser.add_argument(
+        "-o", "--output",
+        metavar="FILE",
+        help="The file to write the analysis to (default: <pgn>.analysis.ndjson)",
+        type=str
+    )
+    limit_group = analyze_parser.add_mutually_exclusive_group()
+    limit_group.add_argument(
+        "--depth",
+        help="The search depth per position (default: 16)",
+        type=int
+    )
+    limit_group.add_argument(
+        "--time",
+        metavar="SECONDS",
+        help="The search time per position",
+        type=float
+    )
+    analyze_parser.add_argument(
+        "--workers",
+        help="The number of engines to analyse with (default: the number of available CPU cores)",
+        type=int
+    )
+    analyze_parser.add_argument(
+        "--hash",
+        metavar="MB",
+        help="The hash size of each engine (default: 0, auto sized from each engines share of the memory)",
+        default=0,
+        type=int
+    )
+
     return parser
@@ -1,7 +1,8 @@
 from __future__ import annotations
 from cli_chess.utils.logging import log
 from platform import system
-from typing import Tuple, Type
+from typing import Any, Callable, Dict, Tuple, Type
+import importlib
 import threading
 import subprocess
 import enum
@@ -101,3 +102,18 @@ def retry(times: int, exceptions: Tuple[Type[Exception], ...]):
             return func(*args, **kwargs)
         return retry_fn
     return wrapper
+
+
+def lazy_exports(package: str, exports: Dict[str, str]) -> Callable[[str], Any]:
+    """Returns a module level `__getattr__` (PEP 562) for the passed in package which
+       imports each export (a mapping of name to submodule) on first access. This allows
+       a package to re-export modules with heavy dependencies without importing them
+       upfront. Export names must differ from their submodule names.
+    """
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(f"{package}.{exports[name]}"), name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+    return __getattr__
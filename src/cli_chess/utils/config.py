@@ -1,14 +1,20 @@
 from cli_chess.utils.common import is_linux_os, is_windows_os
 from cli_chess.utils.logging import log, redact_from_logs
 from cli_chess.utils.event import Event
+from cli_chess.utils.file_watcher import FileSignature, get_file_signature
 from cli_chess.utils.common import VALID_COLOR_DEPTHS
+from collections import namedtuple
+from contextlib import contextmanager
 from getpass import getuser
 from enum import Enum
 import configparser
+import shutil
+import tempfile
 import os
-from typing import List
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
 
 all_configs: List["SectionBase"] = []
+config_documents: Dict[str, "ConfigDocument"] = {}
 DEFAULT_CONFIG_FILENAME = "config.ini"
 
 
@@ -22,18 +28,34 @@ def get_config_path() -> str:
     return os.path.expandvars(file_path)
 
 
+def get_config_document(full_filename: str) -> "ConfigDocument":
+    """Returns the shared document for the passed in configuration file. A document
+       whose file has been removed since it was last read or written is reloaded.
+    """
+    document = config_documents.get(full_filename)
+    if document is None:
+        document = config_documents[full_filename] = ConfigDocument(full_filename)
+    elif document.file_was_removed():
+        document.reload()
+    return document
+
+
 def force_recreate_configs() -> None:
     """Forces a clean recreation of all configs"""
     # Handle deletion first as configs can exist in the same file
     # and we don't want to delete a newly created config/section
-    for config in all_configs:
-        if os.path.exists(config.full_filename):
-            os.remove(config.full_filename)
+    documents = list(dict.fromkeys(config.document for config in all_configs))
+    for document in documents:
+        if os.path.exists(document.full_filename):
+            os.remove(document.full_filename)
+        document.reload()
 
-    # second loop to handle recreation
-    for config in all_configs:
-        config.parser = config._get_parser() # noqa
-        config.create_section()
+    # second loop to handle recreation (each file is written once)
+    for document in documents:
+        with document.batch():
+            for config in all_configs:
+                if config.document is document:
+                    config.create_section()
 
 
 def print_program_config() -> None:
@@ -54,30 +76,157 @@ def print_program_config() -> None:
                 print(e)
 
 
+class ConfigDocument:
+    """A configuration file shared by all configurations stored in it. The file is
+       parsed once, on first use. Changes are written to the file as a whole, so
+       changes to several configurations in a batch are written once.
+    """
+    def __init__(self, full_filename: str):
+        self.full_filename = full_filename
+        self.file_path = os.path.dirname(full_filename)
+        self._parser: Optional[configparser.ConfigParser] = None
+        self._file_exists = False
+
+        # The signature of the file as last read or written, so changes made outside of cli-chess can be told apart
+        self._signature: Optional[FileSignature] = None
+
+        # Writes are deferred while a batch is open, and made once the outermost batch closes
+        self._batch_depth = 0
+        self._changed_configs: List["BaseConfig"] = []
+
+    @property
+    def parser(self) -> configparser.ConfigParser:
+        """Returns the parsed configuration file, parsing it on first use"""
+        if self._parser is None:
+            self.reload()
+        return self._parser
+
+    def reload(self) -> None:
+        """Parses the configuration file, discarding any changes not yet written"""
+        parser = configparser.ConfigParser()
+        self._signature = get_file_signature(self.full_filename)
+        self._file_exists = bool(parser.read(self.full_filename))
+        self._parser = parser
+        self._changed_configs = []
+
+    def refresh(self) -> None:
+        """Reloads the file if it was changed outside of cli-chess (e.g. edited by the user).
+           Each configuration in the file is verified, and only notifies its listeners of the
+           keys whose values changed. A removed file, or a file which fails to parse, is ignored
+           and the current values are kept.
+        """
+        signature = get_file_signature(self.full_filename)
+        if signature is None or signature == self._signature or self._parser is None:
+            return
+
+        parser = configparser.ConfigParser()
+        try:
+            parser.read(self.full_filename)
+        except configparser.Error as e:
+            log.error(f"Ignoring invalid changes to {self.full_filename}: {e}")
+            return
+
+        log.info(f"Reloading configuration changes from {self.full_filename}")
+        self._parser = parser
+        self._signature = signature
+        self._file_exists = True
+        with self.batch():
+            for config in all_configs:
+                if config.document is self:
+                    config._config_reloaded()
+
+    def file_was_removed(self) -> bool:
+        """Returns True if the file has been removed since it was last read or written"""
+        return self._file_exists and not os.path.isfile(self.full_filename)
+
+    def save(self, config: "BaseConfig") -> None:
+        """Writes the file and notifies the passed in configuration once written.
+           If a batch is open, the write is made once the outermost batch closes.
+        """
+        if config not in self._changed_configs:
+            self._changed_configs.append(config)
+        if not self._batch_depth:
+            self._write_changes()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Defers writes made within the context until it exits, so a series of
+           changes is written (and configuration write events are fired) once.
+           Batches can be nested.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._changed_configs:
+                self._write_changes()
+
+    def write(self) -> None:
+        """Writes the configuration file. The configuration is written to a temporary
+           file which then replaces the configuration file, so the file is never left
+           partially written (e.g. on a crash, or when two instances write at once).
+        """
+        if not os.path.exists(self.file_path):
+            os.makedirs(self.file_path)
+
+        fd, temp_filename = tempfile.mkstemp(dir=self.file_path, prefix=f".{os.path.basename(self.full_filename)}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'w') as config_file:
+                self.parser.write(config_file)
+                config_file.flush()
+                os.fsync(config_file.fileno())
+            if os.path.exists(self.full_filename):
+                shutil.copymode(self.full_filename, temp_filename)
+            os.replace(temp_filename, self.full_filename)
+        except BaseException:
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+        self._file_exists = True
+        self._signature = get_file_signature(self.full_filename)
+
+    def _write_changes(self) -> None:
+        """Writes the file and notifies the changed configurations"""
+        changed_configs, self._changed_configs = self._changed_configs, []
+        self.write()
+        for config in changed_configs:
+            config._config_written()
+
+
 class BaseConfig:
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME) -> None:
         """Default base class constructor"""
         self.file_path = get_config_path()
         self.full_filename = self.file_path + filename
-        self.parser = self._get_parser()
+
+        # Configurations stored in the same file share a single parsed document
+        self.document = get_config_document(self.full_filename)
 
         # Event called on any configuration write event (across sections)
         self.e_config_updated = Event()
 
-    def _get_parser(self) -> "ConfigParser":  # noqa: F821
-        """Returns the config parser object"""
-        parser = configparser.ConfigParser()
-        parser.read(self.full_filename)
-        return parser
+    @property
+    def parser(self) -> configparser.ConfigParser:
+        """Returns the parsed configuration file"""
+        return self.document.parser
 
     def write_config(self) -> None:
-        """Writes to the configuration file"""
-        if not os.path.exists(self.file_path):
-            os.makedirs(self.file_path)
+        """Writes to the configuration file. If a batch is open, the
+           write is made once the outermost batch closes.
+        """
+        self.document.save(self)
 
-        with open(self.full_filename, 'w') as config_file:
-            self.parser.write(config_file)
-            self.e_config_updated.notify()
+    def batch(self) -> Iterator[None]:
+        """Defers configuration writes made within the context until it exits, so a series of
+           changes is written (and configuration write events are fired) once. Batches can be
+           nested, and are shared by all configurations stored in the same file.
+        """
+        return self.document.batch()
+
+    def _config_written(self) -> None:
+        """Called once changes to this configuration have been written"""
+        self.e_config_updated.notify()
 
     def config_exists(self) -> bool:
         """Returns True if the configuration file exists"""
@@ -138,10 +287,17 @@ class BaseConfig:
 
 
 class SectionBase(BaseConfig):
-    def __init__(self, section_name: str, section_keys, filename: str = DEFAULT_CONFIG_FILENAME):
+    def __init__(self, section_name: str, section_keys, e_section_updated: Event, filename: str = DEFAULT_CONFIG_FILENAME):
+        # Notified with the keys whose values changed. Listeners can subscribe to specific keys as topics
+        self._e_section_updated = e_section_updated
         super().__init__(filename)
         self.section_name = section_name
         self.section_keys = section_keys
+
+        # An immutable, typed copy of this sections values (e.g. `game_config.snapshot.pad_unicode`)
+        # for reads on hot paths such as rendering. It is rebuilt whenever this section is written or reloaded.
+        self._snapshot_type = namedtuple(f"{type(self).__name__}Snapshot", [key.value for key in section_keys])
+        self.snapshot = self._build_snapshot()
         self._verify_section_integrity()
 
         # Keep track of all config sections (used on recreation)
@@ -151,19 +307,65 @@ class SectionBase(BaseConfig):
         """Verifies a config sections integrity by validating the section exists as well
            as all expected keys. If the section is missing, the entire section is recreated.
            If a key is missing from the section, the key will be re-added with its default value.
+           Any repairs are written to the configuration file at once.
         """
-        if self._section_exists():
-            for key in self.section_keys:
-                if not self._section_has_key(key):
-                    super().set_key_value(self.section_name, key.name, key.default_value)
-        else:
-            self.create_section()
+        with self.batch():
+            if self._section_exists():
+                for key in self.section_keys:
+                    if not self._section_has_key(key):
+                        super().set_key_value(self.section_name, key.name, key.default_value)
+            else:
+                self.create_section()
+
+    def _config_written(self) -> None:
+        """Rebuilds the snapshot once changes to this section have been written"""
+        self._update_snapshot()
+        super()._config_written()
+
+    def _config_reloaded(self) -> None:
+        """Verifies this section and rebuilds the snapshot once the configuration file has been reloaded"""
+        self._verify_section_integrity()
+        self._update_snapshot()
+
+    def _update_snapshot(self) -> None:
+        """Rebuilds the snapshot, notifying listeners of the keys whose values changed"""
+        snapshot = self._build_snapshot()
+        changed_keys = [key for key in self.section_keys if getattr(snapshot, key.value) != getattr(self.snapshot, key.value)]
+        self.snapshot = snapshot
+        if changed_keys:
+            self._config_changed(changed_keys)
+
+    def _config_changed(self, changed_keys: List[Enum]) -> None:
+        """Notifies listeners of the keys whose values changed once this section has been written or reloaded"""
+        self._e_section_updated.notify(*changed_keys)
+
+    def _build_snapshot(self) -> NamedTuple:
+        """Returns a snapshot of this sections values. Values are converted to the type
+           of the keys default value. Missing or invalid values use the default value.
+        """
+        return self._snapshot_type(*(self._get_typed_value(key) for key in self.section_keys))
+
+    def _get_typed_value(self, key: Enum) -> Any:
+        """Returns the value of the passed in key converted to the type of its default value"""
+        default_value = key.default_value
+        try:
+            if isinstance(default_value, bool):
+                return self.parser.getboolean(self.section_name, key.name)
+            elif isinstance(default_value, int):
+                return self.parser.getint(self.section_name, key.name)
+            return self.parser.get(self.section_name, key.name).strip()
+        except configparser.Error:
+            return default_value
+        except ValueError as e:
+            log.error(f"Invalid {self.section_name} configuration value, using the default for {key.name}: {e}")
+            return default_value
 
     def create_section(self) -> None:
         """Creates this section using key value defaults"""
-        super().add_section(self.section_name)
-        for key in self.section_keys:
-            super().set_key_value(self.section_name, key.name, key.default_value)
+        with self.batch():
+            super().add_section(self.section_name)
+            for key in self.section_keys:
+                super().set_key_value(self.section_name, key.name, key.default_value)
 
     def get_all_values(self) -> dict:
         """Returns a dictionary of all key/values in this section.
@@ -211,12 +413,7 @@ class PlayerInfoConfig(SectionBase):
 
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME):
         self.e_player_info_config_updated = Event()
-        super().__init__(section_name="player_info", section_keys=self.Keys, filename=filename)
-
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
-        self.e_player_info_config_updated.notify()
+        super().__init__(section_name="player_info", section_keys=self.Keys, e_section_updated=self.e_player_info_config_updated, filename=filename)
 
 
 class GameConfig(SectionBase):
@@ -250,12 +447,7 @@ class GameConfig(SectionBase):
 
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME):
         self.e_game_config_updated = Event()
-        super().__init__(section_name="game", section_keys=self.Keys, filename=filename)
-
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
-        self.e_game_config_updated.notify()
+        super().__init__(section_name="game", section_keys=self.Keys, e_section_updated=self.e_game_config_updated, filename=filename)
 
     def get_all_values(self) -> dict:
         """Returns a dictionary of all key/values in this section.
@@ -290,7 +482,7 @@ class TerminalConfig(SectionBase):
 
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME):
         self.e_program_config_updated = Event()
-        super().__init__(section_name="terminal", section_keys=self.Keys, filename=filename)
+        super().__init__(section_name="terminal", section_keys=self.Keys, e_section_updated=self.e_program_config_updated, filename=filename)
 
     def get_value(self, key: Enum) -> str:
         """Get the value of the key passed in from the configuration file"""
@@ -299,11 +491,6 @@ class TerminalConfig(SectionBase):
             super().set_value(self.Keys.TERMINAL_COLOR_DEPTH, self.Keys.TERMINAL_COLOR_DEPTH.default_value)
         return super().get_key_value(self.section_name, key.name, False)
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
-        self.e_program_config_updated.notify()
-
 
 class LichessConfig(SectionBase):
     """Creates and manages the "lichess" configuration. This configuration can
@@ -324,13 +511,14 @@ class LichessConfig(SectionBase):
 
     def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME):
         self.e_lichess_config_updated = Event()
-        super().__init__(section_name="lichess", section_keys=self.Keys, filename=filename)
+        super().__init__(section_name="lichess", section_keys=self.Keys, e_section_updated=self.e_lichess_config_updated, filename=filename)
         redact_from_logs(self.get_value(self.Keys.API_TOKEN))
 
-    def write_config(self) -> None:
-        """Writes to the configuration file"""
-        super().write_config()
-        self.e_lichess_config_updated.notify()
+    def _config_changed(self, changed_keys: List[Enum]) -> None:
+        """Redacts a changed API token from the logs before notifying listeners"""
+        if self.Keys.API_TOKEN in changed_keys and self.snapshot.api_token:
+            redact_from_logs(self.snapshot.api_token)
+        super()._config_changed(changed_keys)
 
     def set_value(self, key, value: str) -> None:
         """Set a keys value in the configuration file. Overrides the base
@@ -342,7 +530,48 @@ class LichessConfig(SectionBase):
         super().set_key_value(self.section_name, key.name, value)
 
 
-player_info_config = PlayerInfoConfig()
-game_config = GameConfig()
-terminal_config = TerminalConfig()
-lichess_config = LichessConfig()
+class EngineConfig(SectionBase):
+    """Creates and manages the "engine" configuration. This configuration can
+       either live in its own file, or be appended as a section by using a
+       configuration filename that already exists (such as DEFAULT_CONFIG_FILENAME).
+       By default, this will be appended to the default configuration.
+    """
+    class Keys(Enum):
+        PONDER = "ponder"
+        ANALYSIS_LINES = "analysis_lines"
+        ANALYSIS_UPDATES_PER_SECOND = "analysis_updates_per_second"
+        EVAL_CACHE_SIZE = "eval_cache_size"
+        OPENING_BOOK = "opening_book"
+        SYZYGY_PATH = "syzygy_path"
+        ENGINE_PATH = "engine_path"
+        THREADS = "threads"
+        HASH = "hash"
+
+        @property
+        def default_value(self):
+            """Returns the default value for the key"""
+            default_lookup = {
+                self.PONDER: False,
+                self.ANALYSIS_LINES: 3,
+                self.ANALYSIS_UPDATES_PER_SECOND: 4,
+                self.EVAL_CACHE_SIZE: 100000,
+                self.OPENING_BOOK: "",
+                self.SYZYGY_PATH: "",
+                self.ENGINE_PATH: "",
+                self.THREADS: 0,
+                self.HASH: 0,
+            }
+            return default_lookup[self]
+
+    def __init__(self, filename: str = DEFAULT_CONFIG_FILENAME):
+        self.e_engine_config_updated = Event()
+        super().__init__(section_name="engine", section_keys=self.Keys, e_section_updated=self.e_engine_config_updated, filename=filename)
+
+
+# The default configuration file is parsed once for all sections, and any repairs are written at once
+with get_config_document(get_config_path() + DEFAULT_CONFIG_FILENAME).batch():
+    player_info_config = PlayerInfoConfig()
+    game_config = GameConfig()
+    terminal_config = TerminalConfig()
+    lichess_config = LichessConfig()
+    engine_config = EngineConfig()
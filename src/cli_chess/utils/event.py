@@ -1,11 +1,15 @@
 from __future__ import annotations
 from enum import Enum, auto
-from typing import Callable, List
+import inspect
+import weakref
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
 
 class EventTopics(Enum):
     MOVE_MADE = auto()
+    BOARD_POSITION_CHANGED = auto()
     BOARD_ORIENTATION_CHANGED = auto()
+    PREMOVE_CHANGED = auto()
     GAME_PARAMS = auto()
     GAME_SEARCH = auto()
     GAME_START = auto()
@@ -13,33 +17,110 @@ class EventTopics(Enum):
     ERROR = auto()
 
 
+class Listener:
+    """A listener subscribed to an event. Weak listeners hold a weak reference
+       to the callable (or the object of a bound method), so subscribing does not
+       keep the object alive. The passed in callback is run once the object is
+       garbage collected.
+    """
+    def __init__(self, listener: Callable, topics: Optional[FrozenSet[Enum]], weak: bool, callback: Callable):
+        self.topics = topics
+        self.invocations = 0
+        if weak:
+            ref_type = weakref.WeakMethod if inspect.ismethod(listener) else weakref.ref
+            self._ref = ref_type(listener, lambda _: callback(self))
+        else:
+            self._ref = lambda: listener
+
+    def get(self) -> Optional[Callable]:
+        """Returns the listener, or None if a weak listener has been garbage collected"""
+        return self._ref()
+
+
 class Event:
     """Event notification class. This class creates a singular event instance
        which listeners can subscribe to with a callable. The callable will be
-       notified when the event is triggered (using notify()). Generally, this
-       class should not be instantiated directly, but rather from the EventManager class.
+       notified when the event is triggered (using notify()). Listeners can
+       optionally subscribe to specific topics, in which case they are only
+       notified when one of those topics is passed to notify(). Listeners added
+       as weak references are pruned automatically once garbage collected, which
+       should be used when subscribing short-lived objects to long-lived events.
+       Generally, this class should not be instantiated directly, but rather
+       from the EventManager class.
     """
     def __init__(self):
-        self.listeners = []
+        self._listeners: List[Listener] = []
+        self._dispatch_cache: Dict[Tuple[Enum, ...], List[Listener]] = {}
 
-    def add_listener(self, listener: Callable) -> None:
-        """Adds the passed in listener to the notification list"""
-        if listener not in self.listeners:
-            self.listeners.append(listener)
+    @property
+    def listeners(self) -> List[Callable]:
+        """Returns the subscribed listeners which are still alive"""
+        return [listener for listener in (entry.get() for entry in self._listeners) if listener is not None]
+
+    def add_listener(self, listener: Callable, topics: Optional[Iterable[Enum]] = None, weak: bool = False) -> None:
+        """Adds the passed in listener to the notification list. If topics are passed in
+           the listener is only notified of the events for these topics, otherwise the
+           listener is notified of every event. If weak is True, the event only holds a
+           weak reference to the listener and it is removed once garbage collected.
+        """
+        topics = frozenset(topics) if topics is not None else None
+        entry = self._find(listener)
+        if entry:
+            # Re-adding a listener updates its topics
+            entry.topics = topics
+        else:
+            self._listeners = self._listeners + [Listener(listener, topics, weak, self._prune)]
+        self._dispatch_cache = {}
 
     def remove_listener(self, listener: Callable) -> None:
         """Removes the passed in listener from the notification list"""
-        if listener in self.listeners:
-            self.listeners.remove(listener)
+        entry = self._find(listener)
+        if entry:
+            self._prune(entry)
 
     def remove_all_listeners(self) -> None:
         """Removes all listeners associated to this event"""
-        self.listeners.clear()
+        self._listeners = []
+        self._dispatch_cache = {}
 
     def notify(self, *args, **kwargs) -> None:
-        """Notifies all listeners of the event"""
-        for listener in self.listeners:
-            listener(*args, **kwargs)
+        """Notifies the listeners subscribed to the topics passed in the args (and
+           the listeners of every event). The listeners for each combination of
+           topics are resolved once and cached, so dispatch is a dictionary lookup.
+        """
+        topics = tuple(arg for arg in args if isinstance(arg, Enum))
+        entries = self._dispatch_cache.get(topics)
+        if entries is None:
+            entries = self._dispatch_cache[topics] = self._get_entries(topics)
+
+        for entry in entries:
+            listener = entry.get()
+            if listener is not None:
+                entry.invocations += 1
+                listener(*args, **kwargs)
+
+    def get_invocation_count(self, listener: Callable) -> int:
+        """Returns the number of times the passed in listener has been notified"""
+        entry = self._find(listener)
+        return entry.invocations if entry else 0
+
+    def _find(self, listener: Callable) -> Optional[Listener]:
+        """Returns the subscription of the passed in listener, if subscribed"""
+        for entry in self._listeners:
+            if entry.get() == listener:
+                return entry
+        return None
+
+    def _prune(self, entry: Listener) -> None:
+        """Removes the passed in subscription. The lists are replaced rather than
+           modified, as this can be called by the garbage collector mid-notification.
+        """
+        self._listeners = [existing for existing in self._listeners if existing is not entry]
+        self._dispatch_cache = {}
+
+    def _get_entries(self, topics: Tuple[Enum, ...]) -> List[Listener]:
+        """Returns the subscriptions to notify for the passed in topics, in subscription order"""
+        return [entry for entry in self._listeners if entry.topics is None or not entry.topics.isdisjoint(topics)]
 
 
 class EventManager:
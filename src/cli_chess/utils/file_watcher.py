@@ -0,0 +1,225 @@
+from __future__ import annotations
+from cli_chess.utils.common import is_linux_os
+from cli_chess.utils.logging import log
+from cli_chess.utils.ui_dispatcher import ui_dispatcher
+from typing import Callable, Dict, Iterator, Optional, Set, Tuple
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import threading
+
+# How often (in seconds) watched files are checked when inotify is unavailable
+POLL_INTERVAL = 1.0
+
+# inotify(7) flags and event masks
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+INOTIFY_EVENT_HEADER = struct.Struct("iIII")
+
+FileSignature = Tuple[int, int, int]
+
+
+def get_file_signature(path: str) -> Optional[FileSignature]:
+    """Returns the (inode, size, modification time) of the passed in file, or None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+class Inotify:
+    """A minimal inotify(7) wrapper which watches directories for files being
+       written, replaced (e.g. an atomic write, or an editor saving), or removed
+    """
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "Unable to initialize inotify")
+        self._directories: Dict[int, str] = {}
+
+    def add_directory(self, directory: str) -> None:
+        """Watches the passed in directory. Raises an OSError if the directory cannot be watched"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(directory), self.WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"Unable to watch {directory}")
+        self._directories[wd] = directory
+
+    def read_events(self) -> Iterator[Tuple[int, Optional[str]]]:
+        """Reads the pending events, returning the mask and path of each"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_length = INOTIFY_EVENT_HEADER.unpack_from(data, offset)
+            offset += INOTIFY_EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + name_length].rstrip(b"\0"))
+            offset += name_length
+            directory = self._directories.get(wd)
+            yield mask, os.path.join(directory, name) if directory and name else None
+
+    def close(self) -> None:
+        """Closes the inotify instance, removing all watches"""
+        os.close(self.fd)
+
+
+class FileWatcher:
+    """Watches files for changes made outside of cli-chess (e.g. the user editing
+       their configuration) and runs the files callback on the UI loop when it
+       changes. On Linux the watched files directories are watched with inotify,
+       otherwise (or when inotify is unavailable) the files are polled. A callback
+       only runs when the files signature changed, and a burst of changes to a
+       file (e.g. an editor saving) is coalesced into a single call.
+    """
+    def __init__(self, poll_interval: float = POLL_INTERVAL):
+        self.poll_interval = poll_interval
+        self._callbacks: Dict[str, Callable[[], None]] = {}
+        self._signatures: Dict[str, Optional[FileSignature]] = {}
+        self._watched_directories: Set[str] = set()
+        self._polled: Set[str] = set()
+        self._lock = threading.Lock()
+        self._inotify: Optional[Inotify] = None
+        self._thread: Optional[threading.Thread] = None
+        self._wake_fds: Optional[Tuple[int, int]] = None
+        self._stopped = threading.Event()
+
+    def watch(self, path: str, callback: Callable[[], None]) -> None:
+        """Runs the callback (on the UI loop) whenever the file at the passed in path changes"""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._callbacks[path] = callback
+            self._signatures[path] = get_file_signature(path)
+        if self._inotify:
+            self._watch_directory(path)
+
+    def unwatch(self, path: str) -> None:
+        """Stops watching the file at the passed in path"""
+        path = os.path.abspath(path)
+        with self._lock:
+            self._callbacks.pop(path, None)
+            self._signatures.pop(path, None)
+            self._polled.discard(path)
+
+    def start(self) -> None:
+        """Starts watching the files on a background thread"""
+        if self.is_running():
+            return
+
+        self._stopped.clear()
+        if is_linux_os():
+            try:
+                self._inotify = Inotify()
+                self._wake_fds = os.pipe()
+                for path in list(self._callbacks):
+                    self._watch_directory(path)
+            except (OSError, AttributeError) as e:
+                log.error(f"File watcher: inotify is unavailable, polling for changes instead: {e}")
+                self._close()
+
+        self._thread = threading.Thread(target=self._run, name="file-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stops watching the files"""
+        if not self.is_running():
+            return
+
+        self._stopped.set()
+        if self._wake_fds:
+            os.write(self._wake_fds[1], b"\0")
+        self._thread.join()
+        self._thread = None
+        self._close()
+
+    def is_running(self) -> bool:
+        """Returns True if the files are being watched"""
+        return self._thread is not None
+
+    def check_for_changes(self, paths=None) -> None:
+        """Checks the passed in paths (or all watched files) for changes, and
+           dispatches the callback of each changed file to the UI loop
+        """
+        with self._lock:
+            changed = []
+            for path in paths if paths is not None else list(self._callbacks):
+                if path not in self._callbacks:
+                    continue
+                signature = get_file_signature(path)
+                if signature != self._signatures[path]:
+                    self._signatures[path] = signature
+                    changed.append((path, self._callbacks[path]))
+
+        for path, callback in changed:
+            log.debug(f"File watcher: {path} changed")
+            ui_dispatcher.dispatch(callback, coalesce_key=path)
+
+    def _run(self) -> None:
+        """Watches the files until stopped"""
+        try:
+            if self._inotify:
+                self._run_inotify()
+            else:
+                while not self._stopped.wait(self.poll_interval):
+                    self.check_for_changes()
+        except Exception as e:
+            log.error(f"File watcher: stopped watching files: {e}")
+
+    def _run_inotify(self) -> None:
+        """Waits on inotify events, polling any files whose directory could not be watched"""
+        while not self._stopped.is_set():
+            timeout = self.poll_interval if self._polled else None
+            readable, _, _ = select.select([self._inotify.fd, self._wake_fds[0]], [], [], timeout)
+            if self._polled:
+                self.check_for_changes(list(self._polled))
+            if self._inotify.fd not in readable:
+                continue
+
+            paths = set()
+            for mask, path in self._inotify.read_events():
+                if mask & IN_Q_OVERFLOW:
+                    paths.update(self._callbacks)
+                elif path:
+                    paths.add(path)
+            self.check_for_changes(paths)
+
+    def _watch_directory(self, path: str) -> None:
+        """Watches the directory of the passed in file with inotify. If the
+           directory cannot be watched, the file is polled instead
+        """
+        directory = os.path.dirname(path)
+        if directory in self._watched_directories:
+            return
+        try:
+            self._inotify.add_directory(directory)
+            self._watched_directories.add(directory)
+        except OSError as e:
+            log.error(f"File watcher: polling {path} for changes: {e}")
+            with self._lock:
+                self._polled.add(path)
+
+    def _close(self) -> None:
+        """Closes the inotify instance and wake up pipe"""
+        if self._inotify:
+            self._inotify.close()
+        if self._wake_fds:
+            for fd in self._wake_fds:
+                os.close(fd)
+        self._inotify = None
+        self._wake_fds = None
+        self._watched_directories.clear()
+        self._polled.clear()
+
+
+file_watcher = FileWatcher()
@@ -28,6 +28,7 @@ default = {
 
     "material-difference": "fg:gray",
     "move-list": "fg:gray",
+    "analysis": "fg:gray",
     "move-input": "fg:white bold",
 
     "player-info": "fg:white",
@@ -2,13 +2,18 @@ from __future__ import annotations
 from cli_chess.utils import AlertType, log
 from cli_chess.utils.common import VALID_COLOR_DEPTHS
 from cli_chess.utils.config import get_config_path
+from cli_chess.utils.file_watcher import FileSignature, get_file_signature
+from cli_chess.utils.styles import default
 from prompt_toolkit.layout import Window, FormattedTextControl, ConditionalContainer
 from prompt_toolkit.filters import to_filter
 from prompt_toolkit.mouse_events import MouseEvent, MouseEventType
 from prompt_toolkit.key_binding import KeyPressEvent, merge_key_bindings
 from prompt_toolkit.application import get_app
 from prompt_toolkit.layout import Layout, Container
-from typing import TypeVar, Callable, cast
+from prompt_toolkit.styles import Style
+from typing import TypeVar, Callable, Dict, Optional, cast
+import hashlib
+import ast
 import os
 
 E = TypeVar("E", bound=Callable[[KeyPressEvent], None])
@@ -88,19 +93,67 @@ def set_color_depth(depth: str) -> None:
         repaint_ui()
 
 
-def get_custom_style() -> dict:
-    """Returns the user defined custom style"""
-    try:
-        custom_style_path = get_config_path() + "custom_style.py"
-        if not os.path.isfile(custom_style_path) or os.stat(custom_style_path).st_size == 0:
-            create_skeleton_custom_style()
-
-        with open(custom_style_path, 'r') as file:
-            custom_style = file.read()
-            return eval(custom_style)
-    except Exception as e:
-        log.critical(f"Custom style error: {e}")
-        raise
+def get_custom_style_path() -> str:
+    """Returns the path of the user defined custom style"""
+    return get_config_path() + "custom_style.py"
+
+
+def parse_custom_style(custom_style: str) -> Dict[str, str]:
+    """Parses and validates the passed in custom style. The style is evaluated as a
+       literal (so it cannot run code) and must be a dictionary of class names to
+       style strings. Raises a SyntaxError or ValueError if the style is invalid.
+    """
+    style = ast.literal_eval(custom_style)
+    if not isinstance(style, dict):
+        raise ValueError("The custom style must be kept in dictionary format")
+
+    for class_name, style_str in style.items():
+        if not isinstance(class_name, str) or not isinstance(style_str, str):
+            raise ValueError(f"Invalid custom style entry ({class_name!r}: {style_str!r}). Class names and styles must be strings")
+    return style
+
+
+def compile_style(custom_style: Dict[str, str]) -> Style:
+    """Compiles the default style and the passed in custom style into a single style.
+       The custom style rules follow the default rules, so they take precedence.
+    """
+    return Style(list(default.items()) + list(custom_style.items()))
+
+
+class StyleCache:
+    """Caches the compiled style. The custom style file is only re-read when its signature
+       (modification time, size, inode) changes, and only recompiled when its content hash
+       changes. An unchanged custom style returns the same style, which allows prompt_toolkit
+       to keep the attributes it has resolved for each class rather than repainting.
+    """
+    def __init__(self):
+        self._signature: Optional[FileSignature] = None
+        self._content_hash: Optional[str] = None
+        self._style: Optional[Style] = None
+
+    def get_style(self) -> Style:
+        """Returns the compiled style. Raises an exception if the custom style is invalid"""
+        custom_style_path = get_custom_style_path()
+        try:
+            if not os.path.isfile(custom_style_path) or os.stat(custom_style_path).st_size == 0:
+                create_skeleton_custom_style()
+
+            signature = get_file_signature(custom_style_path)
+            if self._style is not None and signature == self._signature:
+                return self._style
+
+            with open(custom_style_path, 'rb') as file:
+                content = file.read()
+            content_hash = hashlib.sha256(content).hexdigest()
+            if self._style is None or content_hash != self._content_hash:
+                self._style = compile_style(parse_custom_style(content.decode()))
+                self._content_hash = content_hash
+                log.debug("Compiled the custom style")
+            self._signature = signature
+            return self._style
+        except Exception as e:
+            log.critical(f"Custom style error: {e}")
+            raise
 
 
 def create_skeleton_custom_style() -> None:
@@ -108,11 +161,11 @@ def create_skeleton_custom_style() -> None:
        Raises an exception on generation errors.
     """
     try:
-        custom_style_path = get_config_path() + "custom_style.py"
+        custom_style_path = get_custom_style_path()
         with open(custom_style_path, 'w') as file:
             file.write("# This file is used to override the default style of cli-chess. It must be kept in dictionary format.\n")
             file.write("# Colors are expected to be HTML color names (e.g. seagreen) or HTML hex colors (e.g. #2E8B57)\n")
-            file.write("# Restarting cli-chess or pressing [CTRL+R] on any screen will force a style refresh.\n")
+            file.write("# Changes are applied when this file is saved. Pressing [CTRL+R] on any screen will also force a style refresh.\n")
             file.write("# Visit the cli-chess github page (https://github.com/trevorbayless/cli-chess/) for more styling information.\n\n")
             file.write("{\n\n")
             file.write("}")
@@ -148,3 +201,6 @@ class AlertContainer:
 
     def __pt_container__(self):
         return self._alert_container
+
+
+style_cache = StyleCache()
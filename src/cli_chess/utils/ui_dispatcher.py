@@ -0,0 +1,175 @@
+from __future__ import annotations
+from cli_chess.utils.logging import log
+from collections import deque
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Tuple, TYPE_CHECKING
+import threading
+if TYPE_CHECKING:
+    import asyncio
+
+# The maximum number of calls waiting to run on the UI loop
+MAX_QUEUE_SIZE = 1024
+
+# How long (in seconds) a background thread waits for space in a full queue before the call is dropped
+QUEUE_PUT_TIMEOUT = 5
+
+# Calls which wait longer than this (in seconds) to run on the UI loop are logged
+LAG_WARNING_THRESHOLD = 0.5
+
+
+@dataclass
+class DispatchEntry:
+    callback: Callable
+    args: Tuple
+    kwargs: Dict[str, Any]
+    queued_at: float = field(default_factory=monotonic)
+    superseded: bool = False
+
+
+class UIDispatcher:
+    """Marshals calls made on background threads (e.g. API streams) onto the
+       application's event loop, so models, presenters, and prompt_toolkit
+       controls are only ever updated on the UI thread. Calls are queued in
+       order and the queue is drained once per loop iteration. Calls passed with
+       a coalesce key replace any queued call with the same callback and key, so
+       a burst of position updates arriving before the UI loop runs only applies
+       the latest. The queue is bounded, and background threads wait for space
+       when it is full. Calls are made directly when the dispatcher is not running
+       or when made from the UI thread.
+    """
+    def __init__(self, max_queue_size: int = MAX_QUEUE_SIZE):
+        self.max_queue_size = max_queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._queue: Deque[DispatchEntry] = deque()
+        self._pending: Dict[Tuple[Callable, Hashable], DispatchEntry] = {}
+        self._depth = 0
+        self._drain_scheduled = False
+        self._lock = threading.Lock()
+        self._not_full = threading.Condition(self._lock)
+        self._reset_stats()
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Starts marshalling calls onto the passed in loop. This must be called from the loop's thread"""
+        with self._lock:
+            self._loop = loop
+            self._loop_thread_id = threading.get_ident()
+            self._reset_stats()
+
+    def stop(self) -> None:
+        """Stops marshalling calls. Queued calls are discarded"""
+        with self._lock:
+            self._loop = None
+            self._loop_thread_id = None
+            self._queue.clear()
+            self._pending.clear()
+            self._depth = 0
+            self._drain_scheduled = False
+            self._not_full.notify_all()
+        log.debug(f"UI dispatcher stats: {self.get_stats()}")
+
+    def is_running(self) -> bool:
+        """Returns True if calls are being marshalled onto the UI loop"""
+        return self._loop is not None
+
+    def dispatch(self, callback: Callable, *args, coalesce_key: Optional[Hashable] = None, **kwargs) -> None:
+        """Runs the callback with the passed in arguments on the UI loop. If a coalesce key is
+           passed, a queued call with the same callback and key is superseded by this call.
+        """
+        if self._loop is None or threading.get_ident() == self._loop_thread_id:
+            callback(*args, **kwargs)
+            return
+
+        with self._lock:
+            if not self._wait_for_space():
+                self.dropped += 1
+                log.error(f"UI dispatcher queue is full, dropping call to {getattr(callback, '__qualname__', callback)}")
+                return
+
+            entry = DispatchEntry(callback, args, kwargs)
+            if coalesce_key is not None:
+                superseded = self._pending.get((callback, coalesce_key))
+                if superseded:
+                    superseded.superseded = True
+                    self._depth -= 1
+                    self.coalesced += 1
+                self._pending[(callback, coalesce_key)] = entry
+
+            self._queue.append(entry)
+            self._depth += 1
+            self.max_depth = max(self.max_depth, self._depth)
+
+            if not self._drain_scheduled:
+                try:
+                    self._loop.call_soon_threadsafe(self._drain)
+                    self._drain_scheduled = True
+                except RuntimeError as e:
+                    # The loop has been closed
+                    log.error(f"Unable to dispatch to the UI loop: {e}")
+
+    def get_queue_depth(self) -> int:
+        """Returns the number of calls waiting to run on the UI loop"""
+        return self._depth
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Returns the queue depth and lag (in seconds) statistics"""
+        return {
+            'queue_depth': self._depth,
+            'max_queue_depth': self.max_depth,
+            'dispatched': self.dispatched,
+            'coalesced': self.coalesced,
+            'dropped': self.dropped,
+            'last_lag': round(self.last_lag, 4),
+            'max_lag': round(self.max_lag, 4),
+        }
+
+    def _wait_for_space(self) -> bool:
+        """Waits for space in the queue (the lock must be held). Returns False if there is no space"""
+        deadline = monotonic() + QUEUE_PUT_TIMEOUT
+        while self._loop is not None and self._depth >= self.max_queue_size:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                return False
+            self._not_full.wait(remaining)
+        return self._loop is not None
+
+    def _drain(self) -> None:
+        """Runs the queued calls on the UI loop"""
+        with self._lock:
+            entries, self._queue = self._queue, deque()
+            self._pending.clear()
+            self._depth = 0
+            self._drain_scheduled = False
+            self._not_full.notify_all()
+
+        drain_lag = 0.0
+        for entry in entries:
+            if entry.superseded:
+                continue
+
+            lag = monotonic() - entry.queued_at
+            drain_lag = max(drain_lag, lag)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            self.dispatched += 1
+
+            try:
+                entry.callback(*entry.args, **entry.kwargs)
+            except Exception as e:
+                log.error(f"Error running dispatched call to {getattr(entry.callback, '__qualname__', entry.callback)}: {e}")
+
+        if drain_lag > LAG_WARNING_THRESHOLD:
+            log.warning(f"UI dispatch lag of {drain_lag:.2f}s ({len(entries)} calls queued)")
+
+    def _reset_stats(self) -> None:
+        """Resets the dispatch statistics"""
+        self.max_depth = 0
+        self.dispatched = 0
+        self.coalesced = 0
+        self.dropped = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+
+ui_dispatcher = UIDispatcher()